@@ -0,0 +1,70 @@
+"""
+Compare two benchmark reports and fail on regressions.
+
+A scenario regresses when its p95 latency grows, or its throughput drops, by
+more than the threshold relative to the baseline, or when it has errors the
+baseline did not have.
+
+    python -m benchmarks.compare baseline.json current.json --threshold 0.15
+"""
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Optional
+
+
+def relative_change(baseline: Optional[float], current: Optional[float]) -> Optional[float]:
+    if not baseline or current is None:
+        return None
+    return (current - baseline) / baseline
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[str]:
+    """Return a description of every regression found."""
+    regressions = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+
+        latency_change = relative_change(base["latency_ms"]["p95"], result["latency_ms"]["p95"])
+        throughput_change = relative_change(base["throughput_rps"], result["throughput_rps"])
+        print(
+            f"{name:<32} p95 {base['latency_ms']['p95']} -> {result['latency_ms']['p95']} ms"
+            f" ({_percent(latency_change)}), throughput {base['throughput_rps']} -> "
+            f"{result['throughput_rps']} req/s ({_percent(throughput_change)})"
+        )
+
+        if latency_change is not None and latency_change > threshold:
+            regressions.append(f"{name}: p95 latency up {_percent(latency_change)}")
+        if throughput_change is not None and throughput_change < -threshold:
+            regressions.append(f"{name}: throughput down {_percent(throughput_change)}")
+        if result["errors"] > base["errors"]:
+            regressions.append(f"{name}: {result['errors']} errors (baseline {base['errors']})")
+        failed_checks = [check for check, passed in result["checks"].items() if passed is False]
+        if failed_checks:
+            regressions.append(f"{name}: failed checks {', '.join(failed_checks)}")
+    return regressions
+
+
+def _percent(change: Optional[float]) -> str:
+    return "n/a" if change is None else f"{change:+.1%}"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.1, help="allowed relative change (default 0.1)")
+    args = parser.parse_args(argv)
+
+    with open(args.baseline) as baseline_file, open(args.current) as current_file:
+        regressions = compare(json.load(baseline_file), json.load(current_file), args.threshold)
+
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+import asyncio
+import math
+import os
+import resource
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+UNITS = {"": 1, "k": 1024, "m": 1024 ** 2, "g": 1024 ** 3}
+
+
+def parse_size(value: str) -> int:
+    """Parse sizes such as ``512``, ``64k``, ``10MB`` or ``1MiB`` into bytes."""
+    number = value.strip().lower().rstrip("ib")
+    digits = number.rstrip("kmg")
+    unit = number[len(digits):]
+    return int(float(digits) * UNITS[unit])
+
+
+def format_size(size: int) -> str:
+    for unit, factor in (("GiB", 1024 ** 3), ("MiB", 1024 ** 2), ("KiB", 1024)):
+        if size >= factor and size % factor == 0:
+            return f"{size // factor}{unit}"
+    return f"{size}B"
+
+
+def percentile(sorted_values: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(fraction * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def peak_rss_bytes(pid: Optional[int] = None) -> Optional[int]:
+    """
+    High-water mark of the resident set size of a process.
+
+    Reads ``VmHWM`` from procfs where available, which also works for a
+    server running in a child process; otherwise falls back to getrusage
+    of the current process.
+    """
+    try:
+        with open(f"/proc/{pid or 'self'}/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if pid is not None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+@dataclass
+class ScenarioResult:
+    """Latencies and outcome counts of one scenario."""
+    name: str
+    concurrency: int
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    error_samples: List[str] = field(default_factory=list)
+    bytes_sent: int = 0
+    duration: float = 0.0
+    peak_rss_bytes: Optional[int] = None
+    checks: Dict[str, Any] = field(default_factory=dict)
+
+    def record_error(self, message: str) -> None:
+        self.errors += 1
+        if len(self.error_samples) < 5:
+            self.error_samples.append(message)
+
+    def to_dict(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+        requests = len(self.latencies)
+
+        def ms(value: Optional[float]) -> Optional[float]:
+            return None if value is None else round(value * 1000, 3)
+
+        return {
+            "requests": requests,
+            "errors": self.errors,
+            "concurrency": self.concurrency,
+            "duration_s": round(self.duration, 4),
+            "throughput_rps": round(requests / self.duration, 2) if self.duration else None,
+            "throughput_mib_s": (
+                round(self.bytes_sent / self.duration / 1024 ** 2, 2)
+                if self.duration and self.bytes_sent else None
+            ),
+            "latency_ms": {
+                "p50": ms(percentile(latencies, 0.50)),
+                "p95": ms(percentile(latencies, 0.95)),
+                "p99": ms(percentile(latencies, 0.99)),
+                "max": ms(latencies[-1] if latencies else None),
+                "mean": ms(sum(latencies) / requests if requests else None)
+            },
+            "peak_rss_bytes": self.peak_rss_bytes,
+            "checks": self.checks,
+            "error_samples": self.error_samples
+        }
+
+
+async def run_concurrently(
+        result: ScenarioResult,
+        count: int,
+        request: Callable[[int], Awaitable[httpx.Response]]
+) -> List[Optional[httpx.Response]]:
+    """
+    Issue ``count`` requests with at most ``result.concurrency`` in flight.
+
+    Each request is timed individually; responses with a 4xx/5xx status and
+    raised exceptions are counted as errors. Responses are returned in the
+    order of their index so scenarios can check them afterwards.
+    """
+    responses: List[Optional[httpx.Response]] = [None] * count
+    next_index = 0
+
+    async def worker() -> None:
+        nonlocal next_index
+        while next_index < count:
+            index, next_index = next_index, next_index + 1
+            started_at = time.perf_counter()
+            try:
+                response = await request(index)
+            except Exception as e:
+                result.record_error(f"{type(e).__name__}: {e}")
+                continue
+            result.latencies.append(time.perf_counter() - started_at)
+            if response.status_code >= 400:
+                result.record_error(f"HTTP {response.status_code}: {response.text[:200]}")
+            responses[index] = response
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(result.concurrency, count))))
+    result.duration = time.perf_counter() - started_at
+    return responses
+
+
+def environment_info() -> Dict[str, Any]:
+    return {
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "cpu_count": os.cpu_count()
+    }
@@ -0,0 +1,206 @@
+"""
+Load benchmark of the document service.
+
+Runs the application in-process (ASGI), under uvicorn in a child process, or
+against an already running server, drives upload, list, analyze and
+get-analysis at the given concurrency and file sizes, and prints the results
+as JSON.
+
+    python -m benchmarks.run --concurrency 16 --requests 200 --file-size 64k --file-size 1m
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+from sqlalchemy.engine import make_url
+
+from benchmarks import scenarios
+from benchmarks.harness import ScenarioResult, environment_info, format_size, parse_size, peak_rss_bytes
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=["asgi", "uvicorn"], default="asgi",
+                        help="run the app in this process or in a uvicorn child process")
+    parser.add_argument("--base-url", help="benchmark an already running server instead")
+    parser.add_argument("--storage-backend", choices=["memory", "filesystem", "minio"], default="memory",
+                        help="STORAGE_BACKEND of the app (ignored with --base-url)")
+    parser.add_argument("--database-url",
+                        help="DATABASE_URL of the app; defaults to a fresh SQLite file")
+    parser.add_argument("--queue-backend", choices=["memory", "database"], default="memory")
+    parser.add_argument("--compression", action="store_true", help="enable compressed storage")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario")
+    parser.add_argument("--file-size", action="append", dest="file_sizes", type=parse_size,
+                        help="upload size, e.g. 64k or 1m; repeat for several sizes (default 64k)")
+    parser.add_argument("--list-limit", type=int, default=100)
+    parser.add_argument("--scenario", action="append", dest="scenarios", choices=scenarios.SCENARIOS,
+                        help="scenario to run; repeat for several (default: all)")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+    args.file_sizes = args.file_sizes or [parse_size("64k")]
+    return args
+
+
+def app_environment(args: argparse.Namespace, work_dir: str) -> Dict[str, str]:
+    return {
+        "DATABASE_URL": args.database_url or f"sqlite:///{work_dir}/bench.db",
+        "STORAGE_BACKEND": args.storage_backend,
+        "STORAGE_PATH": os.path.join(work_dir, "storage"),
+        "STORAGE_COMPRESSION_ENABLED": str(args.compression).lower(),
+        "ANALYSIS_QUEUE_BACKEND": args.queue_backend,
+        "USE_MOCK_ANALYZER": "true"
+    }
+
+
+@asynccontextmanager
+async def asgi_client(environment: Dict[str, str]) -> AsyncIterator[httpx.AsyncClient]:
+    # Settings are read on import, so the environment must be set first.
+    os.environ.update(environment)
+    from src.infrastructure.api.main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+            yield client
+
+
+@asynccontextmanager
+async def uvicorn_client(environment: Dict[str, str], server: Dict[str, Any]) -> AsyncIterator[httpx.AsyncClient]:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.infrastructure.api.main:app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT,
+        env={**os.environ, **environment}
+    )
+    server["pid"] = process.pid
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=None) as client:
+            await wait_until_ready(client, process)
+            yield client
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+async def wait_until_ready(client: httpx.AsyncClient, process: Optional[subprocess.Popen] = None,
+                           timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            if (await client.get("/ready")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("Server did not become ready")
+
+
+async def run_scenarios(client: httpx.AsyncClient, args: argparse.Namespace,
+                        server_pid: Optional[int]) -> Dict[str, Any]:
+    state = scenarios.BenchmarkState(run_id=uuid.uuid4().hex[:8])
+    results: Dict[str, Any] = {}
+
+    def record(result: ScenarioResult) -> None:
+        if not args.base_url:
+            result.peak_rss_bytes = peak_rss_bytes(server_pid)
+        results[result.name] = result.to_dict()
+        print(f"{result.name}: {results[result.name]['throughput_rps']} req/s, "
+              f"p95 {results[result.name]['latency_ms']['p95']} ms", file=sys.stderr)
+
+    for name in scenarios.scenario_order(args.scenarios):
+        if name == "upload":
+            for size in args.file_sizes:
+                record(await scenarios.upload(client, state, args.requests, args.concurrency, size))
+        elif name == "upload_versions":
+            for size in args.file_sizes:
+                record(await scenarios.upload_versions(client, state, args.requests, args.concurrency, size))
+        elif name == "list":
+            record(await scenarios.list_files(client, state, args.requests, args.concurrency, args.list_limit))
+        elif name == "analyze":
+            record(await scenarios.analyze(client, state, args.requests, args.concurrency))
+            record(await scenarios.analysis_completion(client, state, args.concurrency))
+        elif name == "get_analysis":
+            record(await scenarios.get_analysis(client, state, args.requests, args.concurrency))
+    return results
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    work_dir = tempfile.mkdtemp(prefix="benchmark-")
+    environment = app_environment(args, work_dir)
+    server: Dict[str, Any] = {}
+
+    if args.base_url:
+        client_context = httpx.AsyncClient(base_url=args.base_url, timeout=None)
+    elif args.target == "uvicorn":
+        client_context = uvicorn_client(environment, server)
+    else:
+        client_context = asgi_client(environment)
+
+    async with client_context as client:
+        if args.base_url:
+            await wait_until_ready(client)
+        results = await run_scenarios(client, args, server.get("pid"))
+
+    return {
+        "benchmark": {
+            "started_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "git_commit": git_commit(),
+            "target": "external" if args.base_url else args.target,
+            "storage_backend": None if args.base_url else args.storage_backend,
+            "database": None if args.base_url else make_url(environment["DATABASE_URL"]).get_backend_name(),
+            "queue_backend": None if args.base_url else args.queue_backend,
+            "compression": None if args.base_url else args.compression,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "file_sizes": [format_size(size) for size in args.file_sizes]
+        },
+        "environment": environment_info(),
+        "results": results
+    }
+
+
+async def main(argv=None) -> Dict[str, Any]:
+    """Run the benchmark and write its report to ``--output`` or stdout."""
+    args = parse_args(argv)
+    report = await run_benchmark(args)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    else:
+        print(output)
+    return report
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,173 @@
+import asyncio
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import httpx
+
+from benchmarks.harness import ScenarioResult, format_size, run_concurrently
+
+
+@dataclass
+class BenchmarkState:
+    """Data shared between scenarios of one run."""
+    run_id: str
+    file_ids: List[int] = field(default_factory=list)
+    analysis_submitted_at: Dict[int, float] = field(default_factory=dict)
+
+
+def _payload(run_id: str, index: int, size: int, block: bytes) -> bytes:
+    # A unique prefix keeps contents distinct, so uploads are not deduplicated.
+    prefix = f"{run_id}-{index}\n".encode()
+    return (prefix + block)[:max(size, len(prefix))]
+
+
+async def upload(
+        client: httpx.AsyncClient,
+        state: BenchmarkState,
+        requests: int,
+        concurrency: int,
+        file_size: int
+) -> ScenarioResult:
+    """Upload distinct files of ``file_size`` bytes under distinct names."""
+    result = ScenarioResult(f"upload[{format_size(file_size)}]", concurrency)
+    block = os.urandom(file_size)
+
+    async def request(index: int) -> httpx.Response:
+        content = _payload(state.run_id, index, file_size, block)
+        result.bytes_sent += len(content)
+        name = f"bench-{state.run_id}-{format_size(file_size)}-{index}.pdf"
+        return await client.post("/files/upload", files={"file": (name, content, "application/pdf")})
+
+    responses = await run_concurrently(result, requests, request)
+    state.file_ids.extend(r.json()["id"] for r in responses if r is not None and r.status_code == 201)
+    return result
+
+
+async def upload_versions(
+        client: httpx.AsyncClient,
+        state: BenchmarkState,
+        requests: int,
+        concurrency: int,
+        file_size: int
+) -> ScenarioResult:
+    """
+    Upload many versions of one document at once.
+
+    Exercises per-document version allocation under contention and checks
+    that every upload got a distinct version.
+    """
+    result = ScenarioResult(f"upload_versions[{format_size(file_size)}]", concurrency)
+    block = os.urandom(file_size)
+    name = f"bench-{state.run_id}-versioned-{format_size(file_size)}.pdf"
+
+    async def request(index: int) -> httpx.Response:
+        content = _payload(state.run_id, index, file_size, block)
+        result.bytes_sent += len(content)
+        return await client.post("/files/upload", files={"file": (name, content, "application/pdf")})
+
+    responses = await run_concurrently(result, requests, request)
+    versions = [r.json()["version"] for r in responses if r is not None and r.status_code == 201]
+    result.checks["versions_distinct"] = len(versions) == len(set(versions))
+    result.checks["versions_contiguous"] = sorted(versions) == list(range(1, len(versions) + 1))
+    return result
+
+
+async def list_files(
+        client: httpx.AsyncClient,
+        state: BenchmarkState,
+        requests: int,
+        concurrency: int,
+        limit: int = 100
+) -> ScenarioResult:
+    """Fetch the first page of the file listing."""
+    result = ScenarioResult(f"list[limit={limit}]", concurrency)
+    await run_concurrently(result, requests, lambda _: client.get("/files", params={"limit": limit}))
+    return result
+
+
+async def analyze(
+        client: httpx.AsyncClient,
+        state: BenchmarkState,
+        requests: int,
+        concurrency: int
+) -> ScenarioResult:
+    """Submit analysis of uploaded files (one request per file)."""
+    result = ScenarioResult("analyze", concurrency)
+    file_ids = state.file_ids[:requests]
+
+    async def request(index: int) -> httpx.Response:
+        state.analysis_submitted_at[file_ids[index]] = time.perf_counter()
+        return await client.post(f"/files/{file_ids[index]}/analyze")
+
+    await run_concurrently(result, len(file_ids), request)
+    return result
+
+
+async def analysis_completion(
+        client: httpx.AsyncClient,
+        state: BenchmarkState,
+        concurrency: int,
+        timeout: float = 300.0,
+        poll_interval: float = 0.02
+) -> ScenarioResult:
+    """
+    Wait for submitted analyses to finish.
+
+    Latency here is the time from submission until the result was first seen
+    completed, so it includes queueing; its resolution is ``poll_interval``.
+    """
+    result = ScenarioResult("analysis_completion", concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+    deadline = time.perf_counter() + timeout
+
+    async def wait(file_id: int) -> None:
+        while time.perf_counter() < deadline:
+            async with semaphore:
+                response = await client.get(f"/files/{file_id}/analysis")
+            status = response.json().get("status") if response.status_code == 200 else None
+            if status in ("completed", "failed"):
+                result.latencies.append(time.perf_counter() - state.analysis_submitted_at[file_id])
+                if status == "failed":
+                    result.record_error(f"Analysis of file {file_id} failed: {response.json().get('error')}")
+                return
+            await asyncio.sleep(poll_interval)
+        result.record_error(f"Analysis of file {file_id} did not finish in {timeout}s")
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(wait(file_id) for file_id in state.analysis_submitted_at))
+    result.duration = time.perf_counter() - started_at
+    return result
+
+
+async def get_analysis(
+        client: httpx.AsyncClient,
+        state: BenchmarkState,
+        requests: int,
+        concurrency: int
+) -> ScenarioResult:
+    """Read finished analysis results, cycling over the analysed files."""
+    result = ScenarioResult("get_analysis", concurrency)
+    file_ids = list(state.analysis_submitted_at) or state.file_ids
+    if not file_ids:
+        return result
+
+    await run_concurrently(
+        result,
+        requests,
+        lambda index: client.get(f"/files/{file_ids[index % len(file_ids)]}/analysis")
+    )
+    return result
+
+
+SCENARIOS: List[str] = ["upload", "upload_versions", "list", "analyze", "get_analysis"]
+
+
+def scenario_order(names: Optional[List[str]]) -> List[str]:
+    """Selected scenarios in dependency order (analysis needs uploaded files)."""
+    selected = set(names or SCENARIOS)
+    unknown = selected - set(SCENARIOS)
+    if unknown:
+        raise ValueError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+    return [name for name in SCENARIOS if name in selected]
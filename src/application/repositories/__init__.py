@@ -1,3 +1,11 @@
-from .file_repository import AbstractFileRepository
+from .file_repository import AbstractFileRepository, FileListQuery, RetentionPolicy
+from .search_index import AbstractSearchIndex, FileSearchHit, FileSearchQuery
 
-__all__ = ["AbstractFileRepository"]
+__all__ = [
+    "AbstractFileRepository",
+    "AbstractSearchIndex",
+    "FileListQuery",
+    "FileSearchHit",
+    "FileSearchQuery",
+    "RetentionPolicy",
+]
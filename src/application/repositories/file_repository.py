@@ -1,23 +1,182 @@
-from typing import List, Optional, Protocol
-from src.domain.entities import File, Analysis
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional, Protocol, Tuple
+from src.domain.entities import File, Analysis, Blob
+
+
+@dataclass
+class FileListQuery:
+    """Filters, ordering and keyset position for listing latest file versions."""
+    limit: Optional[int] = 100
+    sort: str = "uploaded_at"
+    descending: bool = True
+    # (sort value, id) of the last row of the previous page
+    after: Optional[Tuple[Any, int]] = None
+    name_prefix: Optional[str] = None
+    uploaded_from: Optional[datetime] = None
+    uploaded_to: Optional[datetime] = None
+    uploaded_by: Optional[int] = None
+    min_size: Optional[int] = None
+    max_size: Optional[int] = None
+
+
+@dataclass
+class RetentionPolicy:
+    """
+    Which versions of a document to keep; the others expire.
+
+    A version is kept if it is among the newest ``keep_versions`` versions of
+    its document or younger than ``keep_for``. An unset limit keeps nothing
+    by itself, and with neither set nothing expires. The latest version is
+    always kept.
+    """
+    keep_versions: int = 0
+    keep_for: Optional[timedelta] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.keep_versions > 0 or self.keep_for is not None
 
 
 class AbstractFileRepository(Protocol):
 
-    def add(self, file: File) -> File:
+    async def add(self, file: File) -> File:
+        """
+        Store a new version; the repository allocates ``version`` atomically.
+
+        Raises:
+            BlobNotFoundError: the blob the version references was deleted
+        """
+        raise NotImplementedError()
+
+    async def add_many(self, files: List[File]) -> List[File]:
+        """
+        Store new versions in one transaction; repeated names get consecutive versions.
+
+        Raises:
+            BlobNotFoundError: a blob one of the versions references was deleted
+        """
+        raise NotImplementedError()
+
+    async def get_by_ids(self, file_ids: List[int]) -> Dict[int, File]:
+        raise NotImplementedError()
+
+    async def get_with_latest_analysis(self, file_id: int) -> Tuple[Optional[File], Optional[Analysis]]:
+        """
+        Fetch a file and its latest analysis in one query.
+
+        Returns:
+            The file with ``analysis_id`` set, and the analysis; ``(None, None)``
+            if the file does not exist, ``(file, None)`` if it was never analyzed
+        """
+        raise NotImplementedError()
+
+    async def get_many_with_latest_analyses(self, file_ids: List[int]) -> Dict[int, Tuple[File, Optional[Analysis]]]:
+        """Like ``get_with_latest_analysis`` for many files; missing files are left out."""
+        raise NotImplementedError()
+
+    async def find_latest_by_original_name(self, original_name: str) -> Optional[File]:
+        raise NotImplementedError()
+
+    async def find_latest_by_original_names(self, original_names: List[str]) -> Dict[str, File]:
+        raise NotImplementedError()
+
+    async def list_latest_versions(self, query: FileListQuery) -> List[File]:
+        raise NotImplementedError()
+
+    def iter_latest_versions(self, query: FileListQuery) -> AsyncIterator[File]:
+        raise NotImplementedError()
+
+    async def list_latest_versions_with_analyses(self, query: FileListQuery) -> List[Tuple[File, Optional[Analysis]]]:
+        """``list_latest_versions`` with each file's latest analysis, in the same query."""
+        raise NotImplementedError()
+
+    async def find_blob_by_checksum(self, checksum: str) -> Optional[Blob]:
+        """Find a blob to reference from a new version, marking it as just used."""
+        raise NotImplementedError()
+
+    async def find_blobs_by_checksums(self, checksums: List[str]) -> Dict[str, Blob]:
+        """Like ``find_blob_by_checksum`` for many contents; unknown ones are left out."""
+        raise NotImplementedError()
+
+    async def add_blob(self, blob: Blob) -> Blob:
+        raise NotImplementedError()
+
+    async def add_blobs(self, blobs: List[Blob]) -> List[Blob]:
+        raise NotImplementedError()
+
+    async def add_analysis(self, analysis: Analysis) -> Analysis:
+        raise NotImplementedError()
+
+    async def add_analyses(self, analyses: List[Analysis]) -> List[Analysis]:
+        raise NotImplementedError()
+
+    async def get_analysis_by_file_id(self, file_id: int) -> Optional[Analysis]:
+        raise NotImplementedError()
+
+    async def get_latest_analyses_by_file_ids(self, file_ids: List[int]) -> Dict[int, Analysis]:
+        raise NotImplementedError()
+
+    async def get_analysis_by_id(self, analysis_id: int) -> Optional[Analysis]:
+        raise NotImplementedError()
+
+    async def update_analysis(self, analysis: Analysis) -> Analysis:
+        raise NotImplementedError()
+
+    async def claim_next_analysis(self, stale_before: datetime) -> Optional[Analysis]:
+        """Claim the oldest claimable analysis, as ``claim_analysis`` does."""
         raise NotImplementedError()
 
-    def get_by_id(self, file_id: int) -> Optional[File]:
+    async def claim_analysis(self, analysis_id: int, stale_before: datetime) -> Optional[Analysis]:
+        """
+        Atomically mark an analysis as running for the calling worker.
+
+        A pending analysis can be claimed, and so can a running one whose
+        worker claimed it before ``stale_before`` and is presumed dead.
+
+        Returns:
+            The claimed analysis, or None when another worker owns it or it
+            has finished
+        """
         raise NotImplementedError()
 
-    def find_latest_by_original_name(self, original_name: str) -> Optional[File]:
+    async def list_unfinished_analyses(self) -> List[Analysis]:
+        """Pending and running analyses, oldest first."""
         raise NotImplementedError()
 
-    def list_latest_versions(self) -> List[File]:
+    async def list_document_names(self, after: Optional[str], limit: int) -> List[str]:
+        """Names of documents in name order, starting after ``after``."""
         raise NotImplementedError()
 
-    def add_analysis(self, analysis: Analysis) -> Analysis:
+    async def find_expired_versions(
+            self,
+            original_names: List[str],
+            policy: RetentionPolicy,
+            now: datetime
+    ) -> List[int]:
+        """Ids of versions of the given documents that ``policy`` does not keep."""
         raise NotImplementedError()
 
-    def get_analysis_by_file_id(self, file_id: int) -> Optional[Analysis]:
+    async def delete_versions(self, file_ids: List[int]) -> List[str]:
+        """
+        Delete file versions with their analyses in one transaction.
+
+        Returns:
+            Storage paths that no remaining row references any more and
+            whose objects can be deleted
+        """
+        raise NotImplementedError()
+
+    async def delete_orphaned_blobs(self, used_before: datetime, limit: int) -> List[str]:
+        """
+        Delete up to ``limit`` blobs that no file version uses and no other
+        blob is delta-encoded against.
+
+        Blobs created or found for reuse after ``used_before`` are left
+        alone: the file rows referencing them may not be committed yet.
+
+        Returns:
+            Storage paths whose objects can be deleted; empty when no
+            orphaned blobs are left
+        """
         raise NotImplementedError()
@@ -0,0 +1,36 @@
+from dataclasses import dataclass
+from typing import List, Optional, Protocol, Tuple
+from src.domain.entities import File
+
+
+@dataclass
+class FileSearchQuery:
+    """Full-text query over file names, extracted text and analysis results."""
+    text: str
+    limit: int = 20
+    # (score, id) of the last hit of the previous page
+    after: Optional[Tuple[float, int]] = None
+    # By default only the latest version of each document is returned.
+    all_versions: bool = False
+
+
+@dataclass
+class FileSearchHit:
+    """A file version matching a search, with its relevance."""
+    file: File
+    # Higher is more relevant; only comparable within one query.
+    score: float
+    snippet: Optional[str] = None
+
+
+class AbstractSearchIndex(Protocol):
+
+    async def search(self, query: FileSearchQuery) -> List[FileSearchHit]:
+        """
+        Find file versions matching all words of ``query.text``; the last
+        word also matches as a prefix.
+
+        Returns:
+            Hits ordered by descending score, then id
+        """
+        raise NotImplementedError()
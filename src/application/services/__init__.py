@@ -1,4 +1,17 @@
-from .analysis_service import AnalysisServiceInterface
-from .storage_service import AbstractStorageService
+from .analysis_cache import AbstractAnalysisCache
+from .analysis_queue import AbstractAnalysisQueue
+from .analysis_service import AnalysisServiceInterface, DocumentContent
+from .storage_service import AbstractStorageService, PresignedUpload, StoredObject
+from .text_store import AbstractTextStore, ExtractedText
 
-__all__ = ["AnalysisServiceInterface", "AbstractStorageService"]
+__all__ = [
+    "AbstractAnalysisCache",
+    "AbstractAnalysisQueue",
+    "AnalysisServiceInterface",
+    "AbstractStorageService",
+    "AbstractTextStore",
+    "DocumentContent",
+    "ExtractedText",
+    "PresignedUpload",
+    "StoredObject",
+]
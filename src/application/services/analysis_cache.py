@@ -0,0 +1,42 @@
+from typing import Dict, List, Optional, Protocol
+
+
+class AbstractAnalysisCache(Protocol):
+    """Abstract cache of analysis results keyed by content and analyzer identity."""
+
+    async def get(self, checksum: str, fingerprint: str) -> Optional[str]:
+        """
+        Look up a cached analysis result.
+
+        Args:
+            checksum: SHA-256 of the analyzed content
+            fingerprint: Identity of the analyzer, model and prompt
+
+        Returns:
+            Cached result text, or None on a miss
+        """
+        raise NotImplementedError()
+
+    async def get_many(self, checksums: List[str], fingerprint: str) -> Dict[str, str]:
+        """
+        Look up cached analysis results of many contents at once.
+
+        Args:
+            checksums: SHA-256 of the analyzed contents
+            fingerprint: Identity of the analyzer, model and prompt
+
+        Returns:
+            Cached result texts by checksum; misses are absent
+        """
+        raise NotImplementedError()
+
+    async def set(self, checksum: str, fingerprint: str, result_text: str) -> None:
+        """
+        Store an analysis result.
+
+        Args:
+            checksum: SHA-256 of the analyzed content
+            fingerprint: Identity of the analyzer, model and prompt
+            result_text: Analysis result to cache
+        """
+        raise NotImplementedError()
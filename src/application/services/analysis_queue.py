@@ -0,0 +1,23 @@
+from typing import Protocol
+
+
+class AbstractAnalysisQueue(Protocol):
+    """Abstract queue of analysis jobs waiting for a worker."""
+
+    async def enqueue(self, analysis_id: int) -> None:
+        """
+        Schedule a pending analysis for processing.
+
+        Args:
+            analysis_id: ID of the pending analysis
+        """
+        raise NotImplementedError()
+
+    async def dequeue(self) -> int:
+        """
+        Wait for the next analysis job and take ownership of it.
+
+        Returns:
+            ID of the analysis to process
+        """
+        raise NotImplementedError()
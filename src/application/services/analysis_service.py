@@ -1,17 +1,51 @@
-from typing import Protocol
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, Optional, Protocol
+
+
+@dataclass
+class DocumentContent:
+    """A stored file version as handed to analyzers; the content is read lazily."""
+    file_name: str
+    size_bytes: int
+    # SHA-256 of the content; None for files stored before hashing was introduced.
+    checksum: Optional[str]
+    # Set when the content is a plain file on the local filesystem.
+    local_path: Optional[str]
+    read: Callable[[], Awaitable[bytes]]
+
 
 class AnalysisServiceInterface(Protocol):
     """Abstract service interface for AI analysis."""
+
+    # Identity of the analyzer, model and prompt. Results are cached per
+    # content checksum and fingerprint, so they must not depend on file_name.
+    fingerprint: str
     
-    async def analyze(self, file_content: bytes, file_name: str) -> str:
+    async def analyze(self, document: DocumentContent) -> str:
         """
-        Analyze file content and return a text result.
+        Analyze a stored document and return a text result.
         
         Args:
-            file_content: File content as bytes
-            file_name: Name of the file
+            document: The document; its content is only read if the analyzer needs it
             
         Returns:
             Analysis result as text
         """
         raise NotImplementedError()
+
+    def analyze_stream(self, document: DocumentContent) -> AsyncIterator[str]:
+        """
+        Analyze a stored document, yielding the result text in pieces as it
+        is generated.
+
+        Args:
+            document: The document; its content is only read if the analyzer needs it
+
+        Returns:
+            Async iterator of text fragments; joined they equal the result of ``analyze``
+        """
+        raise NotImplementedError()
+
+    async def close(self) -> None:
+        """Release clients and connections held by the analyzer."""
+        raise NotImplementedError()
@@ -1,30 +1,173 @@
-from typing import Protocol
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, List, Optional, Protocol
+
+
+@dataclass
+class StoredObject:
+    """Result of writing an object to storage."""
+    path: str
+    size_bytes: int
+    checksum: str
+    # Object the content was delta-encoded against; it must outlive this one.
+    base_path: Optional[str] = None
+
+
+@dataclass
+class PresignedUpload:
+    """Request a client sends to upload an object straight to storage."""
+    url: str
+    method: str
+    # Headers the request must carry, e.g. the checksum storage verifies.
+    headers: Dict[str, str]
+    expires_at: datetime
 
 
 class AbstractStorageService(Protocol):
     """Abstract service interface for file storage operations."""
 
-    async def save(self, file_name: str, content: bytes) -> str:
+    async def save(
+            self,
+            file_name: str,
+            chunks: AsyncIterator[bytes],
+            checksum: Optional[str] = None,
+            base_path: Optional[str] = None
+    ) -> StoredObject:
         """
-        Save file content to storage.
-        
+        Stream file content to storage.
+
+        The content is consumed chunk by chunk, so implementations must not
+        buffer the whole file in memory. Size and SHA-256 checksum are
+        computed while the data is written.
+
         Args:
             file_name: Name of the file
-            content: File content as bytes
-            
+            chunks: Async iterator yielding file content in chunks
+            checksum: Expected SHA-256 of the content. When given, the object
+                is stored under a key starting with it and the written data is
+                verified against it. Keys are never reused, even for the same
+                content, so deleting an earlier object cannot remove this one.
+            base_path: Path of the previous version of the same document.
+                Implementations may store the content as a delta against it;
+                others ignore it.
+
         Returns:
-            Path or identifier where the file was saved
+            Path, size and checksum of the stored object
         """
         raise NotImplementedError()
 
     async def read(self, path: str) -> bytes:
         """
         Read file content from storage.
-        
+
         Args:
             path: Path or identifier of the file in storage
-            
+
         Returns:
             File content as bytes
         """
         raise NotImplementedError()
+
+    async def delete(self, path: str) -> None:
+        """
+        Delete an object from storage.
+
+        Args:
+            path: Path or identifier of the file in storage
+        """
+        raise NotImplementedError()
+
+    async def delete_many(self, paths: List[str]) -> None:
+        """
+        Delete many objects, in as few storage requests as the backend allows.
+
+        Missing objects are ignored.
+
+        Args:
+            paths: Paths or identifiers of the files in storage
+        """
+        raise NotImplementedError()
+
+    async def presign_upload(
+            self,
+            upload_id: str,
+            checksum: str,
+            expires: timedelta
+    ) -> Optional[PresignedUpload]:
+        """
+        Let a client upload an object directly, bypassing this process.
+
+        Args:
+            upload_id: Unique identifier the object is stored under
+            checksum: SHA-256 of the content; storage rejects other content
+            expires: How long the upload request stays valid
+
+        Returns:
+            Request to send, or None when the backend cannot accept direct uploads
+        """
+        raise NotImplementedError()
+
+    async def find_upload(self, upload_id: str) -> Optional[StoredObject]:
+        """
+        Look up an object uploaded through ``presign_upload``.
+
+        Only metadata is read; the content is not transferred.
+
+        Args:
+            upload_id: Identifier passed to ``presign_upload``
+
+        Returns:
+            Path, size and the SHA-256 verified by storage (empty when storage
+            did not verify one), or None when nothing has been uploaded
+        """
+        raise NotImplementedError()
+
+    async def store_upload(self, upload_id: str, checksum: str) -> str:
+        """
+        Move a verified direct upload to a new key like the ones ``save`` uses.
+
+        The move happens inside storage, without transferring the content
+        through this process.
+
+        Args:
+            upload_id: Identifier passed to ``presign_upload``
+            checksum: Verified SHA-256 of the content
+
+        Returns:
+            Path of the stored object
+        """
+        raise NotImplementedError()
+
+    def local_path(self, path: str) -> Optional[str]:
+        """
+        Path of the object on the local filesystem, if it is stored there as is.
+
+        Lets callers hand the file to the OS (sendfile, mmap) instead of
+        streaming it through the process.
+
+        Args:
+            path: Path or identifier of the file in storage
+
+        Returns:
+            Absolute filesystem path, or None when the object is not a plain local file
+        """
+        raise NotImplementedError()
+
+    def stream(
+            self,
+            path: str,
+            offset: int = 0,
+            length: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream file content from storage in chunks.
+
+        Args:
+            path: Path or identifier of the file in storage
+            offset: Byte offset to start reading from
+            length: Number of bytes to read; None reads to the end
+
+        Returns:
+            Async iterator yielding file content in chunks
+        """
+        raise NotImplementedError()
@@ -0,0 +1,45 @@
+from dataclasses import dataclass
+from typing import Optional, Protocol
+
+
+@dataclass
+class ExtractedText:
+    """Text extracted from the first pages of a document."""
+    text: str
+    pages_extracted: int
+    # Total number of pages, when the extractor knows it.
+    page_count: Optional[int] = None
+    # True when every page was extracted; otherwise extraction stopped at a budget.
+    complete: bool = True
+
+    def covers(self, char_budget: int) -> bool:
+        """Whether this text is enough for a consumer that needs ``char_budget`` characters."""
+        return self.complete or len(self.text) >= char_budget
+
+
+class AbstractTextStore(Protocol):
+    """Abstract store of text extracted from stored contents."""
+
+    async def get(self, checksum: str, extractor: str) -> Optional[ExtractedText]:
+        """
+        Look up previously extracted text.
+
+        Args:
+            checksum: SHA-256 of the content
+            extractor: Identity of the extractor that produced the text
+
+        Returns:
+            Stored text, or None if the content was never extracted
+        """
+        raise NotImplementedError()
+
+    async def set(self, checksum: str, extractor: str, extracted: ExtractedText) -> None:
+        """
+        Store extracted text, replacing a shorter extraction of the same content.
+
+        Args:
+            checksum: SHA-256 of the content
+            extractor: Identity of the extractor that produced the text
+            extracted: Text to store
+        """
+        raise NotImplementedError()
@@ -1,11 +1,36 @@
 from .upload_file import UploadFileUseCase
+from .batch_upload_files import BatchUploadFilesUseCase, UploadItem, UploadResult
+from .start_direct_upload import StartDirectUploadUseCase, DirectUpload
+from .complete_direct_upload import CompleteDirectUploadUseCase
 from .list_files import ListFilesUseCase
+from .search_files import SearchFilesUseCase, SearchPage
 from .analyze_file import AnalyzeFileUseCase
-from .get_analysis import GetAnalysisUseCase
+from .batch_analyze_files import BatchAnalyzeFilesUseCase, AnalysisRequestResult
+from .process_analysis import ProcessAnalysisUseCase
+from .stream_analysis import StreamAnalysisUseCase
+from .get_analysis import GetAnalysisUseCase, AnalysisLookupResult
+from .download_file import DownloadFileUseCase
+from .compact_versions import CompactVersionsUseCase, CompactionResult
 
 __all__ = [
     "UploadFileUseCase",
+    "BatchUploadFilesUseCase",
+    "UploadItem",
+    "UploadResult",
+    "StartDirectUploadUseCase",
+    "DirectUpload",
+    "CompleteDirectUploadUseCase",
     "ListFilesUseCase",
+    "SearchFilesUseCase",
+    "SearchPage",
     "AnalyzeFileUseCase",
+    "BatchAnalyzeFilesUseCase",
+    "AnalysisRequestResult",
+    "ProcessAnalysisUseCase",
+    "StreamAnalysisUseCase",
     "GetAnalysisUseCase",
+    "AnalysisLookupResult",
+    "DownloadFileUseCase",
+    "CompactVersionsUseCase",
+    "CompactionResult",
 ]
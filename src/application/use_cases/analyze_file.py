@@ -1,38 +1,61 @@
 from datetime import datetime
-from src.domain.entities import Analysis
+from src.domain.entities import Analysis, AnalysisStatus
 from src.domain.exceptions import FileNotFoundError
 from src.application.repositories import AbstractFileRepository
-from src.application.services import AnalysisServiceInterface, AbstractStorageService
+from src.application.services import (
+    AbstractAnalysisCache,
+    AbstractAnalysisQueue,
+    AnalysisServiceInterface,
+)
 
 
 class AnalyzeFileUseCase:
-    """Use case for analyzing a file using AI."""
+    """Use case for requesting AI analysis of a file."""
 
     def __init__(
             self,
             file_repository: AbstractFileRepository,
+            analysis_queue: AbstractAnalysisQueue,
             analysis_service: AnalysisServiceInterface,
-            storage_service: AbstractStorageService
+            analysis_cache: AbstractAnalysisCache
     ):
         self.file_repository = file_repository
+        self.analysis_queue = analysis_queue
         self.analysis_service = analysis_service
-        self.storage_service = storage_service
+        self.analysis_cache = analysis_cache
 
     async def execute(self, file_id: int) -> Analysis:
-        file = self.file_repository.get_by_id(file_id)
+        file = await self.file_repository.get_by_id(file_id)
         if file is None:
             raise FileNotFoundError(file_id)
 
-        file_content = await self.storage_service.read(file.path)
-
-        result_text = await self.analysis_service.analyze(file_content, file.original_name)
-
-        analysis = Analysis(
+        # A repeated request while a job is still in flight joins that job.
+        latest = await self.file_repository.get_analysis_by_file_id(file_id)
+        if latest is not None and latest.status in (AnalysisStatus.PENDING, AnalysisStatus.RUNNING):
+            return latest
+
+        if file.checksum:
+            cached = await self.analysis_cache.get(file.checksum, self.analysis_service.fingerprint)
+            if cached is not None:
+                now = datetime.now()
+                return await self.file_repository.add_analysis(Analysis(
+                    id=None,
+                    file_id=file_id,
+                    status=AnalysisStatus.COMPLETED,
+                    result_text=cached,
+                    created_at=now,
+                    started_at=now,
+                    completed_at=now
+                ))
+
+        analysis = await self.file_repository.add_analysis(Analysis(
             id=None,
             file_id=file_id,
-            status="completed",
-            result_text=result_text,
+            status=AnalysisStatus.PENDING,
+            result_text=None,
             created_at=datetime.now()
-        )
+        ))
+
+        await self.analysis_queue.enqueue(analysis.id)
 
-        return self.file_repository.add_analysis(analysis)
+        return analysis
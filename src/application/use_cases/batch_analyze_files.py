@@ -0,0 +1,95 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+from src.domain.entities import Analysis, AnalysisStatus, File
+from src.application.repositories import AbstractFileRepository, FileListQuery
+from src.application.services import (
+    AbstractAnalysisCache,
+    AbstractAnalysisQueue,
+    AnalysisServiceInterface,
+)
+
+
+@dataclass
+class AnalysisRequestResult:
+    """Outcome of requesting analysis of one file of a batch."""
+    file_id: int
+    analysis: Optional[Analysis] = None
+    error: Optional[str] = None
+
+
+class BatchAnalyzeFilesUseCase:
+    """
+    Use case for requesting AI analysis of many files at once.
+
+    Jobs go through the analysis queue, so the worker pool bounds how many
+    run in parallel. Lookups and inserts are done for the whole batch.
+    """
+
+    def __init__(
+            self,
+            file_repository: AbstractFileRepository,
+            analysis_queue: AbstractAnalysisQueue,
+            analysis_service: AnalysisServiceInterface,
+            analysis_cache: AbstractAnalysisCache
+    ):
+        self.file_repository = file_repository
+        self.analysis_queue = analysis_queue
+        self.analysis_service = analysis_service
+        self.analysis_cache = analysis_cache
+
+    async def execute(self, file_ids: List[int]) -> List[AnalysisRequestResult]:
+        file_ids = list(dict.fromkeys(file_ids))
+        files = await self.file_repository.get_by_ids(file_ids)
+
+        results = [AnalysisRequestResult(file_id=file_id) for file_id in file_ids]
+        for result in results:
+            if result.file_id not in files:
+                result.error = f"File with id {result.file_id} not found"
+
+        await self._request([files[r.file_id] for r in results if r.error is None], results)
+        return results
+
+    async def execute_for_query(self, query: FileListQuery) -> List[AnalysisRequestResult]:
+        files = await self.file_repository.list_latest_versions(query)
+        results = [AnalysisRequestResult(file_id=file.id) for file in files]
+        await self._request(files, results)
+        return results
+
+    async def _request(self, files: List[File], results: List[AnalysisRequestResult]) -> None:
+        results_by_file_id = {result.file_id: result for result in results}
+
+        # Files with a job still in flight join that job.
+        latest = await self.file_repository.get_latest_analyses_by_file_ids([file.id for file in files])
+        to_create = []
+        for file in files:
+            analysis = latest.get(file.id)
+            if analysis is not None and analysis.status in (AnalysisStatus.PENDING, AnalysisStatus.RUNNING):
+                results_by_file_id[file.id].analysis = analysis
+            else:
+                to_create.append(file)
+
+        fingerprint = self.analysis_service.fingerprint
+        cached = await self.analysis_cache.get_many(
+            [file.checksum for file in to_create if file.checksum],
+            fingerprint
+        )
+
+        now = datetime.now()
+        new_analyses = []
+        for file in to_create:
+            result_text = cached.get(file.checksum) if file.checksum else None
+            new_analyses.append(Analysis(
+                id=None,
+                file_id=file.id,
+                status=AnalysisStatus.COMPLETED if result_text is not None else AnalysisStatus.PENDING,
+                result_text=result_text,
+                created_at=now,
+                started_at=now if result_text is not None else None,
+                completed_at=now if result_text is not None else None
+            ))
+
+        for analysis in await self.file_repository.add_analyses(new_analyses):
+            results_by_file_id[analysis.file_id].analysis = analysis
+            if analysis.status == AnalysisStatus.PENDING:
+                await self.analysis_queue.enqueue(analysis.id)
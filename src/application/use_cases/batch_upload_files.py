@@ -0,0 +1,122 @@
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional
+from src.domain.entities import File, Blob
+from src.application.repositories import AbstractFileRepository
+from src.application.services import AbstractStorageService, StoredObject
+
+
+@dataclass
+class UploadItem:
+    """One file of a batch upload."""
+    original_name: str
+    chunks: AsyncIterator[bytes]
+    checksum: str
+
+
+@dataclass
+class UploadResult:
+    """Outcome of one file of a batch upload: the created version or an error."""
+    original_name: str
+    file: Optional[File] = None
+    error: Optional[str] = None
+
+
+class BatchUploadFilesUseCase:
+    """Use case for uploading many files in one transaction."""
+
+    def __init__(
+            self,
+            file_repository: AbstractFileRepository,
+            storage_service: AbstractStorageService,
+            max_concurrency: int
+    ):
+        self.file_repository = file_repository
+        self.storage_service = storage_service
+        self.max_concurrency = max_concurrency
+
+    async def execute(self, items: List[UploadItem], uploaded_by: int = 1) -> List[UploadResult]:
+        results = [UploadResult(original_name=item.original_name) for item in items]
+
+        blobs = await self.file_repository.find_blobs_by_checksums([item.checksum for item in items])
+        errors = await self._store_new_contents(items, blobs)
+
+        files = []
+        created = []
+        now = datetime.now()
+        for item, result in zip(items, results):
+            if item.checksum in errors:
+                result.error = errors[item.checksum]
+                continue
+
+            blob = blobs[item.checksum]
+            files.append(File(
+                id=None,
+                original_name=item.original_name,
+                path=blob.path,
+                version=None,
+                size_bytes=blob.size_bytes,
+                uploaded_at=now,
+                uploaded_by=uploaded_by,
+                checksum=blob.checksum,
+                blob_id=blob.id
+            ))
+            created.append(result)
+
+        for result, file in zip(created, await self.file_repository.add_many(files)):
+            result.file = file
+
+        return results
+
+    async def _store_new_contents(self, items: List[UploadItem], blobs: Dict[str, Blob]) -> Dict[str, str]:
+        """Write contents missing from ``blobs`` and register them; returns errors by checksum."""
+        # Each new content is written once, however many items carry it.
+        pending: Dict[str, UploadItem] = {}
+        for item in items:
+            if item.checksum not in blobs:
+                pending.setdefault(item.checksum, item)
+
+        latest = await self.file_repository.find_latest_by_original_names(
+            [item.original_name for item in pending.values()]
+        )
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def write(item: UploadItem) -> StoredObject:
+            previous = latest.get(item.original_name)
+            async with semaphore:
+                return await self.storage_service.save(
+                    item.original_name,
+                    item.chunks,
+                    checksum=item.checksum,
+                    base_path=previous.path if previous else None
+                )
+
+        outcomes = await asyncio.gather(*(write(item) for item in pending.values()), return_exceptions=True)
+
+        errors = {}
+        new_blobs = []
+        for checksum, outcome in zip(pending, outcomes):
+            if isinstance(outcome, BaseException):
+                errors[checksum] = str(outcome) or type(outcome).__name__
+                continue
+            new_blobs.append(Blob(
+                id=None,
+                checksum=outcome.checksum,
+                path=outcome.path,
+                size_bytes=outcome.size_bytes,
+                created_at=datetime.now(),
+                base_path=outcome.base_path
+            ))
+
+        registered = await self.file_repository.add_blobs(new_blobs)
+        for blob in registered:
+            blobs[blob.checksum] = blob
+
+        # Contents registered concurrently by another upload keep that copy;
+        # objects written here under a different key would never be referenced.
+        unused = [new.path for new, blob in zip(new_blobs, registered) if blob.path != new.path]
+        if unused:
+            await self.storage_service.delete_many(unused)
+
+        return errors
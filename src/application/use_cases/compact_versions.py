@@ -0,0 +1,66 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List
+from src.application.repositories import AbstractFileRepository, RetentionPolicy
+from src.application.services import AbstractStorageService
+
+
+@dataclass
+class CompactionResult:
+    """What one compaction pass deleted."""
+    versions_deleted: int = 0
+    objects_deleted: int = 0
+
+
+class CompactVersionsUseCase:
+    """
+    Use case for deleting versions expired by the retention policy, and then
+    the blobs and storage objects nothing references any more.
+
+    Documents are visited in name order a batch at a time and every delete
+    runs in its own short transaction, so a pass never holds locks for long
+    and uploads proceed in between. Objects are deleted only after the rows
+    referencing them are gone; storage never reuses a key, so an upload of
+    the same content in the meantime writes a new object this pass leaves alone.
+    """
+
+    def __init__(
+            self,
+            file_repository: AbstractFileRepository,
+            storage_service: AbstractStorageService,
+            policy: RetentionPolicy,
+            batch_size: int,
+            blob_grace: timedelta
+    ):
+        self.file_repository = file_repository
+        self.storage_service = storage_service
+        self.policy = policy
+        self.batch_size = batch_size
+        self.blob_grace = blob_grace
+
+    async def execute(self) -> CompactionResult:
+        result = CompactionResult()
+        now = datetime.now()
+
+        if self.policy.enabled:
+            after = None
+            while names := await self.file_repository.list_document_names(after, self.batch_size):
+                expired = await self.file_repository.find_expired_versions(names, self.policy, now)
+                for start in range(0, len(expired), self.batch_size):
+                    batch = expired[start:start + self.batch_size]
+                    await self._delete_objects(await self.file_repository.delete_versions(batch), result)
+                    result.versions_deleted += len(batch)
+                after = names[-1]
+
+        # Deleting a delta-encoded blob can orphan its base, so this repeats
+        # until no orphans are left.
+        used_before = now - self.blob_grace
+        while paths := await self.file_repository.delete_orphaned_blobs(used_before, self.batch_size):
+            await self._delete_objects(paths, result)
+
+        return result
+
+    async def _delete_objects(self, paths: List[str], result: CompactionResult) -> None:
+        if paths:
+            await self.storage_service.delete_many(paths)
+            result.objects_deleted += len(paths)
@@ -0,0 +1,76 @@
+from datetime import datetime
+from typing import Optional
+from src.domain.entities import File, Blob
+from src.domain.exceptions import UploadNotFoundError, UploadVerificationError
+from src.application.repositories import AbstractFileRepository
+from src.application.services import AbstractStorageService
+
+
+class CompleteDirectUploadUseCase:
+    """
+    Use case for recording a version uploaded straight to storage.
+
+    The object is verified from its metadata only: its size, and the SHA-256
+    storage checked while receiving it. The content never passes through
+    this process.
+    """
+
+    def __init__(
+            self,
+            file_repository: AbstractFileRepository,
+            storage_service: AbstractStorageService
+    ):
+        self.file_repository = file_repository
+        self.storage_service = storage_service
+
+    async def execute(
+            self,
+            upload_id: str,
+            original_name: str,
+            size_bytes: int,
+            checksum: str,
+            uploaded_by: int = 1
+    ) -> File:
+        stored = await self.storage_service.find_upload(upload_id)
+        if stored is None:
+            raise UploadNotFoundError(upload_id)
+
+        problem: Optional[str] = None
+        if stored.checksum != checksum:
+            problem = f"expected SHA-256 {checksum}, storage verified {stored.checksum or 'none'}"
+        elif stored.size_bytes != size_bytes:
+            problem = f"expected {size_bytes} bytes, got {stored.size_bytes}"
+        if problem is not None:
+            await self.storage_service.delete(stored.path)
+            raise UploadVerificationError(upload_id, problem)
+
+        blob = await self.file_repository.find_blob_by_checksum(checksum)
+        if blob is None:
+            path = await self.storage_service.store_upload(upload_id, checksum)
+            blob = await self.file_repository.add_blob(Blob(
+                id=None,
+                checksum=checksum,
+                path=path,
+                size_bytes=stored.size_bytes,
+                created_at=datetime.now()
+            ))
+            if blob.path != path:
+                # Registered concurrently under another key; keep that copy.
+                await self.storage_service.delete(path)
+        else:
+            # The same content was stored meanwhile; the upload is not needed.
+            await self.storage_service.delete(stored.path)
+
+        file = File(
+            id=None,
+            original_name=original_name,
+            path=blob.path,
+            version=None,
+            size_bytes=blob.size_bytes,
+            uploaded_at=datetime.now(),
+            uploaded_by=uploaded_by,
+            checksum=blob.checksum,
+            blob_id=blob.id
+        )
+
+        return await self.file_repository.add(file)
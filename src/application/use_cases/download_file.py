@@ -0,0 +1,36 @@
+from typing import AsyncIterator, Optional
+from src.domain.entities import File
+from src.domain.exceptions import FileNotFoundError
+from src.application.repositories import AbstractFileRepository
+from src.application.services import AbstractStorageService
+
+
+class DownloadFileUseCase:
+    """Use case for streaming a stored file version back to the client."""
+
+    def __init__(
+            self,
+            file_repository: AbstractFileRepository,
+            storage_service: AbstractStorageService
+    ):
+        self.file_repository = file_repository
+        self.storage_service = storage_service
+
+    async def execute(self, file_id: int) -> File:
+        file = await self.file_repository.get_by_id(file_id)
+        if file is None:
+            raise FileNotFoundError(file_id)
+
+        return file
+
+    def local_path(self, file: File) -> Optional[str]:
+        """Filesystem path of the content when it can be sent from disk directly."""
+        return self.storage_service.local_path(file.path)
+
+    def open(
+            self,
+            file: File,
+            offset: int = 0,
+            length: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        return self.storage_service.stream(file.path, offset=offset, length=length)
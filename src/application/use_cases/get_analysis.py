@@ -1,20 +1,44 @@
+from dataclasses import dataclass
+from typing import List, Optional
 from src.domain.entities import Analysis
 from src.domain.exceptions import AnalysisNotFoundError, FileNotFoundError
 from src.application.repositories import AbstractFileRepository
 
 
+@dataclass
+class AnalysisLookupResult:
+    """Latest analysis of one file of a bulk lookup, or why there is none."""
+    file_id: int
+    analysis: Optional[Analysis] = None
+    error: Optional[str] = None
+
+
 class GetAnalysisUseCase:
 
     def __init__(self, file_repository: AbstractFileRepository):
         self.file_repository = file_repository
 
-    def execute(self, file_id: int) -> Analysis:
-        file = self.file_repository.get_by_id(file_id)
+    async def execute(self, file_id: int) -> Analysis:
+        file, analysis = await self.file_repository.get_with_latest_analysis(file_id)
         if file is None:
             raise FileNotFoundError(file_id)
-
-        analysis = self.file_repository.get_analysis_by_file_id(file_id)
         if analysis is None:
             raise AnalysisNotFoundError(file_id)
 
         return analysis
+
+    async def execute_many(self, file_ids: List[int]) -> List[AnalysisLookupResult]:
+        """Latest analyses of many files in one query, in request order."""
+        found = await self.file_repository.get_many_with_latest_analyses(file_ids)
+
+        results = []
+        for file_id in dict.fromkeys(file_ids):
+            if file_id not in found:
+                results.append(AnalysisLookupResult(file_id=file_id, error=str(FileNotFoundError(file_id))))
+                continue
+            _, analysis = found[file_id]
+            if analysis is None:
+                results.append(AnalysisLookupResult(file_id=file_id, error=str(AnalysisNotFoundError(file_id))))
+            else:
+                results.append(AnalysisLookupResult(file_id=file_id, analysis=analysis))
+        return results
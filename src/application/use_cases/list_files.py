@@ -1,6 +1,20 @@
-from typing import List
-from src.domain.entities import File
-from src.application.repositories import AbstractFileRepository
+import base64
+import json
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional
+from src.domain.entities import Analysis, File
+from src.domain.exceptions import InvalidCursorError
+from src.application.repositories import AbstractFileRepository, FileListQuery
+
+
+@dataclass
+class FilePage:
+    """One page of latest file versions and the cursor of the next page."""
+    items: List[File]
+    next_cursor: Optional[str]
+    # Latest analysis by file id, when requested; files never analyzed are absent.
+    analyses: Dict[int, Analysis] = field(default_factory=dict)
 
 
 class ListFilesUseCase:
@@ -8,5 +22,63 @@ class ListFilesUseCase:
     def __init__(self, file_repository: AbstractFileRepository):
         self.file_repository = file_repository
 
-    def execute(self) -> List[File]:
-        return self.file_repository.list_latest_versions()
+    async def execute(
+            self,
+            query: FileListQuery,
+            cursor: Optional[str] = None,
+            include_analysis: bool = False
+    ) -> FilePage:
+        if cursor is not None:
+            query = replace(query, after=self._decode_cursor(cursor, query))
+
+        # One extra row tells whether another page exists.
+        page_query = replace(query, limit=query.limit + 1)
+        analyses = {}
+        if include_analysis:
+            rows = await self.file_repository.list_latest_versions_with_analyses(page_query)
+            files = [file for file, _ in rows]
+            analyses = {file.id: analysis for file, analysis in rows if analysis is not None}
+        else:
+            files = await self.file_repository.list_latest_versions(page_query)
+
+        next_cursor = None
+        if len(files) > query.limit:
+            files = files[:query.limit]
+            next_cursor = self._encode_cursor(files[-1], query)
+
+        return FilePage(items=files, next_cursor=next_cursor, analyses=analyses)
+
+    def stream(self, query: FileListQuery, cursor: Optional[str] = None) -> AsyncIterator[File]:
+        if cursor is not None:
+            query = replace(query, after=self._decode_cursor(cursor, query))
+        return self.file_repository.iter_latest_versions(query)
+
+    @staticmethod
+    def _sort_value(file: File, sort: str):
+        if sort == "name":
+            return file.original_name
+        if sort == "size":
+            return file.size_bytes
+        return file.uploaded_at.isoformat()
+
+    def _encode_cursor(self, file: File, query: FileListQuery) -> str:
+        payload = {
+            "sort": query.sort,
+            "desc": query.descending,
+            "value": self._sort_value(file, query.sort),
+            "id": file.id,
+        }
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str, query: FileListQuery):
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if payload["sort"] != query.sort or payload["desc"] != query.descending:
+                raise ValueError("cursor was issued for a different ordering")
+            value = payload["value"]
+            if query.sort == "uploaded_at":
+                value = datetime.fromisoformat(value)
+            return value, int(payload["id"])
+        except (ValueError, KeyError, TypeError):
+            raise InvalidCursorError(cursor)
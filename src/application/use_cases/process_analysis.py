@@ -0,0 +1,75 @@
+import functools
+from datetime import datetime
+from typing import Optional
+from src.domain.entities import Analysis, AnalysisStatus, File
+from src.domain.exceptions import AnalysisError
+from src.application.repositories import AbstractFileRepository
+from src.application.services import (
+    AbstractAnalysisCache,
+    AnalysisServiceInterface,
+    AbstractStorageService,
+    DocumentContent,
+)
+
+
+class ProcessAnalysisUseCase:
+    """
+    Use case for running a queued analysis job to completion.
+
+    The queue claims a job for its worker before handing it out, which
+    marks it running; jobs that are not running here are not processed.
+    """
+
+    def __init__(
+            self,
+            file_repository: AbstractFileRepository,
+            analysis_service: AnalysisServiceInterface,
+            storage_service: AbstractStorageService,
+            analysis_cache: AbstractAnalysisCache
+    ):
+        self.file_repository = file_repository
+        self.analysis_service = analysis_service
+        self.storage_service = storage_service
+        self.analysis_cache = analysis_cache
+
+    async def execute(self, analysis_id: int) -> Optional[Analysis]:
+        analysis = await self.file_repository.get_analysis_by_id(analysis_id)
+        if analysis is None or analysis.status != AnalysisStatus.RUNNING:
+            return analysis
+
+        try:
+            file = await self.file_repository.get_by_id(analysis.file_id)
+            if file is None:
+                raise AnalysisError(f"File with id {analysis.file_id} no longer exists")
+
+            analysis.result_text = await self._analyze(file)
+            analysis.status = AnalysisStatus.COMPLETED
+        except Exception as e:
+            analysis.status = AnalysisStatus.FAILED
+            analysis.error = str(e)
+
+        analysis.completed_at = datetime.now()
+        return await self.file_repository.update_analysis(analysis)
+
+    async def _analyze(self, file: File) -> str:
+        fingerprint = self.analysis_service.fingerprint
+        if file.checksum:
+            cached = await self.analysis_cache.get(file.checksum, fingerprint)
+            if cached is not None:
+                return cached
+
+        # The analyzer reads the content only if it needs it, by path when the
+        # object is a local file.
+        document = DocumentContent(
+            file_name=file.original_name,
+            size_bytes=file.size_bytes,
+            checksum=file.checksum,
+            local_path=self.storage_service.local_path(file.path),
+            read=functools.partial(self.storage_service.read, file.path)
+        )
+        result_text = await self.analysis_service.analyze(document)
+
+        if file.checksum:
+            await self.analysis_cache.set(file.checksum, fingerprint, result_text)
+
+        return result_text
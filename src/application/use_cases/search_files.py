@@ -0,0 +1,53 @@
+import base64
+import json
+from dataclasses import dataclass, replace
+from typing import List, Optional
+from src.domain.exceptions import InvalidCursorError
+from src.application.repositories import AbstractSearchIndex, FileSearchHit, FileSearchQuery
+
+
+@dataclass
+class SearchPage:
+    """One page of search hits, best first, and the cursor of the next page."""
+    items: List[FileSearchHit]
+    next_cursor: Optional[str]
+
+
+class SearchFilesUseCase:
+
+    def __init__(self, search_index: AbstractSearchIndex):
+        self.search_index = search_index
+
+    async def execute(self, query: FileSearchQuery, cursor: Optional[str] = None) -> SearchPage:
+        if cursor is not None:
+            query = replace(query, after=self._decode_cursor(cursor, query))
+
+        # One extra hit tells whether another page exists.
+        hits = await self.search_index.search(replace(query, limit=query.limit + 1))
+
+        next_cursor = None
+        if len(hits) > query.limit:
+            hits = hits[:query.limit]
+            next_cursor = self._encode_cursor(hits[-1], query)
+
+        return SearchPage(items=hits, next_cursor=next_cursor)
+
+    @staticmethod
+    def _encode_cursor(hit: FileSearchHit, query: FileSearchQuery) -> str:
+        payload = {
+            "q": query.text,
+            "all": query.all_versions,
+            "score": hit.score,
+            "id": hit.file.id,
+        }
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str, query: FileSearchQuery):
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if payload["q"] != query.text or payload["all"] != query.all_versions:
+                raise ValueError("cursor was issued for a different search")
+            return float(payload["score"]), int(payload["id"])
+        except (ValueError, KeyError, TypeError):
+            raise InvalidCursorError(cursor)
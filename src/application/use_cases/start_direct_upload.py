@@ -0,0 +1,56 @@
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+from src.domain.entities import File
+from src.domain.exceptions import DirectUploadNotSupportedError
+from src.application.repositories import AbstractFileRepository
+from src.application.services import AbstractStorageService, PresignedUpload
+
+
+@dataclass
+class DirectUpload:
+    """
+    Outcome of starting a direct upload: the request the client sends to
+    storage, or the created version when the content is already stored.
+    """
+    upload_id: Optional[str] = None
+    request: Optional[PresignedUpload] = None
+    file: Optional[File] = None
+
+
+class StartDirectUploadUseCase:
+    """Use case for letting a client upload content straight to storage."""
+
+    def __init__(
+            self,
+            file_repository: AbstractFileRepository,
+            storage_service: AbstractStorageService,
+            url_ttl: timedelta
+    ):
+        self.file_repository = file_repository
+        self.storage_service = storage_service
+        self.url_ttl = url_ttl
+
+    async def execute(self, original_name: str, checksum: str, uploaded_by: int = 1) -> DirectUpload:
+        # Known content needs no upload at all, the new version references it.
+        blob = await self.file_repository.find_blob_by_checksum(checksum)
+        if blob is not None:
+            file = await self.file_repository.add(File(
+                id=None,
+                original_name=original_name,
+                path=blob.path,
+                version=None,
+                size_bytes=blob.size_bytes,
+                uploaded_at=datetime.now(),
+                uploaded_by=uploaded_by,
+                checksum=blob.checksum,
+                blob_id=blob.id
+            ))
+            return DirectUpload(file=file)
+
+        upload_id = uuid.uuid4().hex
+        request = await self.storage_service.presign_upload(upload_id, checksum, self.url_ttl)
+        if request is None:
+            raise DirectUploadNotSupportedError()
+        return DirectUpload(upload_id=upload_id, request=request)
@@ -0,0 +1,84 @@
+import functools
+from contextlib import aclosing
+from datetime import datetime
+from typing import AsyncIterator, List, Union
+from src.domain.entities import Analysis, AnalysisStatus, File
+from src.domain.exceptions import FileNotFoundError
+from src.application.repositories import AbstractFileRepository
+from src.application.services import (
+    AbstractAnalysisCache,
+    AnalysisServiceInterface,
+    AbstractStorageService,
+    DocumentContent,
+)
+
+
+class StreamAnalysisUseCase:
+    """Use case for analyzing a file while streaming the result as it is generated."""
+
+    def __init__(
+            self,
+            file_repository: AbstractFileRepository,
+            analysis_service: AnalysisServiceInterface,
+            storage_service: AbstractStorageService,
+            analysis_cache: AbstractAnalysisCache
+    ):
+        self.file_repository = file_repository
+        self.analysis_service = analysis_service
+        self.storage_service = storage_service
+        self.analysis_cache = analysis_cache
+
+    async def execute(self, file_id: int) -> AsyncIterator[Union[str, Analysis]]:
+        """
+        Start the analysis of a file.
+
+        Returns:
+            Async iterator of result text fragments, followed by the stored
+            ``completed`` or ``failed`` analysis
+        """
+        file = await self.file_repository.get_by_id(file_id)
+        if file is None:
+            raise FileNotFoundError(file_id)
+        return self._stream(file)
+
+    async def _stream(self, file: File) -> AsyncIterator[Union[str, Analysis]]:
+        started_at = datetime.now()
+        fingerprint = self.analysis_service.fingerprint
+        cached = None
+        if file.checksum:
+            cached = await self.analysis_cache.get(file.checksum, fingerprint)
+
+        analysis = Analysis(
+            id=None,
+            file_id=file.id,
+            status=AnalysisStatus.COMPLETED,
+            result_text=cached,
+            created_at=started_at,
+            started_at=started_at
+        )
+        if cached is not None:
+            yield cached
+        else:
+            document = DocumentContent(
+                file_name=file.original_name,
+                size_bytes=file.size_bytes,
+                checksum=file.checksum,
+                local_path=self.storage_service.local_path(file.path),
+                read=functools.partial(self.storage_service.read, file.path)
+            )
+            parts: List[str] = []
+            try:
+                async with aclosing(self.analysis_service.analyze_stream(document)) as fragments:
+                    async for fragment in fragments:
+                        parts.append(fragment)
+                        yield fragment
+                analysis.result_text = "".join(parts)
+                if file.checksum:
+                    await self.analysis_cache.set(file.checksum, fingerprint, analysis.result_text)
+            except Exception as e:
+                analysis.status = AnalysisStatus.FAILED
+                analysis.error = str(e)
+
+        # Stored once the stream has ended; an abandoned stream stores nothing.
+        analysis.completed_at = datetime.now()
+        yield await self.file_repository.add_analysis(analysis)
@@ -1,5 +1,6 @@
 from datetime import datetime
-from src.domain.entities import File
+from typing import AsyncIterator
+from src.domain.entities import File, Blob
 from src.application.repositories import AbstractFileRepository
 from src.application.services import AbstractStorageService
 
@@ -17,22 +18,44 @@ class UploadFileUseCase:
     async def execute(
             self,
             original_name: str,
-            content: bytes,
+            chunks: AsyncIterator[bytes],
+            checksum: str,
             uploaded_by: int = 1
     ) -> File:
-        existing_file = self.file_repository.find_latest_by_original_name(original_name)
-        version = 1 if existing_file is None else existing_file.version + 1
-
-        storage_path = await self.storage_service.save(original_name, content)
+        # Identical content is stored once; later versions only reference the blob.
+        blob = await self.file_repository.find_blob_by_checksum(checksum)
+        if blob is None:
+            # The previous version lets storage keep just the difference.
+            previous = await self.file_repository.find_latest_by_original_name(original_name)
+            stored = await self.storage_service.save(
+                original_name,
+                chunks,
+                checksum=checksum,
+                base_path=previous.path if previous else None
+            )
+            blob = await self.file_repository.add_blob(Blob(
+                id=None,
+                checksum=stored.checksum,
+                path=stored.path,
+                size_bytes=stored.size_bytes,
+                created_at=datetime.now(),
+                base_path=stored.base_path
+            ))
+            if blob.path != stored.path:
+                # A concurrent upload registered the content first; keep its
+                # copy, this object would never be referenced.
+                await self.storage_service.delete(stored.path)
 
         file = File(
             id=None,
             original_name=original_name,
-            path=storage_path,
-            version=version,
-            size_bytes=len(content),
+            path=blob.path,
+            version=None,
+            size_bytes=blob.size_bytes,
             uploaded_at=datetime.now(),
-            uploaded_by=uploaded_by
+            uploaded_by=uploaded_by,
+            checksum=blob.checksum,
+            blob_id=blob.id
         )
 
-        return self.file_repository.add(file)
+        return await self.file_repository.add(file)
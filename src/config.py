@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -6,9 +8,18 @@ class Settings(BaseSettings):
     
     # Database
     database_url: str = "sqlite:///./app.db"
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_timeout_ms: int = 30000
     
-    # Storage
+    # Storage backend: "minio", "filesystem" (objects under storage_path) or
+    # "memory" (in-process, for benchmarks and local runs)
+    storage_backend: str = "minio"
     storage_path: str = "./storage"
+    storage_fsync: bool = True
     
     # MinIO Configuration
     minio_endpoint: str = "localhost:9000"
@@ -16,10 +27,93 @@ class Settings(BaseSettings):
     minio_secret_key: str = "minioadmin"
     minio_bucket_name: str = "documents"
     minio_secure: bool = False
+    minio_part_size: int = 5 * 1024 * 1024
+    # Endpoint clients reach MinIO at for direct uploads, when it differs from
+    # minio_endpoint (e.g. a public host in front of an internal service).
+    # Presigned URLs are signed offline for minio_region.
+    minio_public_endpoint: Optional[str] = None
+    minio_public_secure: Optional[bool] = None
+    minio_region: str = "us-east-1"
+
+    # Storage I/O
+    storage_max_concurrency: int = 16
+    storage_pool_maxsize: int = 16
+    storage_connect_timeout: float = 5.0
+    storage_read_timeout: float = 60.0
+
+    # Compressed storage: zstd objects, later versions as deltas against the
+    # previous one, with a full snapshot every N versions of a chain
+    storage_compression_enabled: bool = False
+    storage_compression_level: int = 3
+    storage_delta_enabled: bool = True
+    storage_delta_max_bytes: int = 32 * 1024 * 1024
+    storage_delta_snapshot_interval: int = 10
+
+    # Version retention: keep the newest N versions of each document and/or
+    # versions younger than the given number of days (0 disables a limit;
+    # with both disabled nothing is deleted). The latest version is always kept.
+    retention_keep_versions: int = 0
+    retention_keep_days: float = 0.0
+    retention_interval: float = 3600.0
+    retention_batch_size: int = 200
+    # Orphaned blobs created or reused by an upload within this many seconds
+    # may still be waiting for their file row
+    retention_blob_grace: float = 3600.0
+
+    # File listing
+    files_page_default_limit: int = 100
+    files_page_max_limit: int = 1000
+
+    # Full-text search
+    search_page_default_limit: int = 20
+    search_page_max_limit: int = 100
+
+    # Uploads and downloads
+    upload_chunk_size: int = 1024 * 1024
+    download_chunk_size: int = 256 * 1024
+    batch_upload_max_files: int = 100
+    batch_upload_concurrency: int = 8
+    # Direct uploads to storage: how long a presigned URL is valid and the
+    # largest object a single presigned PUT may carry (S3 limit: 5 GiB)
+    direct_upload_url_ttl: float = 900.0
+    direct_upload_max_bytes: int = 5 * 1024 * 1024 * 1024
     
     # OpenAI Configuration
     openai_api_key: str | None = None
     use_mock_analyzer: bool = True
+
+    # OpenAI rate limits (per process; 0 disables a limit) and retries on 429/5xx
+    openai_requests_per_minute: int = 500
+    openai_tokens_per_minute: int = 200000
+    openai_max_retries: int = 5
+    openai_retry_base_delay: float = 1.0
+    openai_retry_max_delay: float = 60.0
+
+    # PDF text extraction (process pool; workers default to the number of CPUs)
+    pdf_extraction_workers: int | None = None
+    pdf_extraction_timeout: float = 60.0
+    pdf_max_pages: int = 500
+
+    # Analysis queue: "memory" (in-process) or "database" (shared by all workers)
+    analysis_queue_backend: str = "memory"
+    analysis_workers: int = 2
+    analysis_queue_poll_interval: float = 1.0
+    analysis_claim_timeout: float = 600.0
+    batch_analyze_max_files: int = 1000
+    analysis_lookup_max_files: int = 1000
+
+    # Analysis result cache (persistent, with an optional in-memory LRU tier)
+    analysis_cache_memory_enabled: bool = True
+    analysis_cache_memory_max_entries: int = 1024
+    analysis_cache_memory_max_bytes: int = 16 * 1024 * 1024
+    analysis_cache_memory_ttl: float = 3600.0
+
+    # In-process cache of file listing and analysis responses; invalidated by
+    # writes of this process, the TTL bounds staleness from other processes
+    response_cache_enabled: bool = True
+    response_cache_max_entries: int = 1024
+    response_cache_max_bytes: int = 32 * 1024 * 1024
+    response_cache_ttl: float = 5.0
     
     class Config:
         env_file = ".env"
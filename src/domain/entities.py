@@ -9,11 +9,33 @@ class File:
     id: Optional[int]
     original_name: str
     path: str
-    version: int
+    version: Optional[int]
     size_bytes: int
     uploaded_at: datetime
     uploaded_by: int
     analysis_id: Optional[int] = None
+    checksum: Optional[str] = None
+    blob_id: Optional[int] = None
+
+
+@dataclass
+class Blob:
+    """Domain entity representing stored content shared by identical file versions."""
+    id: Optional[int]
+    checksum: str
+    path: str
+    size_bytes: int
+    created_at: datetime
+    # Blob the content is stored as a delta against, if any.
+    base_path: Optional[str] = None
+
+
+class AnalysisStatus:
+    """Lifecycle states of an analysis job."""
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
 
 
 @dataclass
@@ -24,3 +46,6 @@ class Analysis:
     status: str
     result_text: Optional[str]
     created_at: datetime
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    error: Optional[str] = None
@@ -8,7 +8,41 @@ class FileNotFoundError(BaseAppException):
         super().__init__(f"File with id {file_id} not found")
 
 
+class BlobNotFoundError(BaseAppException):
+    def __init__(self, blob_id: int):
+        self.blob_id = blob_id
+        super().__init__(f"Stored content {blob_id} was deleted while the version was being added")
+
+
 class AnalysisNotFoundError(BaseAppException):
     def __init__(self, file_id: int):
         self.file_id = file_id
         super().__init__(f"Analysis not found for file with id {file_id}")
+
+
+class AnalysisError(BaseAppException):
+    def __init__(self, message: str):
+        super().__init__(message)
+
+
+class InvalidCursorError(BaseAppException):
+    def __init__(self, cursor: str):
+        self.cursor = cursor
+        super().__init__(f"Invalid pagination cursor: {cursor}")
+
+
+class DirectUploadNotSupportedError(BaseAppException):
+    def __init__(self):
+        super().__init__("Storage backend does not accept direct uploads")
+
+
+class UploadNotFoundError(BaseAppException):
+    def __init__(self, upload_id: str):
+        self.upload_id = upload_id
+        super().__init__(f"Nothing has been uploaded for upload {upload_id}")
+
+
+class UploadVerificationError(BaseAppException):
+    def __init__(self, upload_id: str, message: str):
+        self.upload_id = upload_id
+        super().__init__(f"Upload {upload_id} failed verification: {message}")
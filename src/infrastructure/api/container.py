@@ -0,0 +1,191 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import text
+
+from src.application.services import AbstractAnalysisQueue, AnalysisServiceInterface
+from src.config import settings
+from src.infrastructure.cache import AnalysisCacheStats, ChangeCounter, MemoryLRUCache, ResponseCache
+from src.infrastructure.metrics import Instrumented, InstrumentedStorage, instrument_engine
+from src.infrastructure.metrics.registry import ANALYZER_CALL_DURATION
+from src.infrastructure.persistence.database import engine, init_db, SessionLocal
+from src.infrastructure.persistence.repositories import SQLAlchemyTextStore
+from src.infrastructure.queue import DatabaseAnalysisQueue, InMemoryAnalysisQueue
+from src.infrastructure.services import MockAIAnalyzer, OpenAIAnalyzer, PdfTextExtractor, RateLimiter
+from src.infrastructure.storage import (
+    CompressingStorage,
+    FileSystemStorage,
+    MemoryStorage,
+    MinIOStorage,
+    StorageCompressionStats
+)
+from src.infrastructure.workers import AnalysisWorkerPool, PeriodicTask
+
+logger = logging.getLogger(__name__)
+
+
+class Container:
+    """
+    Process-wide resources owned by the application lifespan.
+
+    Clients, pools and workers are created once, warmed up at startup and
+    shared by all requests, so their connections are reused instead of being
+    rebuilt per request.
+    """
+
+    def __init__(
+            self,
+            analysis_handler: Callable[[int], Awaitable[None]],
+            compaction_job: Optional[Callable[[], Awaitable[None]]] = None
+    ):
+        self.engine = engine
+        self.session_factory = SessionLocal
+        instrument_engine(engine.sync_engine)
+
+        self.storage_stats = StorageCompressionStats()
+        if settings.storage_backend == "filesystem":
+            self.storage = InstrumentedStorage(
+                FileSystemStorage(settings.storage_path, fsync=settings.storage_fsync)
+            )
+        elif settings.storage_backend == "memory":
+            self.storage = InstrumentedStorage(MemoryStorage())
+        else:
+            self.storage = InstrumentedStorage(MinIOStorage())
+        if settings.storage_compression_enabled:
+            self.storage = CompressingStorage(
+                self.storage,
+                self.storage_stats,
+                level=settings.storage_compression_level,
+                delta_enabled=settings.storage_delta_enabled,
+                delta_max_bytes=settings.storage_delta_max_bytes,
+                snapshot_interval=settings.storage_delta_snapshot_interval
+            )
+
+        self.text_store = SQLAlchemyTextStore(SessionLocal)
+        self.pdf_text_extractor: Optional[PdfTextExtractor] = None
+        self.rate_limiter: Optional[RateLimiter] = None
+        if settings.use_mock_analyzer:
+            self.analysis_service: AnalysisServiceInterface = MockAIAnalyzer()
+        else:
+            self.pdf_text_extractor = PdfTextExtractor(
+                max_workers=settings.pdf_extraction_workers,
+                timeout=settings.pdf_extraction_timeout,
+                max_pages=settings.pdf_max_pages
+            )
+            self.rate_limiter = RateLimiter(
+                requests_per_minute=settings.openai_requests_per_minute,
+                tokens_per_minute=settings.openai_tokens_per_minute
+            )
+            self.analysis_service = OpenAIAnalyzer(self.pdf_text_extractor, self.rate_limiter, self.text_store)
+        self.analysis_service = Instrumented(self.analysis_service, ANALYZER_CALL_DURATION)
+
+        self.analysis_cache_stats = AnalysisCacheStats()
+        self.analysis_memory_cache: Optional[MemoryLRUCache[str]] = None
+        if settings.analysis_cache_memory_enabled:
+            self.analysis_memory_cache = MemoryLRUCache(
+                max_entries=settings.analysis_cache_memory_max_entries,
+                max_bytes=settings.analysis_cache_memory_max_bytes,
+                ttl=settings.analysis_cache_memory_ttl
+            )
+
+        self.changes = ChangeCounter()
+        response_memory_cache = None
+        if settings.response_cache_enabled:
+            response_memory_cache = MemoryLRUCache(
+                max_entries=settings.response_cache_max_entries,
+                max_bytes=settings.response_cache_max_bytes,
+                ttl=settings.response_cache_ttl
+            )
+        self.response_cache = ResponseCache(self.changes, response_memory_cache)
+
+        if settings.analysis_queue_backend == "database":
+            self.analysis_queue: AbstractAnalysisQueue = DatabaseAnalysisQueue(
+                SessionLocal,
+                poll_interval=settings.analysis_queue_poll_interval,
+                claim_timeout=settings.analysis_claim_timeout
+            )
+        else:
+            self.analysis_queue = InMemoryAnalysisQueue(
+                SessionLocal,
+                claim_timeout=settings.analysis_claim_timeout
+            )
+
+        self.worker_pool = AnalysisWorkerPool(
+            self.analysis_queue,
+            handler=analysis_handler,
+            size=settings.analysis_workers
+        )
+
+        self.compaction: Optional[PeriodicTask] = None
+        if compaction_job is not None and (settings.retention_keep_versions or settings.retention_keep_days):
+            self.compaction = PeriodicTask("compaction", compaction_job, settings.retention_interval)
+
+        self._warm_ups: Dict[str, Callable[[], Awaitable[None]]] = {"storage": self.storage.start}
+        if self.pdf_text_extractor is not None:
+            self._warm_ups["pdf_extractor"] = self.pdf_text_extractor.warm_up
+        self.readiness: Dict[str, bool] = {"database": False, "workers": False}
+        self.readiness.update({name: False for name in self._warm_ups})
+
+    async def start(self) -> None:
+        # Nothing works without the database, so a failure here aborts startup.
+        await init_db()
+        await self._ping_database()
+        self.readiness["database"] = True
+
+        # Other components may come up later; readiness reports them until then.
+        await asyncio.gather(*(self._warm_up(name) for name in self._warm_ups))
+
+        await self.worker_pool.start()
+        self.readiness["workers"] = True
+        if self.compaction is not None:
+            await self.compaction.start()
+
+    async def check_readiness(self) -> Dict[str, bool]:
+        """Ping the database and retry warm-ups of components that are not ready yet."""
+        try:
+            await self._ping_database()
+            self.readiness["database"] = True
+        except Exception:
+            logger.warning("Database is not reachable", exc_info=True)
+            self.readiness["database"] = False
+
+        await asyncio.gather(*(
+            self._warm_up(name) for name in self._warm_ups if not self.readiness[name]
+        ))
+        return dict(self.readiness)
+
+    async def close(self) -> None:
+        if self.compaction is not None:
+            await self.compaction.stop()
+        await self.worker_pool.stop()
+        await self.analysis_service.close()
+        if self.pdf_text_extractor is not None:
+            self.pdf_text_extractor.close()
+        self.storage.close()
+        await self.engine.dispose()
+
+    async def _ping_database(self) -> None:
+        async with self.engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    async def _warm_up(self, name: str) -> None:
+        try:
+            await self._warm_ups[name]()
+            self.readiness[name] = True
+        except Exception:
+            logger.warning("Failed to warm up %s", name, exc_info=True)
+
+
+_container: Optional[Container] = None
+
+
+def get_container() -> Container:
+    if _container is None:
+        raise RuntimeError("Application container is not started")
+    return _container
+
+
+def set_container(container: Optional[Container]) -> None:
+    global _container
+    _container = container
@@ -1,53 +1,181 @@
-from sqlalchemy.orm import Session
-from src.infrastructure.persistence.database import get_db
-from src.infrastructure.persistence.repositories import SQLAlchemyFileRepository
-from src.infrastructure.services import MockAIAnalyzer, OpenAIAnalyzer
-from src.infrastructure.storage import MinIOStorage
+from datetime import timedelta
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.infrastructure.api.container import get_container
+from src.infrastructure.cache import AnalysisCacheStats, MemoryLRUCache, ResponseCache, TieredAnalysisCache
+from src.infrastructure.metrics import Instrumented
+from src.infrastructure.metrics.registry import COMPACTION_DELETED, REPOSITORY_CALL_DURATION, USE_CASE_DURATION
+from src.infrastructure.persistence.database import SessionLocal
+from src.infrastructure.persistence.repositories import SQLAlchemyFileRepository, SQLAlchemySearchIndex
 from src.application.use_cases import (
     UploadFileUseCase,
+    BatchUploadFilesUseCase,
+    StartDirectUploadUseCase,
+    CompleteDirectUploadUseCase,
     ListFilesUseCase,
+    SearchFilesUseCase,
     AnalyzeFileUseCase,
+    BatchAnalyzeFilesUseCase,
+    ProcessAnalysisUseCase,
+    StreamAnalysisUseCase,
     GetAnalysisUseCase,
+    DownloadFileUseCase,
+    CompactVersionsUseCase,
 )
-from src.application.services import AnalysisServiceInterface
+from src.application.repositories import RetentionPolicy
+from src.application.services import AnalysisServiceInterface, AbstractAnalysisQueue, AbstractStorageService
 from src.config import settings
 
 
-def get_file_repository(db: Session = None) -> SQLAlchemyFileRepository:
-    if db is None:
-        db = next(get_db())
-    return SQLAlchemyFileRepository(db)
+def get_file_repository(db: AsyncSession) -> SQLAlchemyFileRepository:
+    return Instrumented(SQLAlchemyFileRepository(db, get_container().changes), REPOSITORY_CALL_DURATION)
+
 
+def get_search_index(db: AsyncSession) -> SQLAlchemySearchIndex:
+    return Instrumented(SQLAlchemySearchIndex(db), REPOSITORY_CALL_DURATION)
 
-def get_storage_service() -> MinIOStorage:
-    return MinIOStorage()
+
+def get_storage_service() -> AbstractStorageService:
+    return get_container().storage
 
 
 def get_analysis_service() -> AnalysisServiceInterface:
-    if settings.use_mock_analyzer:
-        return MockAIAnalyzer()
-    else:
-        return OpenAIAnalyzer()
+    return get_container().analysis_service
+
+
+def get_analysis_cache_stats() -> AnalysisCacheStats:
+    return get_container().analysis_cache_stats
+
+
+def get_analysis_memory_cache() -> Optional[MemoryLRUCache[str]]:
+    return get_container().analysis_memory_cache
+
+
+def get_analysis_cache(db: AsyncSession) -> TieredAnalysisCache:
+    return TieredAnalysisCache(db, get_analysis_cache_stats(), get_analysis_memory_cache())
+
+
+def get_response_cache() -> ResponseCache:
+    return get_container().response_cache
+
+
+def get_analysis_queue() -> AbstractAnalysisQueue:
+    return get_container().analysis_queue
+
+
+async def process_analysis_job(analysis_id: int) -> None:
+    async with SessionLocal() as db:
+        await get_process_analysis_use_case(db).execute(analysis_id)
+
+
+def get_retention_policy() -> RetentionPolicy:
+    return RetentionPolicy(
+        keep_versions=settings.retention_keep_versions,
+        keep_for=timedelta(days=settings.retention_keep_days) if settings.retention_keep_days else None
+    )
+
+
+async def run_compaction() -> None:
+    async with SessionLocal() as db:
+        result = await get_compact_versions_use_case(db).execute()
+    COMPACTION_DELETED.labels("versions").inc(result.versions_deleted)
+    COMPACTION_DELETED.labels("objects").inc(result.objects_deleted)
+
+
+def _instrumented(use_case):
+    # Times every use case call in the use_case_duration_seconds histogram.
+    return Instrumented(use_case, USE_CASE_DURATION)
+
+
+def get_upload_file_use_case(db: AsyncSession) -> UploadFileUseCase:
+    file_repository = get_file_repository(db)
+    storage_service = get_storage_service()
+    return _instrumented(UploadFileUseCase(file_repository, storage_service))
+
+
+def get_start_direct_upload_use_case(db: AsyncSession) -> StartDirectUploadUseCase:
+    file_repository = get_file_repository(db)
+    storage_service = get_storage_service()
+    return _instrumented(StartDirectUploadUseCase(
+        file_repository,
+        storage_service,
+        timedelta(seconds=settings.direct_upload_url_ttl)
+    ))
 
 
-def get_upload_file_use_case(db: Session) -> UploadFileUseCase:
+def get_complete_direct_upload_use_case(db: AsyncSession) -> CompleteDirectUploadUseCase:
     file_repository = get_file_repository(db)
     storage_service = get_storage_service()
-    return UploadFileUseCase(file_repository, storage_service)
+    return _instrumented(CompleteDirectUploadUseCase(file_repository, storage_service))
+
+
+def get_batch_upload_files_use_case(db: AsyncSession) -> BatchUploadFilesUseCase:
+    file_repository = get_file_repository(db)
+    storage_service = get_storage_service()
+    return _instrumented(BatchUploadFilesUseCase(file_repository, storage_service, settings.batch_upload_concurrency))
+
+
+def get_list_files_use_case(db: AsyncSession) -> ListFilesUseCase:
+    file_repository = get_file_repository(db)
+    return _instrumented(ListFilesUseCase(file_repository))
+
+
+def get_search_files_use_case(db: AsyncSession) -> SearchFilesUseCase:
+    search_index = get_search_index(db)
+    return _instrumented(SearchFilesUseCase(search_index))
+
+
+def get_analyze_file_use_case(db: AsyncSession) -> AnalyzeFileUseCase:
+    file_repository = get_file_repository(db)
+    analysis_queue = get_analysis_queue()
+    analysis_service = get_analysis_service()
+    analysis_cache = get_analysis_cache(db)
+    return _instrumented(AnalyzeFileUseCase(file_repository, analysis_queue, analysis_service, analysis_cache))
 
 
-def get_list_files_use_case(db: Session) -> ListFilesUseCase:
+def get_batch_analyze_files_use_case(db: AsyncSession) -> BatchAnalyzeFilesUseCase:
     file_repository = get_file_repository(db)
-    return ListFilesUseCase(file_repository)
+    analysis_queue = get_analysis_queue()
+    analysis_service = get_analysis_service()
+    analysis_cache = get_analysis_cache(db)
+    return _instrumented(BatchAnalyzeFilesUseCase(file_repository, analysis_queue, analysis_service, analysis_cache))
 
 
-def get_analyze_file_use_case(db: Session) -> AnalyzeFileUseCase:
+def get_process_analysis_use_case(db: AsyncSession) -> ProcessAnalysisUseCase:
     file_repository = get_file_repository(db)
     analysis_service = get_analysis_service()
     storage_service = get_storage_service()
-    return AnalyzeFileUseCase(file_repository, analysis_service, storage_service)
+    analysis_cache = get_analysis_cache(db)
+    return _instrumented(ProcessAnalysisUseCase(file_repository, analysis_service, storage_service, analysis_cache))
+
+
+def get_stream_analysis_use_case(db: AsyncSession) -> StreamAnalysisUseCase:
+    file_repository = get_file_repository(db)
+    analysis_service = get_analysis_service()
+    storage_service = get_storage_service()
+    analysis_cache = get_analysis_cache(db)
+    return _instrumented(StreamAnalysisUseCase(file_repository, analysis_service, storage_service, analysis_cache))
+
+
+def get_get_analysis_use_case(db: AsyncSession) -> GetAnalysisUseCase:
+    file_repository = get_file_repository(db)
+    return _instrumented(GetAnalysisUseCase(file_repository))
+
+
+def get_download_file_use_case(db: AsyncSession) -> DownloadFileUseCase:
+    file_repository = get_file_repository(db)
+    storage_service = get_storage_service()
+    return _instrumented(DownloadFileUseCase(file_repository, storage_service))
 
 
-def get_get_analysis_use_case(db: Session) -> GetAnalysisUseCase:
+def get_compact_versions_use_case(db: AsyncSession) -> CompactVersionsUseCase:
     file_repository = get_file_repository(db)
-    return GetAnalysisUseCase(file_repository)
+    storage_service = get_storage_service()
+    return _instrumented(CompactVersionsUseCase(
+        file_repository,
+        storage_service,
+        get_retention_policy(),
+        settings.retention_batch_size,
+        timedelta(seconds=settings.retention_blob_grace)
+    ))
@@ -1,20 +1,50 @@
-from fastapi import FastAPI, Request
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, Response
 from fastapi.responses import JSONResponse
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from src.infrastructure.api.container import Container, get_container, set_container
+from src.infrastructure.api.dependencies import (
+    process_analysis_job,
+    run_compaction,
+    get_analysis_cache_stats,
+    get_analysis_memory_cache,
+)
 from src.infrastructure.api.routers import files
-from src.infrastructure.persistence.database import engine, Base
-from src.domain.exceptions import BaseAppException, FileNotFoundError, AnalysisNotFoundError
+from src.infrastructure.metrics import MetricsMiddleware
+from src.config import settings
+from src.domain.exceptions import (
+    BaseAppException,
+    FileNotFoundError,
+    AnalysisNotFoundError,
+    InvalidCursorError,
+    DirectUploadNotSupportedError,
+    UploadNotFoundError,
+    UploadVerificationError,
+    BlobNotFoundError
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    container = Container(analysis_handler=process_analysis_job, compaction_job=run_compaction)
+    set_container(container)
+    await container.start()
+    yield
+    await container.close()
+    set_container(None)
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
 
 # Create FastAPI application
 app = FastAPI(
     title="Document Versioning Service",
     description="Mini-service for storing documents with versioning, metadata, and basic AI analysis",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 app.include_router(files.router)
+app.add_middleware(MetricsMiddleware)
 
 
 # Exception handlers
@@ -34,6 +64,47 @@ async def analysis_not_found_handler(request: Request, exc: AnalysisNotFoundErro
     )
 
 
+@app.exception_handler(InvalidCursorError)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursorError):
+    return JSONResponse(
+        status_code=400,
+        content={"detail": str(exc)}
+    )
+
+
+@app.exception_handler(DirectUploadNotSupportedError)
+async def direct_upload_not_supported_handler(request: Request, exc: DirectUploadNotSupportedError):
+    return JSONResponse(
+        status_code=501,
+        content={"detail": str(exc)}
+    )
+
+
+@app.exception_handler(UploadNotFoundError)
+async def upload_not_found_handler(request: Request, exc: UploadNotFoundError):
+    return JSONResponse(
+        status_code=404,
+        content={"detail": str(exc)}
+    )
+
+
+@app.exception_handler(UploadVerificationError)
+async def upload_verification_handler(request: Request, exc: UploadVerificationError):
+    return JSONResponse(
+        status_code=400,
+        content={"detail": str(exc)}
+    )
+
+
+@app.exception_handler(BlobNotFoundError)
+async def blob_not_found_handler(request: Request, exc: BlobNotFoundError):
+    # Compaction removed the content concurrently; uploading again stores it anew.
+    return JSONResponse(
+        status_code=409,
+        content={"detail": str(exc)}
+    )
+
+
 @app.exception_handler(BaseAppException)
 async def base_app_exception_handler(request: Request, exc: BaseAppException):
     return JSONResponse(
@@ -50,6 +121,7 @@ async def root():
         "endpoints": {
             "upload": "POST /files/upload",
             "list": "GET /files",
+            "download": "GET /files/{file_id}/content",
             "analyze": "POST /files/{file_id}/analyze",
             "get_analysis": "GET /files/{file_id}/analysis"
         }
@@ -59,3 +131,58 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
+@app.get("/ready")
+async def readiness_check():
+    components = await get_container().check_readiness()
+    ready = all(components.values())
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "not_ready", "components": components}
+    )
+
+
+@app.get("/stats/analysis-cache")
+async def analysis_cache_stats():
+    stats = get_analysis_cache_stats()
+    memory = get_analysis_memory_cache()
+    lookups = stats.hits + stats.misses
+
+    return {
+        "hits": stats.hits,
+        "memory_hits": stats.memory_hits,
+        "persistent_hits": stats.persistent_hits,
+        "misses": stats.misses,
+        "writes": stats.writes,
+        "hit_ratio": stats.hits / lookups if lookups else None,
+        "memory": {
+            "entries": len(memory),
+            "size_bytes": memory.size_bytes,
+            "evictions": memory.evictions,
+        } if memory is not None else None,
+    }
+
+
+@app.get("/stats/storage")
+async def storage_stats():
+    stats = get_container().storage_stats
+
+    return {
+        "compression_enabled": settings.storage_compression_enabled,
+        "logical_bytes": stats.logical_bytes,
+        "stored_bytes": stats.stored_bytes,
+        "compression_ratio": stats.compression_ratio,
+        "snapshots": stats.snapshots,
+        "deltas": stats.deltas,
+        "reconstructions": stats.reconstructions,
+        "reconstruction_seconds_avg": (
+            stats.reconstruction_seconds_total / stats.reconstructions if stats.reconstructions else None
+        ),
+        "reconstruction_seconds_max": stats.reconstruction_seconds_max,
+    }
@@ -1,18 +1,39 @@
+import hashlib
+import json
+import time
+from contextlib import aclosing
 from datetime import datetime
-from typing import List
+from typing import AsyncIterator, Awaitable, Callable, Dict, Hashable, List, Literal, Optional, Tuple
+from urllib.parse import quote
 
-from fastapi import APIRouter, Depends, UploadFile, File as FastAPIFile, HTTPException
-from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, UploadFile, File as FastAPIFile, HTTPException, Path, Query, Request, Response
+from fastapi.responses import FileResponse as FastAPIFileResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.domain.entities import File, Analysis, AnalysisStatus
 from src.domain.exceptions import FileNotFoundError, AnalysisNotFoundError
 from src.infrastructure.api.dependencies import (
     get_upload_file_use_case,
+    get_start_direct_upload_use_case,
+    get_complete_direct_upload_use_case,
+    get_batch_upload_files_use_case,
     get_list_files_use_case,
+    get_search_files_use_case,
     get_analyze_file_use_case,
-    get_get_analysis_use_case
+    get_batch_analyze_files_use_case,
+    get_stream_analysis_use_case,
+    get_get_analysis_use_case,
+    get_download_file_use_case,
+    get_response_cache
 )
-from src.infrastructure.persistence.database import get_db
+from src.application.repositories import FileListQuery, FileSearchQuery
+from src.application.use_cases import UploadItem
+from src.infrastructure.cache import ChangeCounter
+from src.infrastructure.persistence.database import get_db, SessionLocal
+from src.infrastructure.metrics.registry import UPLOAD_READ_DURATION
+from src.infrastructure.storage import get_content_type
+from src.config import settings
 
 router = APIRouter(prefix="/files", tags=["files"])
 
@@ -29,6 +50,47 @@ class FileResponse(BaseModel):
         from_attributes = True
 
 
+class SearchHitResponse(BaseModel):
+    """Response schema for a full-text search hit."""
+    file: FileResponse
+    score: float
+    snippet: str | None = None
+
+
+class BatchUploadItemResponse(BaseModel):
+    """Per-file result of a batch upload."""
+    original_name: str
+    file: FileResponse | None = None
+    error: str | None = None
+
+
+class BatchUploadResponse(BaseModel):
+    """Response schema for batch uploads."""
+    uploaded: int
+    failed: int
+    items: List[BatchUploadItemResponse]
+
+
+class DirectUploadRequest(BaseModel):
+    """Request schema for starting or completing a direct upload."""
+    original_name: str = Field(min_length=1)
+    size_bytes: int = Field(ge=0, le=settings.direct_upload_max_bytes)
+    checksum: str = Field(pattern=r"^[0-9a-f]{64}$", description="SHA-256 of the content, lowercase hex")
+
+
+class DirectUploadResponse(BaseModel):
+    """
+    Response schema for a started direct upload: the request to send to
+    storage, or the created version when the content is already stored.
+    """
+    upload_id: str | None = None
+    url: str | None = None
+    method: str | None = None
+    headers: Dict[str, str] = Field(default_factory=dict)
+    expires_at: datetime | None = None
+    file: FileResponse | None = None
+
+
 class AnalysisResponse(BaseModel):
     """Response schema for analysis results."""
     id: int
@@ -36,6 +98,9 @@ class AnalysisResponse(BaseModel):
     status: str
     result_text: str | None
     created_at: datetime
+    started_at: datetime | None = None
+    completed_at: datetime | None = None
+    error: str | None = None
 
     class Config:
         from_attributes = True
@@ -44,89 +109,683 @@ class AnalysisResponse(BaseModel):
 @router.post("/upload", response_model=FileResponse, status_code=201)
 async def upload_file(
         file: UploadFile = FastAPIFile(...),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_db)
 ):
     """
     Upload a file with automatic versioning.
 
     - Accepts any file format (PDF, DOCX, PNG, etc.)
     - Automatically increments version if file with same name exists
-    - Stores file in MinIO
+    - Streams file to MinIO in chunks without buffering it in memory
+    - Skips the storage write when identical content is already stored
     - Records metadata in database
     """
     use_case = get_upload_file_use_case(db)
 
-    content = await file.read()
+    checksum = await _digest_upload(file)
 
     created_file = await use_case.execute(
         original_name=file.filename,
-        content=content,
+        chunks=_iter_upload(file),
+        checksum=checksum,
         uploaded_by=1
     )
 
+    return _file_response(created_file)
+
+
+@router.post("/upload/batch", response_model=BatchUploadResponse)
+async def upload_files(
+        files: List[UploadFile] = FastAPIFile(...),
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Upload several files in one request.
+
+    - Versions of all names are resolved with one query and all rows are
+      inserted in one transaction
+    - New contents are written to MinIO concurrently (bounded by
+      `BATCH_UPLOAD_CONCURRENCY`); identical contents are written once
+    - The same name repeated in the batch gets consecutive versions
+    - Returns a result per file, in request order; a failed storage write
+      is reported in `error` without failing the other files
+    """
+    if len(files) > settings.batch_upload_max_files:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.batch_upload_max_files} files can be uploaded in one batch"
+        )
+
+    use_case = get_batch_upload_files_use_case(db)
+
+    items = [
+        UploadItem(
+            original_name=file.filename,
+            chunks=_iter_upload(file),
+            checksum=await _digest_upload(file)
+        )
+        for file in files
+    ]
+    results = await use_case.execute(items, uploaded_by=1)
+
+    return BatchUploadResponse(
+        uploaded=sum(1 for r in results if r.file is not None),
+        failed=sum(1 for r in results if r.file is None),
+        items=[
+            BatchUploadItemResponse(
+                original_name=r.original_name,
+                file=_file_response(r.file) if r.file is not None else None,
+                error=r.error
+            )
+            for r in results
+        ]
+    )
+
+
+@router.post("/uploads", response_model=DirectUploadResponse)
+async def start_direct_upload(
+        body: DirectUploadRequest,
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Start an upload that goes straight to storage, bypassing the API.
+
+    - Returns a presigned URL; send the content to it with the given method
+      and headers, then call `/files/uploads/{upload_id}/complete`
+    - Storage verifies the SHA-256 of the content while receiving it
+    - When identical content is already stored, the version is recorded
+      immediately and returned in `file`; nothing has to be uploaded
+    - Responds 501 when the storage backend cannot accept direct uploads
+    """
+    use_case = get_start_direct_upload_use_case(db)
+
+    upload = await use_case.execute(body.original_name, body.checksum, uploaded_by=1)
+
+    if upload.file is not None:
+        return DirectUploadResponse(file=_file_response(upload.file))
+    return DirectUploadResponse(
+        upload_id=upload.upload_id,
+        url=upload.request.url,
+        method=upload.request.method,
+        headers=upload.request.headers,
+        expires_at=upload.request.expires_at
+    )
+
+
+@router.post("/uploads/{upload_id}/complete", response_model=FileResponse, status_code=201)
+async def complete_direct_upload(
+        body: DirectUploadRequest,
+        upload_id: str = Path(pattern=r"^[0-9a-f]{32}$"),
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Record a new version from a direct upload.
+
+    - Checks the size and the storage-verified SHA-256 of the uploaded
+      object against the request; a mismatching object is deleted
+    - Reads only object metadata, the content is not transferred again
+    - Versions the file like `/files/upload`
+    """
+    use_case = get_complete_direct_upload_use_case(db)
+
+    created_file = await use_case.execute(
+        upload_id=upload_id,
+        original_name=body.original_name,
+        size_bytes=body.size_bytes,
+        checksum=body.checksum,
+        uploaded_by=1
+    )
+
+    return _file_response(created_file)
+
+
+def _file_response(file: File) -> FileResponse:
     return FileResponse(
-        id=created_file.id,
-        original_name=created_file.original_name,
-        version=created_file.version,
-        uploaded_at=created_file.uploaded_at,
-        size_bytes=created_file.size_bytes
+        id=file.id,
+        original_name=file.original_name,
+        version=file.version,
+        uploaded_at=file.uploaded_at,
+        size_bytes=file.size_bytes
     )
 
 
+async def _iter_upload(file: UploadFile) -> AsyncIterator[bytes]:
+    while chunk := await file.read(settings.upload_chunk_size):
+        yield chunk
+
+
+async def _digest_upload(file: UploadFile) -> str:
+    # The upload is already spooled locally, so hashing it before the storage
+    # write is cheap and lets duplicates skip the write entirely.
+    started_at = time.perf_counter()
+    digest = hashlib.sha256()
+    async for chunk in _iter_upload(file):
+        digest.update(chunk)
+    await file.seek(0)
+    UPLOAD_READ_DURATION.observe(time.perf_counter() - started_at)
+    return digest.hexdigest()
+
+
 @router.get("", response_model=List[FileResponse])
-def list_files(db: Session = Depends(get_db)):
-    use_case = get_list_files_use_case(db)
-    files = use_case.execute()
-
-    return [
-        FileResponse(
-            id=f.id,
-            original_name=f.original_name,
-            version=f.version,
-            uploaded_at=f.uploaded_at,
-            size_bytes=f.size_bytes
-        )
-        for f in files
-    ]
+async def list_files(
+        request: Request,
+        limit: Optional[int] = Query(None, ge=1, le=settings.files_page_max_limit),
+        cursor: Optional[str] = None,
+        sort: Literal["uploaded_at", "name", "size"] = "uploaded_at",
+        order: Literal["asc", "desc"] = "desc",
+        name_prefix: Optional[str] = None,
+        uploaded_from: Optional[datetime] = None,
+        uploaded_to: Optional[datetime] = None,
+        uploaded_by: Optional[int] = None,
+        min_size: Optional[int] = Query(None, ge=0),
+        max_size: Optional[int] = Query(None, ge=0),
+        response_format: Literal["json", "ndjson"] = Query("json", alias="format"),
+        include_analysis: bool = False,
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    List the latest version of every document.
+
+    - JSON pages carry an `ETag`; a matching `If-None-Match` gets 304.
+      Pages are served from an in-process cache until a write changes
+      the files
+
+    - Keyset pagination: pass the `X-Next-Cursor` header value as `cursor`
+      to get the next page (also given as a `Link: rel="next"` header)
+    - Filters: `name_prefix`, `uploaded_from`/`uploaded_to`, `uploaded_by`,
+      `min_size`/`max_size`
+    - Sorting: `sort` by `uploaded_at`, `name` or `size`, `order` asc/desc
+    - `format=ndjson` (or `Accept: application/x-ndjson`) streams one JSON
+      object per line straight from the database cursor; without `limit`
+      it streams every matching row
+    - `include_analysis=true` adds each file's latest analysis status as
+      `analysis` (`null` if never analyzed), fetched in the same query;
+      JSON pages only
+    """
+    query = FileListQuery(
+        limit=limit,
+        sort=sort,
+        descending=order == "desc",
+        name_prefix=name_prefix,
+        uploaded_from=uploaded_from,
+        uploaded_to=uploaded_to,
+        uploaded_by=uploaded_by,
+        min_size=min_size,
+        max_size=max_size
+    )
+
+    if response_format == "ndjson" or "application/x-ndjson" in request.headers.get("accept", ""):
+        return StreamingResponse(_ndjson_lines(query, cursor), media_type="application/x-ndjson")
+
+    if query.limit is None:
+        query.limit = settings.files_page_default_limit
+
+    async def render() -> Tuple[bytes, Dict[str, str]]:
+        page = await get_list_files_use_case(db).execute(query, cursor, include_analysis)
+
+        headers = {}
+        if page.next_cursor is not None:
+            next_url = request.url.include_query_params(cursor=page.next_cursor)
+            headers["X-Next-Cursor"] = page.next_cursor
+            headers["Link"] = f'<{next_url}>; rel="next"'
 
+        # Serialized directly: the rows are already trusted, so per-item
+        # response_model validation would only add overhead.
+        items = [_file_payload(f) for f in page.items]
+        if include_analysis:
+            for item in items:
+                analysis = page.analyses.get(item["id"])
+                item["analysis"] = _analysis_summary(analysis) if analysis is not None else None
+        return json.dumps(items).encode(), headers
+
+    key = ("files", tuple(sorted(request.query_params.multi_items())))
+    scopes = (ChangeCounter.FILES, ChangeCounter.ANALYSES) if include_analysis else (ChangeCounter.FILES,)
+    return await _cached_json(request, key, scopes, render)
+
+
+def _analysis_summary(analysis: Analysis) -> dict:
+    return {
+        "id": analysis.id,
+        "status": analysis.status,
+        "created_at": analysis.created_at.isoformat(),
+        "completed_at": analysis.completed_at.isoformat() if analysis.completed_at else None,
+    }
+
+
+def _file_payload(file: File) -> dict:
+    return {
+        "id": file.id,
+        "original_name": file.original_name,
+        "version": file.version,
+        "uploaded_at": file.uploaded_at.isoformat(),
+        "size_bytes": file.size_bytes,
+    }
+
+
+async def _ndjson_lines(query: FileListQuery, cursor: Optional[str]) -> AsyncIterator[str]:
+    # The request-scoped session may be closed before streaming finishes,
+    # so the stream owns its session.
+    async with SessionLocal() as db:
+        async for file in get_list_files_use_case(db).stream(query, cursor):
+            yield json.dumps(_file_payload(file)) + "\n"
+
+
+@router.get("/search", response_model=List[SearchHitResponse])
+async def search_files(
+        request: Request,
+        q: str = Query(..., min_length=1),
+        limit: int = Query(settings.search_page_default_limit, ge=1, le=settings.search_page_max_limit),
+        cursor: Optional[str] = None,
+        all_versions: bool = False,
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Full-text search over file names, extracted document text and analysis
+    results.
+
+    - Every word of `q` must match; the last one also matches as a prefix
+    - Hits are ranked by relevance, name matches first; `snippet` marks the
+      matched words with `[` and `]`
+    - Only latest versions are searched unless `all_versions=true`
+    - Keyset pagination as in the listing: `X-Next-Cursor` / `Link` headers
+    """
+    query = FileSearchQuery(text=q, limit=limit, all_versions=all_versions)
+    page = await get_search_files_use_case(db).execute(query, cursor)
+
+    headers = {}
+    if page.next_cursor is not None:
+        next_url = request.url.include_query_params(cursor=page.next_cursor)
+        headers["X-Next-Cursor"] = page.next_cursor
+        headers["Link"] = f'<{next_url}>; rel="next"'
+
+    return Response(
+        content=json.dumps([
+            {"file": _file_payload(hit.file), "score": hit.score, "snippet": hit.snippet}
+            for hit in page.items
+        ]),
+        media_type="application/json",
+        headers=headers
+    )
+
+
+class BatchAnalyzeRequest(BaseModel):
+    """Files to analyze: explicit ids, or a filter over the latest versions."""
+    file_ids: List[int] | None = None
+    name_prefix: str | None = None
+    uploaded_from: datetime | None = None
+    uploaded_to: datetime | None = None
+    uploaded_by: int | None = None
+    min_size: int | None = Field(None, ge=0)
+    max_size: int | None = Field(None, ge=0)
+    limit: int | None = Field(None, ge=1)
+
+
+class BatchAnalyzeItemResponse(BaseModel):
+    """Per-file result of a batch analysis request."""
+    file_id: int
+    analysis: AnalysisResponse | None = None
+    error: str | None = None
 
-@router.post("/{file_id}/analyze", response_model=AnalysisResponse, status_code=201)
+
+class AnalysisLookupItemResponse(BaseModel):
+    """Latest analysis of one file of a bulk lookup."""
+    file_id: int
+    analysis: AnalysisResponse | None = None
+    error: str | None = None
+
+
+class AnalysisLookupResponse(BaseModel):
+    """Response schema for bulk analysis lookups."""
+    items: List[AnalysisLookupItemResponse]
+
+
+class BatchAnalyzeResponse(BaseModel):
+    """Response schema for batch analysis requests."""
+    queued: int
+    completed: int
+    failed: int
+    items: List[BatchAnalyzeItemResponse]
+
+
+@router.post("/analyze/batch", response_model=BatchAnalyzeResponse, status_code=202)
+async def analyze_files(
+        payload: BatchAnalyzeRequest,
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Queue AI analysis of many files.
+
+    - Pass `file_ids`, or filters (`name_prefix`, `uploaded_from`/`uploaded_to`,
+      `uploaded_by`, `min_size`/`max_size`, `limit`) selecting latest versions
+    - Jobs run on the background worker pool (`ANALYSIS_WORKERS` in parallel);
+      OpenAI calls are rate limited and retried on 429/5xx
+    - Cached results are returned as `completed` right away, files with a job
+      in flight join that job
+    - Unknown file ids are reported in `error`
+    """
+    use_case = get_batch_analyze_files_use_case(db)
+
+    if payload.file_ids is not None:
+        if len(payload.file_ids) > settings.batch_analyze_max_files:
+            raise HTTPException(
+                status_code=413,
+                detail=f"At most {settings.batch_analyze_max_files} files can be analyzed in one batch"
+            )
+        results = await use_case.execute(payload.file_ids)
+    else:
+        results = await use_case.execute_for_query(FileListQuery(
+            limit=min(payload.limit or settings.batch_analyze_max_files, settings.batch_analyze_max_files),
+            name_prefix=payload.name_prefix,
+            uploaded_from=payload.uploaded_from,
+            uploaded_to=payload.uploaded_to,
+            uploaded_by=payload.uploaded_by,
+            min_size=payload.min_size,
+            max_size=payload.max_size
+        ))
+
+    statuses = [r.analysis.status if r.analysis is not None else None for r in results]
+    return BatchAnalyzeResponse(
+        queued=sum(1 for s in statuses if s in (AnalysisStatus.PENDING, AnalysisStatus.RUNNING)),
+        completed=statuses.count(AnalysisStatus.COMPLETED),
+        failed=statuses.count(None),
+        items=[
+            BatchAnalyzeItemResponse(
+                file_id=r.file_id,
+                analysis=_analysis_response(r.analysis) if r.analysis is not None else None,
+                error=r.error
+            )
+            for r in results
+        ]
+    )
+
+
+@router.post("/{file_id}/analyze", response_model=AnalysisResponse, status_code=202)
 async def analyze_file(
         file_id: int,
-        db: Session = Depends(get_db)
+        response: Response,
+        db: AsyncSession = Depends(get_db)
 ):
+    """
+    Queue AI analysis of a file.
+
+    - Returns immediately with a `pending` analysis
+    - Background workers move it through `running` to `completed` or `failed`
+    - Poll `GET /files/{file_id}/analysis` for progress
+    - Identical content already analyzed by the same model and prompt is
+      answered from the cache with a `completed` analysis and status 201
+    - A repeated request while a job is in flight returns that job
+    """
     use_case = get_analyze_file_use_case(db)
 
     try:
         analysis = await use_case.execute(file_id)
 
-        return AnalysisResponse(
-            id=analysis.id,
-            file_id=analysis.file_id,
-            status=analysis.status,
-            result_text=analysis.result_text,
-            created_at=analysis.created_at
-        )
+        if analysis.status == AnalysisStatus.COMPLETED:
+            response.status_code = 201
+        response.headers["Location"] = f"/files/{file_id}/analysis"
+        return _analysis_response(analysis)
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 
+@router.post("/{file_id}/analyze/stream")
+async def analyze_file_stream(file_id: int):
+    """
+    Analyze a file and stream the result as Server-Sent Events.
+
+    - `delta` events carry the next piece of the result text as `{"text": ...}`
+    - The final `completed` or `failed` event carries the stored analysis,
+      which is saved once, when generation ends
+    - Identical content already analyzed by the same model and prompt is
+      sent from the cache as a single `delta`
+    - If the client disconnects before the end, nothing is stored
+    """
+    # The stream outlives the request scope, so it owns its session.
+    db = SessionLocal()
+    try:
+        events = await get_stream_analysis_use_case(db).execute(file_id)
+    except FileNotFoundError as e:
+        await db.close()
+        raise HTTPException(status_code=404, detail=str(e))
+    except BaseException:
+        await db.close()
+        raise
+
+    return StreamingResponse(
+        _sse_events(events, db),
+        media_type="text/event-stream",
+        # Proxies must pass events on as they come instead of buffering them.
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def _sse_events(events: AsyncIterator[str | Analysis], db: AsyncSession) -> AsyncIterator[str]:
+    try:
+        async with aclosing(events):
+            async for event in events:
+                if isinstance(event, Analysis):
+                    yield _sse(event.status, _analysis_response(event).model_dump(mode="json"))
+                else:
+                    yield _sse("delta", {"text": event})
+    finally:
+        await db.close()
+
+
+def _sse(event: str, data: dict) -> str:
+    # json.dumps escapes newlines, so the data always fits on one line.
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.get("/analyses", response_model=AnalysisLookupResponse)
+async def get_analyses(
+        request: Request,
+        file_ids: List[int] = Query(..., alias="file_id"),
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Get the latest analysis of many files at once: `?file_id=1&file_id=2`.
+
+    - One database query for all files; items follow the request order
+    - Files that do not exist or were never analyzed get an `error`
+    - Cached and revalidated with `ETag` like `GET /files/{file_id}/analysis`
+    """
+    if len(file_ids) > settings.analysis_lookup_max_files:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.analysis_lookup_max_files} files can be looked up at once"
+        )
+
+    async def render() -> Tuple[bytes, Dict[str, str]]:
+        results = await get_get_analysis_use_case(db).execute_many(file_ids)
+        response = AnalysisLookupResponse(items=[
+            AnalysisLookupItemResponse(
+                file_id=r.file_id,
+                analysis=_analysis_response(r.analysis) if r.analysis else None,
+                error=r.error
+            )
+            for r in results
+        ])
+        return response.model_dump_json().encode(), {}
+
+    key = ("analyses", tuple(file_ids))
+    return await _cached_json(request, key, (ChangeCounter.FILES, ChangeCounter.ANALYSES), render)
+
+
 @router.get("/{file_id}/analysis", response_model=AnalysisResponse)
-def get_analysis(
+async def get_analysis(
         file_id: int,
-        db: Session = Depends(get_db)
+        request: Request,
+        db: AsyncSession = Depends(get_db)
 ):
-    use_case = get_get_analysis_use_case(db)
+    """
+    Get the latest analysis of a file.
+
+    - Carries an `ETag`; a matching `If-None-Match` gets 304, so pollers
+      only download the analysis when its status or result changes
+    - Served from an in-process cache until an analysis is written
+    """
+    async def render() -> Tuple[bytes, Dict[str, str]]:
+        try:
+            analysis = await get_get_analysis_use_case(db).execute(file_id)
+        except (FileNotFoundError, AnalysisNotFoundError) as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        return _analysis_response(analysis).model_dump_json().encode(), {}
+
+    return await _cached_json(request, ("analysis", file_id), (ChangeCounter.ANALYSES,), render)
+
+
+async def _cached_json(
+        request: Request,
+        key: Hashable,
+        scopes: Tuple[str, ...],
+        render: Callable[[], Awaitable[Tuple[bytes, Dict[str, str]]]]
+) -> Response:
+    """Serve a JSON response from the read cache, rendering it on a miss, with ETag revalidation."""
+    response_cache = get_response_cache()
+    cached = response_cache.get(key)
+    if cached is None:
+        # Taken before reading, so a write committed meanwhile leaves the entry stale.
+        generations = response_cache.changes.get_many(scopes)
+        body, headers = await render()
+        cached = response_cache.set(key, scopes, generations, body, headers)
+
+    # no-cache: clients may keep the response but must revalidate it.
+    headers = {**cached.headers, "ETag": cached.etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
+
+def _analysis_response(analysis: Analysis) -> AnalysisResponse:
+    return AnalysisResponse(
+        id=analysis.id,
+        file_id=analysis.file_id,
+        status=analysis.status,
+        result_text=analysis.result_text,
+        created_at=analysis.created_at,
+        started_at=analysis.started_at,
+        completed_at=analysis.completed_at,
+        error=analysis.error
+    )
+
+
+@router.get("/{file_id}/content")
+async def download_file(
+        file_id: int,
+        request: Request,
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Download the content of a file version.
+
+    - Streams the object from storage in chunks; objects on the local
+      filesystem are sent from disk (sendfile where the server supports it)
+    - Supports single byte ranges (`Range`, `If-Range`) for resuming and seeking
+    - Returns 304 when `If-None-Match` matches the version's ETag
+    """
+    use_case = get_download_file_use_case(db)
+    file = await use_case.execute(file_id)
+
+    etag = _file_etag(file)
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f"attachment; filename*=UTF-8''{quote(file.original_name)}",
+    }
 
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    use_range = bool(range_header) and (if_range is None or if_range == etag)
+
+    local_path = use_case.local_path(file)
+    if local_path is not None:
+        # Handles Range and If-Range itself, validating against the ETag above,
+        # but answers 400 to invalid single ranges, which must be ignored.
+        response_class = FastAPIFileResponse
+        if use_range and "," not in range_header and _parse_range(range_header, file.size_bytes) is None:
+            response_class = _FullFileResponse
+        return response_class(
+            local_path,
+            media_type=get_content_type(file.original_name),
+            headers=headers
+        )
+
+    byte_range = None
+    if use_range:
+        byte_range = _parse_range(range_header, file.size_bytes)
+
+    if byte_range is None:
+        headers["Content-Length"] = str(file.size_bytes)
+        return StreamingResponse(
+            use_case.open(file),
+            media_type=get_content_type(file.original_name),
+            headers=headers
+        )
+
+    start, end = byte_range
+    headers["Content-Length"] = str(end - start + 1)
+    headers["Content-Range"] = f"bytes {start}-{end}/{file.size_bytes}"
+    return StreamingResponse(
+        use_case.open(file, offset=start, length=end - start + 1),
+        status_code=206,
+        media_type=get_content_type(file.original_name),
+        headers=headers
+    )
+
+
+class _FullFileResponse(FastAPIFileResponse):
+    """File response that sends the whole file, ignoring the request's Range header."""
+
+    async def __call__(self, scope, receive, send) -> None:
+        scope = {**scope, "headers": [(name, value) for name, value in scope["headers"] if name != b"range"]}
+        await super().__call__(scope, receive, send)
+
+
+def _file_etag(file: File) -> str:
+    # File versions are immutable, so the content hash (or the id for rows
+    # stored before hashing was introduced) is a strong validator.
+    return f'"{file.checksum}"' if file.checksum else f'"file-{file.id}"'
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single `bytes=` range; multi-range requests fall back to the full body."""
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    first, _, last = spec.strip().partition("-")
     try:
-        analysis = use_case.execute(file_id)
-
-        return AnalysisResponse(
-            id=analysis.id,
-            file_id=analysis.file_id,
-            status=analysis.status,
-            result_text=analysis.result_text,
-            created_at=analysis.created_at
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+            # A range ending before it starts is invalid and ignored (RFC 9110,
+            # section 14.1.1); a valid one starting past the end is unsatisfiable.
+            if last and end < start:
+                return None
+        else:
+            suffix = int(last)
+            if suffix == 0:
+                raise ValueError()
+            start = max(size - suffix, 0)
+            end = size - 1
+    except ValueError:
+        return None
+
+    if start >= size:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"}
         )
-    except (FileNotFoundError, AnalysisNotFoundError) as e:
-        raise HTTPException(status_code=404, detail=str(e))
+
+    return start, min(end, size - 1)
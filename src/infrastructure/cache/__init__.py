@@ -0,0 +1,12 @@
+from .analysis_cache import AnalysisCacheStats, TieredAnalysisCache
+from .memory_cache import MemoryLRUCache
+from .response_cache import CachedResponse, ChangeCounter, ResponseCache
+
+__all__ = [
+    "AnalysisCacheStats",
+    "CachedResponse",
+    "ChangeCounter",
+    "MemoryLRUCache",
+    "ResponseCache",
+    "TieredAnalysisCache",
+]
@@ -0,0 +1,105 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.infrastructure.cache.memory_cache import MemoryLRUCache
+from src.infrastructure.persistence.models import AnalysisCacheModel
+
+
+@dataclass
+class AnalysisCacheStats:
+    """Process-wide hit/miss counters of the analysis cache."""
+    memory_hits: int = 0
+    persistent_hits: int = 0
+    misses: int = 0
+    writes: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.persistent_hits
+
+
+class TieredAnalysisCache:
+    """
+    Analysis cache with an optional in-memory LRU tier in front of the
+    persistent ``analysis_cache`` table.
+    """
+
+    def __init__(
+            self,
+            session: AsyncSession,
+            stats: AnalysisCacheStats,
+            memory: Optional[MemoryLRUCache[str]] = None
+    ):
+        self.session = session
+        self.stats = stats
+        self.memory = memory
+
+    async def get(self, checksum: str, fingerprint: str) -> Optional[str]:
+        key = (checksum, fingerprint)
+        if self.memory is not None:
+            result_text = self.memory.get(key)
+            if result_text is not None:
+                self.stats.memory_hits += 1
+                return result_text
+
+        cache_model = await self.session.get(AnalysisCacheModel, key)
+        if cache_model is None:
+            self.stats.misses += 1
+            return None
+
+        self.stats.persistent_hits += 1
+        self._remember(key, cache_model.result_text)
+        return cache_model.result_text
+
+    async def get_many(self, checksums: List[str], fingerprint: str) -> Dict[str, str]:
+        found = {}
+        missing = []
+        for checksum in dict.fromkeys(checksums):
+            result_text = self.memory.get((checksum, fingerprint)) if self.memory is not None else None
+            if result_text is None:
+                missing.append(checksum)
+            else:
+                found[checksum] = result_text
+        self.stats.memory_hits += len(found)
+
+        if missing:
+            cache_models = await self.session.scalars(
+                select(AnalysisCacheModel).where(
+                    AnalysisCacheModel.fingerprint == fingerprint,
+                    AnalysisCacheModel.checksum.in_(missing)
+                )
+            )
+            persistent_hits = 0
+            for cache_model in cache_models:
+                found[cache_model.checksum] = cache_model.result_text
+                self._remember((cache_model.checksum, fingerprint), cache_model.result_text)
+                persistent_hits += 1
+            self.stats.persistent_hits += persistent_hits
+            self.stats.misses += len(missing) - persistent_hits
+
+        return found
+
+    async def set(self, checksum: str, fingerprint: str, result_text: str) -> None:
+        self.session.add(AnalysisCacheModel(
+            checksum=checksum,
+            fingerprint=fingerprint,
+            result_text=result_text,
+            created_at=datetime.now()
+        ))
+        try:
+            await self.session.commit()
+        except IntegrityError:
+            # Another worker cached the same content concurrently; keep its entry.
+            await self.session.rollback()
+
+        self.stats.writes += 1
+        self._remember((checksum, fingerprint), result_text)
+
+    def _remember(self, key, result_text: str) -> None:
+        if self.memory is not None:
+            self.memory.set(key, result_text, size=len(result_text.encode()))
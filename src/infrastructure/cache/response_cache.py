@@ -0,0 +1,95 @@
+import hashlib
+from dataclasses import dataclass
+from typing import Dict, Hashable, Optional, Tuple
+
+from src.infrastructure.cache.memory_cache import MemoryLRUCache
+from src.infrastructure.metrics.registry import RESPONSE_CACHE_LOOKUPS
+
+
+class ChangeCounter:
+    """
+    Process-wide generation counters of the data behind cached responses.
+
+    Writers bump a scope after committing, which makes every response
+    cached from that scope stale at once.
+    """
+
+    FILES = "files"
+    ANALYSES = "analyses"
+
+    def __init__(self):
+        self._generations: Dict[str, int] = {}
+
+    def get(self, scope: str) -> int:
+        return self._generations.get(scope, 0)
+
+    def get_many(self, scopes: Tuple[str, ...]) -> Tuple[int, ...]:
+        return tuple(self.get(scope) for scope in scopes)
+
+    def bump(self, scope: str) -> None:
+        self._generations[scope] = self.get(scope) + 1
+
+
+@dataclass
+class CachedResponse:
+    """A rendered JSON response and the generations of the data it was read from."""
+    body: bytes
+    headers: Dict[str, str]
+    etag: str
+    scopes: Tuple[str, ...]
+    generations: Tuple[int, ...]
+
+
+class ResponseCache:
+    """
+    In-process cache of rendered read responses, validated against a
+    ``ChangeCounter``.
+
+    Writes made through this process invalidate entries immediately; the
+    TTL of the memory tier bounds how long writes made by other processes,
+    whose counters are not visible here, can go unnoticed. Without a memory
+    tier every lookup misses, but responses still get ETags.
+    """
+
+    def __init__(self, changes: ChangeCounter, memory: Optional[MemoryLRUCache[CachedResponse]] = None):
+        self.changes = changes
+        self.memory = memory
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        cached = self.memory.get(key) if self.memory is not None else None
+        if cached is not None and cached.generations != self.changes.get_many(cached.scopes):
+            self.memory.invalidate(key)
+            cached = None
+        RESPONSE_CACHE_LOOKUPS.labels("miss" if cached is None else "hit").inc()
+        return cached
+
+    def set(
+            self,
+            key: Hashable,
+            scopes: Tuple[str, ...],
+            generations: Tuple[int, ...],
+            body: bytes,
+            headers: Dict[str, str]
+    ) -> CachedResponse:
+        """
+        Store a response read at ``generations`` of ``scopes``.
+
+        The generations must be taken before the data is read, so that a
+        write committed in between leaves the entry stale rather than
+        caching outdated data as current.
+        """
+        # Content-derived, so the ETag stays valid across restarts and
+        # processes, and identical re-reads still answer 304.
+        digest = hashlib.sha256(body)
+        for name, value in sorted(headers.items()):
+            digest.update(f"\n{name}: {value}".encode())
+        cached = CachedResponse(
+            body=body,
+            headers=headers,
+            etag=f'"{digest.hexdigest()[:32]}"',
+            scopes=scopes,
+            generations=generations
+        )
+        if self.memory is not None:
+            self.memory.set(key, cached, len(body))
+        return cached
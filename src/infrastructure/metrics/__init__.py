@@ -0,0 +1,5 @@
+from .instrumentation import Instrumented, instrument_engine
+from .middleware import MetricsMiddleware
+from .storage import InstrumentedStorage
+
+__all__ = ["Instrumented", "InstrumentedStorage", "MetricsMiddleware", "instrument_engine"]
@@ -0,0 +1,96 @@
+import inspect
+import time
+from contextlib import aclosing
+from functools import wraps
+from typing import Any
+
+from prometheus_client import Histogram
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.infrastructure.metrics.registry import DB_STATEMENT_DURATION
+
+
+class Instrumented:
+    """
+    Proxy that times every coroutine method of the wrapped object, and every
+    async generator method until its iteration ends.
+
+    The histogram is labelled with the wrapped class name, the method name
+    and the outcome (``ok`` or the exception class). Other attributes are
+    passed through untouched.
+    """
+
+    def __init__(self, target: Any, histogram: Histogram):
+        self._target = target
+        self._histogram = histogram
+        self._name = type(target).__name__
+
+    def __getattr__(self, attr: str) -> Any:
+        value = getattr(self._target, attr)
+        if inspect.isasyncgenfunction(value):
+            return self._cache(attr, self._timed_generator(attr, value))
+        if not inspect.iscoroutinefunction(value):
+            return value
+
+        @wraps(value)
+        async def timed(*args, **kwargs):
+            started_at = time.perf_counter()
+            outcome = "ok"
+            try:
+                return await value(*args, **kwargs)
+            except Exception as e:
+                outcome = type(e).__name__
+                raise
+            finally:
+                self._histogram.labels(self._name, attr, outcome).observe(time.perf_counter() - started_at)
+
+        return self._cache(attr, timed)
+
+    def _timed_generator(self, attr: str, value):
+        @wraps(value)
+        async def timed(*args, **kwargs):
+            started_at = time.perf_counter()
+            outcome = "ok"
+            try:
+                # aclosing finalizes the wrapped generator if iteration stops early.
+                async with aclosing(value(*args, **kwargs)) as items:
+                    async for item in items:
+                        yield item
+            except Exception as e:
+                outcome = type(e).__name__
+                raise
+            finally:
+                self._histogram.labels(self._name, attr, outcome).observe(time.perf_counter() - started_at)
+
+        return timed
+
+    def _cache(self, attr: str, method):
+        # Cached on the instance, so later lookups skip __getattr__.
+        self.__dict__[attr] = method
+        return method
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Time every SQL statement executed through ``engine``."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context.metrics_started_at = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context.metrics_started_at
+    DB_STATEMENT_DURATION.labels(_statement_kind(statement)).observe(elapsed)
+
+
+_STATEMENT_KINDS = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"}
+
+
+def _statement_kind(statement: str) -> str:
+    words = statement.lstrip()[:7].split(None, 1)
+    verb = words[0].upper() if words else ""
+    return verb.lower() if verb in _STATEMENT_KINDS else "other"
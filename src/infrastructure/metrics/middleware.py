@@ -0,0 +1,58 @@
+import time
+
+from src.infrastructure.metrics.registry import (
+    HTTP_RECEIVED_BYTES,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS_IN_FLIGHT,
+    HTTP_SENT_BYTES,
+)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording in-flight requests, latency and body sizes.
+
+    Requests are labelled by route template rather than raw path, so ids in
+    URLs do not blow up label cardinality. Streaming responses are timed
+    until their last chunk is sent.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        received = 0
+        sent = 0
+        status = 500
+
+        async def counting_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+            return message
+
+        async def counting_send(message):
+            nonlocal sent, status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                sent += len(message.get("body", b""))
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, counting_receive, counting_send)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            route = scope["route"].path if "route" in scope else "unmatched"
+            HTTP_REQUEST_DURATION.labels(scope["method"], route, str(status)).observe(
+                time.perf_counter() - started_at
+            )
+            HTTP_RECEIVED_BYTES.labels(route).inc(received)
+            HTTP_SENT_BYTES.labels(route).inc(sent)
@@ -0,0 +1,115 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+# Buckets from 1 ms to 2 min cover both DB statements and LLM calls.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being processed"
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency, until the last body byte is sent",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS
+)
+HTTP_RECEIVED_BYTES = Counter(
+    "http_received_bytes",
+    "Request body bytes received",
+    ["route"]
+)
+HTTP_SENT_BYTES = Counter(
+    "http_sent_bytes",
+    "Response body bytes sent",
+    ["route"]
+)
+
+USE_CASE_DURATION = Histogram(
+    "use_case_duration_seconds",
+    "Latency of use case calls",
+    ["use_case", "method", "outcome"],
+    buckets=LATENCY_BUCKETS
+)
+REPOSITORY_CALL_DURATION = Histogram(
+    "repository_call_duration_seconds",
+    "Latency of repository calls, including commits",
+    ["repository", "method", "outcome"],
+    buckets=LATENCY_BUCKETS
+)
+DB_STATEMENT_DURATION = Histogram(
+    "db_statement_duration_seconds",
+    "Latency of individual SQL statements",
+    ["statement"],
+    buckets=LATENCY_BUCKETS
+)
+
+STORAGE_CALL_DURATION = Histogram(
+    "storage_call_duration_seconds",
+    "Latency of object storage calls; streams are timed until fully consumed",
+    ["operation", "outcome"],
+    buckets=LATENCY_BUCKETS
+)
+STORAGE_BYTES = Counter(
+    "storage_bytes",
+    "Bytes transferred to and from object storage",
+    ["direction"]
+)
+
+UPLOAD_READ_DURATION = Histogram(
+    "upload_read_duration_seconds",
+    "Time spent reading and hashing the spooled upload body",
+    buckets=LATENCY_BUCKETS
+)
+PDF_EXTRACTION_DURATION = Histogram(
+    "pdf_extraction_duration_seconds",
+    "Latency of PDF text extraction in the process pool",
+    ["outcome"],
+    buckets=LATENCY_BUCKETS
+)
+PDF_PAGES_EXTRACTED = Counter(
+    "pdf_pages_extracted",
+    "PDF pages parsed for text"
+)
+EXTRACTED_TEXT_LOOKUPS = Counter(
+    "extracted_text_lookups",
+    "Lookups of previously extracted text by analyzers",
+    ["result"]
+)
+RESPONSE_CACHE_LOOKUPS = Counter(
+    "response_cache_lookups",
+    "Lookups of cached file listing and analysis responses",
+    ["result"]
+)
+ANALYZER_CALL_DURATION = Histogram(
+    "analyzer_call_duration_seconds",
+    "Latency of analyzer calls, including text extraction",
+    ["analyzer", "method", "outcome"],
+    buckets=LATENCY_BUCKETS
+)
+LLM_REQUEST_DURATION = Histogram(
+    "llm_request_duration_seconds",
+    "Latency of single LLM API requests",
+    ["model", "outcome"],
+    buckets=LATENCY_BUCKETS
+)
+LLM_FIRST_TOKEN_DURATION = Histogram(
+    "llm_first_token_duration_seconds",
+    "Time from sending a streamed LLM request to its first text token",
+    ["model"],
+    buckets=LATENCY_BUCKETS
+)
+LLM_TOKENS = Counter(
+    "llm_tokens",
+    "Tokens used by LLM requests",
+    ["model", "kind"]
+)
+LLM_RETRIES = Counter(
+    "llm_retries",
+    "LLM requests retried after a rate limit or server error",
+    ["model", "reason"]
+)
+COMPACTION_DELETED = Counter(
+    "compaction_deleted",
+    "File versions and storage objects deleted by retention compaction",
+    ["kind"]
+)
@@ -0,0 +1,91 @@
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import AsyncIterator, List, Optional
+
+from src.application.services import PresignedUpload, StoredObject
+from src.infrastructure.metrics.registry import STORAGE_BYTES, STORAGE_CALL_DURATION
+
+
+class InstrumentedStorage:
+    """Storage decorator recording call latency and transferred bytes."""
+
+    def __init__(self, inner):
+        self.inner = inner
+
+    async def start(self) -> None:
+        await self.inner.start()
+
+    def close(self) -> None:
+        self.inner.close()
+
+    async def save(
+            self,
+            file_name: str,
+            chunks: AsyncIterator[bytes],
+            checksum: Optional[str] = None,
+            base_path: Optional[str] = None
+    ) -> StoredObject:
+        with _timed("save"):
+            stored = await self.inner.save(file_name, chunks, checksum=checksum, base_path=base_path)
+        STORAGE_BYTES.labels("written").inc(stored.size_bytes)
+        return stored
+
+    async def read(self, path: str) -> bytes:
+        with _timed("read"):
+            content = await self.inner.read(path)
+        STORAGE_BYTES.labels("read").inc(len(content))
+        return content
+
+    async def delete(self, path: str) -> None:
+        with _timed("delete"):
+            await self.inner.delete(path)
+
+    async def delete_many(self, paths: List[str]) -> None:
+        with _timed("delete_many"):
+            await self.inner.delete_many(paths)
+
+    async def presign_upload(
+            self,
+            upload_id: str,
+            checksum: str,
+            expires: timedelta
+    ) -> Optional[PresignedUpload]:
+        with _timed("presign_upload"):
+            return await self.inner.presign_upload(upload_id, checksum, expires)
+
+    async def find_upload(self, upload_id: str) -> Optional[StoredObject]:
+        with _timed("find_upload"):
+            return await self.inner.find_upload(upload_id)
+
+    async def store_upload(self, upload_id: str, checksum: str) -> str:
+        with _timed("store_upload"):
+            return await self.inner.store_upload(upload_id, checksum)
+
+    def local_path(self, path: str) -> Optional[str]:
+        return self.inner.local_path(path)
+
+    async def stream(
+            self,
+            path: str,
+            offset: int = 0,
+            length: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        read_bytes = STORAGE_BYTES.labels("read")
+        with _timed("stream"):
+            async for chunk in self.inner.stream(path, offset=offset, length=length):
+                read_bytes.inc(len(chunk))
+                yield chunk
+
+
+@contextmanager
+def _timed(operation: str):
+    started_at = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield
+    except BaseException as e:
+        outcome = type(e).__name__
+        raise
+    finally:
+        STORAGE_CALL_DURATION.labels(operation, outcome).observe(time.perf_counter() - started_at)
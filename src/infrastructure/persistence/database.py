@@ -1,21 +1,63 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
 from src.config import settings
 
-engine = create_engine(
-    settings.database_url,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {}
-)
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgres": "postgresql+asyncpg",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def _async_database_url(database_url: str):
+    """Map a sync database URL onto the matching asyncio driver."""
+    url = make_url(database_url)
+    driver = _ASYNC_DRIVERS.get(url.drivername)
+    return url.set(drivername=driver) if driver else url
+
+
+def _engine_options(url) -> dict:
+    options = {"pool_pre_ping": settings.db_pool_pre_ping}
+
+    if url.get_backend_name() == "sqlite":
+        # SQLite has no statement timeout; the busy timeout bounds lock waits instead.
+        options["connect_args"] = {"timeout": settings.db_statement_timeout_ms / 1000}
+        if url.database in (None, "", ":memory:"):
+            return options
+    elif url.get_driver_name() == "asyncpg":
+        options["connect_args"] = {
+            "server_settings": {"statement_timeout": str(settings.db_statement_timeout_ms)}
+        }
+
+    options.update(
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+    )
+    return options
+
+
+_url = _async_database_url(settings.database_url)
+
+engine = create_async_engine(_url, **_engine_options(_url))
+
+SessionLocal = async_sessionmaker(engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
 
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+
+async def init_db() -> None:
+    """Create missing tables and upgrade the schema of an existing database."""
+    # Imported here: the migrations import the models, which import this module.
+    from src.infrastructure.persistence.migrations import upgrade_schema
+
+    async with engine.begin() as conn:
+        await conn.run_sync(upgrade_schema)
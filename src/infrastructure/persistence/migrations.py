@@ -0,0 +1,122 @@
+"""
+In-place upgrade of databases created by earlier versions of the service.
+
+``create_all`` only creates missing tables. Columns, indexes and derived data
+added to tables that already exist are brought in here; every step checks the
+current schema first, so the upgrade runs on each startup and is a no-op on
+an up-to-date database.
+"""
+import logging
+
+from sqlalchemy import Table, inspect, text
+from sqlalchemy.engine import Connection
+
+from src.infrastructure.persistence.database import Base
+from src.infrastructure.persistence.models import AnalysisModel, BlobModel, DocumentModel, FileModel
+
+logger = logging.getLogger(__name__)
+
+# Columns added to tables after they were first released, in the order they are added.
+_ADDED_COLUMNS = {
+    FileModel.__table__: ["checksum", "blob_id", "is_latest"],
+    AnalysisModel.__table__: ["started_at", "completed_at", "error"],
+    BlobModel.__table__: ["base_path", "last_used_at"],
+}
+
+# The newest version of each document; the highest id breaks ties between
+# duplicate versions left by concurrent uploads before versions were unique.
+_BACKFILL_LATEST = """
+UPDATE files SET is_latest = TRUE
+WHERE NOT EXISTS (
+    SELECT 1 FROM files AS newer
+    WHERE newer.original_name = files.original_name
+      AND (newer.version > files.version OR (newer.version = files.version AND newer.id > files.id))
+)
+"""
+
+_BACKFILL_LAST_USED = """
+UPDATE blobs SET last_used_at = created_at WHERE last_used_at IS NULL
+"""
+
+_BACKFILL_DOCUMENTS = """
+INSERT INTO documents (original_name, latest_version)
+SELECT original_name, MAX(version) FROM files GROUP BY original_name
+"""
+
+_DUPLICATE_VERSIONS = """
+SELECT 1 FROM files GROUP BY original_name, version HAVING COUNT(*) > 1 LIMIT 1
+"""
+
+
+def upgrade_schema(connection: Connection) -> None:
+    """Create missing tables and upgrade existing ones, in the caller's transaction."""
+    existing_tables = set(inspect(connection).get_table_names())
+
+    if FileModel.__table__.name in existing_tables:
+        # New columns reference blobs, and the search index built when its
+        # table is created reads them, so they come before create_all.
+        BlobModel.__table__.create(connection, checkfirst=True)
+        added = _add_missing_columns(connection)
+        if "is_latest" in added.get(FileModel.__table__.name, []):
+            connection.execute(text(_BACKFILL_LATEST))
+            logger.info("Marked the newest version of every document as latest")
+        if "last_used_at" in added.get(BlobModel.__table__.name, []):
+            connection.execute(text(_BACKFILL_LAST_USED))
+
+    Base.metadata.create_all(connection)
+
+    if FileModel.__table__.name in existing_tables:
+        if DocumentModel.__table__.name not in existing_tables:
+            # Version counters continue from the versions already stored.
+            connection.execute(text(_BACKFILL_DOCUMENTS))
+        _add_unique_versions(connection)
+        for table in _ADDED_COLUMNS:
+            _create_missing_indexes(connection, table)
+
+
+def _add_missing_columns(connection: Connection) -> dict:
+    inspector = inspect(connection)
+    added = {}
+    for table, column_names in _ADDED_COLUMNS.items():
+        present = {column["name"] for column in inspector.get_columns(table.name)}
+        for name in column_names:
+            if name in present:
+                continue
+            connection.exec_driver_sql(_add_column_ddl(connection, table, name))
+            added.setdefault(table.name, []).append(name)
+            logger.info("Added column %s.%s", table.name, name)
+    return added
+
+
+def _add_column_ddl(connection: Connection, table: Table, name: str) -> str:
+    column = table.c[name]
+    ddl = f"ALTER TABLE {table.name} ADD COLUMN {name} {column.type.compile(connection.dialect)}"
+    for foreign_key in column.foreign_keys:
+        ddl += f" REFERENCES {foreign_key.column.table.name} ({foreign_key.column.name})"
+    if not column.nullable:
+        # Only boolean flags are added as NOT NULL; existing rows start unset.
+        ddl += " NOT NULL DEFAULT FALSE"
+    return ddl
+
+
+def _add_unique_versions(connection: Connection) -> None:
+    # SQLite cannot add a constraint to an existing table, so both dialects
+    # get a unique index under the constraint's name.
+    name = "uq_files_original_name_version"
+    inspector = inspect(connection)
+    if name in {c["name"] for c in inspector.get_unique_constraints("files")}:
+        return
+    if name in {i["name"] for i in inspector.get_indexes("files")}:
+        return
+    if connection.execute(text(_DUPLICATE_VERSIONS)).first() is not None:
+        logger.warning("files has duplicate (original_name, version) rows; %s is not created", name)
+        return
+    connection.execute(text(f"CREATE UNIQUE INDEX {name} ON files (original_name, version)"))
+
+
+def _create_missing_indexes(connection: Connection, table: Table) -> None:
+    present = {index["name"] for index in inspect(connection).get_indexes(table.name)}
+    for index in table.indexes:
+        if index.name not in present:
+            index.create(connection)
+            logger.info("Created index %s", index.name)
@@ -1,9 +1,32 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Index, Boolean, UniqueConstraint, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from src.infrastructure.persistence.database import Base
 
 
+class BlobModel(Base):
+    __tablename__ = "blobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    checksum = Column(String(64), nullable=False, unique=True, index=True)
+    path = Column(String, nullable=False)
+    size_bytes = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+    base_path = Column(String, nullable=True, index=True)
+    # Set whenever an upload picks the blob up; compaction spares recently used blobs.
+    last_used_at = Column(DateTime, default=datetime.now, nullable=True)
+
+    files = relationship("FileModel", back_populates="blob")
+
+
+class DocumentModel(Base):
+    """Per-document version counter; bumped atomically for every new version."""
+    __tablename__ = "documents"
+
+    original_name = Column(String, primary_key=True)
+    latest_version = Column(Integer, nullable=False)
+
+
 class FileModel(Base):
     __tablename__ = "files"
 
@@ -12,11 +35,51 @@ class FileModel(Base):
     path = Column(String, nullable=False)
     version = Column(Integer, nullable=False, default=1)
     size_bytes = Column(Integer, nullable=False)
+    checksum = Column(String(64), nullable=True)
+    blob_id = Column(Integer, ForeignKey("blobs.id"), nullable=True, index=True)
     uploaded_at = Column(DateTime, default=datetime.now, nullable=False)
     uploaded_by = Column(Integer, nullable=False, default=1)
+    is_latest = Column(Boolean, nullable=False, default=False)
 
+    blob = relationship("BlobModel", back_populates="files")
     analyses = relationship("AnalysisModel", back_populates="file")
 
+    __table_args__ = (
+        UniqueConstraint("original_name", "version", name="uq_files_original_name_version"),
+        # Partial unique index over head versions only: one head per document,
+        # and listing latest versions scans just the heads.
+        Index(
+            "ux_files_latest_original_name",
+            "original_name",
+            unique=True,
+            sqlite_where=text("is_latest = 1"),
+            postgresql_where=text("is_latest")
+        ),
+        # Keyset pagination orders over heads by these (column, id) pairs.
+        Index(
+            "ix_files_latest_uploaded_at",
+            "uploaded_at",
+            "id",
+            sqlite_where=text("is_latest = 1"),
+            postgresql_where=text("is_latest")
+        ),
+        Index(
+            "ix_files_latest_size_bytes",
+            "size_bytes",
+            "id",
+            sqlite_where=text("is_latest = 1"),
+            postgresql_where=text("is_latest")
+        ),
+        Index(
+            "ix_files_latest_uploaded_by",
+            "uploaded_by",
+            "uploaded_at",
+            "id",
+            sqlite_where=text("is_latest = 1"),
+            postgresql_where=text("is_latest")
+        ),
+    )
+
 
 class AnalysisModel(Base):
     __tablename__ = "analyses"
@@ -26,5 +89,36 @@ class AnalysisModel(Base):
     status = Column(String, nullable=False, default="pending")
     result_text = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.now, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
+    error = Column(Text, nullable=True)
 
     file = relationship("FileModel", back_populates="analyses")
+
+    __table_args__ = (
+        Index("ix_analyses_status_created_at", "status", "created_at"),
+        # The latest analysis of a file is a seek on this index.
+        Index("ix_analyses_file_id_created_at", "file_id", "created_at", "id"),
+    )
+
+
+class ExtractedTextModel(Base):
+    """Text extracted from a content, shared by every file version with that content."""
+    __tablename__ = "extracted_texts"
+
+    checksum = Column(String(64), primary_key=True)
+    extractor = Column(String, primary_key=True)
+    text = Column(Text, nullable=False)
+    pages_extracted = Column(Integer, nullable=False)
+    page_count = Column(Integer, nullable=True)
+    complete = Column(Boolean, nullable=False)
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+
+
+class AnalysisCacheModel(Base):
+    __tablename__ = "analysis_cache"
+
+    checksum = Column(String(64), primary_key=True)
+    fingerprint = Column(String, primary_key=True)
+    result_text = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
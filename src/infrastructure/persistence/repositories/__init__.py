@@ -1,3 +1,5 @@
 from .sqlalchemy_file_repository import SQLAlchemyFileRepository
+from .sqlalchemy_search_index import SQLAlchemySearchIndex
+from .sqlalchemy_text_store import SQLAlchemyTextStore
 
-__all__ = ["SQLAlchemyFileRepository"]
+__all__ = ["SQLAlchemyFileRepository", "SQLAlchemySearchIndex", "SQLAlchemyTextStore"]
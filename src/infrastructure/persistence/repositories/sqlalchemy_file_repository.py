@@ -1,89 +1,557 @@
-from typing import List, Optional
+import sys
+from collections import Counter
+from dataclasses import replace
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
-from sqlalchemy import desc
-from sqlalchemy.orm import Session
+from sqlalchemy import Select, delete, desc, func, or_, and_, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
-from src.domain.entities import File, Analysis
-from src.infrastructure.persistence.models import FileModel, AnalysisModel
+from src.application.repositories import FileListQuery, RetentionPolicy
+from src.domain.entities import File, Analysis, AnalysisStatus, Blob
+from src.domain.exceptions import BlobNotFoundError
+from src.infrastructure.cache import ChangeCounter
+from src.infrastructure.persistence.models import (
+    FileModel,
+    AnalysisModel,
+    BlobModel,
+    DocumentModel,
+    ExtractedTextModel
+)
+from src.infrastructure.persistence.repositories.sqlalchemy_search_index import SQLAlchemySearchIndex
 
 
 class SQLAlchemyFileRepository:
 
-    def __init__(self, session: Session):
+    def __init__(self, session: AsyncSession, changes: Optional[ChangeCounter] = None):
         self.session = session
+        self.search_index = SQLAlchemySearchIndex(session)
+        # Bumped after commits so cached responses built from older data go stale.
+        self.changes = changes
 
-    def add(self, file: File) -> File:
-        file_model = FileModel(
-            original_name=file.original_name,
-            path=file.path,
-            version=file.version,
-            size_bytes=file.size_bytes,
-            uploaded_at=file.uploaded_at,
-            uploaded_by=file.uploaded_by
+    async def add(self, file: File) -> File:
+        version = await self._allocate_versions(file.original_name)
+        await self._lock_blobs([file])
+        file_model = self._to_model(replace(file, version=version), is_latest=True)
+        # Allocating the version, moving the head flag and inserting the new
+        # version share one transaction.
+        await self.session.execute(
+            update(FileModel)
+            .where(FileModel.original_name == file.original_name, FileModel.is_latest)
+            .values(is_latest=False)
         )
         self.session.add(file_model)
-        self.session.commit()
-        self.session.refresh(file_model)
+        await self.session.flush()
+        await self.search_index.refresh([file_model.id])
+        await self.session.commit()
+        self._changed(ChangeCounter.FILES)
 
         return self._to_entity(file_model)
 
-    def get_by_id(self, file_id: int) -> Optional[File]:
-        file_model = self.session.query(FileModel).filter(FileModel.id == file_id).first()
-        return self._to_entity(file_model) if file_model else None
+    async def add_many(self, files: List[File]) -> List[File]:
+        if not files:
+            return []
+
+        # Counters are taken in name order so concurrent batches cannot deadlock.
+        next_versions = {}
+        for original_name, count in sorted(Counter(f.original_name for f in files).items()):
+            next_versions[original_name] = await self._allocate_versions(original_name, count) - count + 1
+        await self._lock_blobs(files)
+
+        versioned = []
+        for file in files:
+            versioned.append(replace(file, version=next_versions[file.original_name]))
+            next_versions[file.original_name] += 1
 
-    def find_latest_by_original_name(self, original_name: str) -> Optional[File]:
-        file_model = (
-            self.session.query(FileModel)
-            .filter(FileModel.original_name == original_name)
-            .order_by(desc(FileModel.version))
-            .first()
+        # Within the batch only the last version of each name becomes the head.
+        head_index = {file.original_name: i for i, file in enumerate(files)}
+        await self.session.execute(
+            update(FileModel)
+            .where(FileModel.original_name.in_(head_index), FileModel.is_latest)
+            .values(is_latest=False)
         )
-        return self._to_entity(file_model) if file_model else None
+        file_models = [
+            self._to_model(file, is_latest=head_index[file.original_name] == i)
+            for i, file in enumerate(versioned)
+        ]
+        self.session.add_all(file_models)
+        await self.session.flush()
+        await self.search_index.refresh(f.id for f in file_models)
+        await self.session.commit()
+        self._changed(ChangeCounter.FILES)
+
+        return [self._to_entity(f) for f in file_models]
 
-    def list_latest_versions(self) -> List[File]:
-        subquery = (
-            self.session.query(
-                FileModel.original_name,
-                desc(FileModel.version).label("max_version")
+    async def _allocate_versions(self, original_name: str, count: int = 1) -> int:
+        """Reserve ``count`` consecutive versions of a document and return the last one."""
+        # The upsert locks only this document's counter row until commit, so
+        # uploads of the same name are serialized while other names proceed.
+        # A missing counter starts from the highest stored version.
+        stored_version = (
+            select(func.coalesce(func.max(FileModel.version), 0))
+            .where(FileModel.original_name == original_name)
+            .scalar_subquery()
+        )
+        dialect = postgresql if self.session.bind.dialect.name == "postgresql" else sqlite
+        stmt = (
+            dialect.insert(DocumentModel)
+            .values(original_name=original_name, latest_version=stored_version + count)
+            .on_conflict_do_update(
+                index_elements=[DocumentModel.original_name],
+                set_={"latest_version": DocumentModel.latest_version + count}
             )
-            .group_by(FileModel.original_name)
-            .subquery()
+            .returning(DocumentModel.latest_version)
         )
+        return await self.session.scalar(stmt)
 
-        files = (
-            self.session.query(FileModel)
-            .join(
-                subquery,
-                (FileModel.original_name == subquery.c.original_name) &
-                (FileModel.version == subquery.c.max_version)
-            )
-            .all()
+    async def _lock_blobs(self, files: List[File]) -> None:
+        """Keep the blobs of new versions from being deleted until the transaction ends."""
+        blob_ids = {file.blob_id for file in files if file.blob_id is not None}
+        if not blob_ids:
+            return
+        # A key-share lock on PostgreSQL; SQLite already holds the write lock
+        # here, so compaction cannot delete a blob in between either way.
+        present = set(await self.session.scalars(
+            select(BlobModel.id).where(BlobModel.id.in_(blob_ids)).with_for_update(key_share=True)
+        ))
+        missing = blob_ids - present
+        if missing:
+            await self.session.rollback()
+            raise BlobNotFoundError(min(missing))
+
+    async def get_by_id(self, file_id: int) -> Optional[File]:
+        file_model = await self.session.get(FileModel, file_id)
+        return self._to_entity(file_model) if file_model else None
+
+    async def get_with_latest_analysis(self, file_id: int) -> Tuple[Optional[File], Optional[Analysis]]:
+        found = await self.get_many_with_latest_analyses([file_id])
+        return found.get(file_id, (None, None))
+
+    async def get_many_with_latest_analyses(self, file_ids: List[int]) -> Dict[int, Tuple[File, Optional[Analysis]]]:
+        if not file_ids:
+            return {}
+        rows = await self.session.execute(
+            self._with_latest_analysis(select(FileModel).where(FileModel.id.in_(set(file_ids))))
+        )
+        return {file_model.id: self._to_entities(file_model, analysis_model) for file_model, analysis_model in rows}
+
+    async def list_latest_versions_with_analyses(self, query: FileListQuery) -> List[Tuple[File, Optional[Analysis]]]:
+        rows = await self.session.execute(self._with_latest_analysis(self._latest_versions_query(query)))
+        return [self._to_entities(file_model, analysis_model) for file_model, analysis_model in rows]
+
+    @staticmethod
+    def _with_latest_analysis(stmt: Select) -> Select:
+        """Add the latest analysis of every selected file, or None, as a second column."""
+        # A correlated subquery per file row, so the files are read in the
+        # same round trip and the join keeps the statement's order and limit.
+        candidate = aliased(AnalysisModel)
+        latest_analysis_id = (
+            select(candidate.id)
+            .where(candidate.file_id == FileModel.id)
+            .order_by(desc(candidate.created_at), desc(candidate.id))
+            .limit(1)
+            .correlate(FileModel)
+            .scalar_subquery()
+        )
+        return stmt.add_columns(AnalysisModel).outerjoin(AnalysisModel, AnalysisModel.id == latest_analysis_id)
+
+    def _to_entities(
+            self,
+            file_model: FileModel,
+            analysis_model: Optional[AnalysisModel]
+    ) -> Tuple[File, Optional[Analysis]]:
+        if analysis_model is None:
+            return self._to_entity(file_model), None
+        analysis = self._analysis_to_entity(analysis_model)
+        return replace(self._to_entity(file_model), analysis_id=analysis.id), analysis
+
+    async def get_by_ids(self, file_ids: List[int]) -> Dict[int, File]:
+        if not file_ids:
+            return {}
+        files = await self.session.scalars(select(FileModel).where(FileModel.id.in_(set(file_ids))))
+        return {f.id: self._to_entity(f) for f in files}
+
+    async def find_latest_by_original_name(self, original_name: str) -> Optional[File]:
+        file_model = await self.session.scalar(
+            select(FileModel)
+            .where(FileModel.original_name == original_name, FileModel.is_latest)
         )
+        return self._to_entity(file_model) if file_model else None
 
+    async def find_latest_by_original_names(self, original_names: List[str]) -> Dict[str, File]:
+        if not original_names:
+            return {}
+        files = await self.session.scalars(
+            select(FileModel)
+            .where(FileModel.original_name.in_(set(original_names)), FileModel.is_latest)
+        )
+        return {f.original_name: self._to_entity(f) for f in files}
+
+    async def list_latest_versions(self, query: FileListQuery) -> List[File]:
+        files = await self.session.scalars(self._latest_versions_query(query))
         return [self._to_entity(f) for f in files]
 
-    def add_analysis(self, analysis: Analysis) -> Analysis:
-        analysis_model = AnalysisModel(
-            file_id=analysis.file_id,
-            status=analysis.status,
-            result_text=analysis.result_text,
-            created_at=analysis.created_at
+    async def iter_latest_versions(self, query: FileListQuery) -> AsyncIterator[File]:
+        # A streamed result reads rows from the DB cursor in batches instead
+        # of materializing the whole result.
+        files = await self.session.stream_scalars(
+            self._latest_versions_query(query).execution_options(yield_per=500)
         )
+        async for file_model in files:
+            yield self._to_entity(file_model)
+
+    @staticmethod
+    def _latest_versions_query(query: FileListQuery) -> Select:
+        sort_column = {
+            "uploaded_at": FileModel.uploaded_at,
+            "name": FileModel.original_name,
+            "size": FileModel.size_bytes,
+        }[query.sort]
+
+        stmt = select(FileModel).where(FileModel.is_latest)
+
+        if query.name_prefix:
+            # A range instead of LIKE keeps the prefix search on the index.
+            prefix = query.name_prefix
+            stmt = stmt.where(FileModel.original_name >= prefix)
+            upper = _prefix_upper_bound(prefix)
+            if upper is not None:
+                stmt = stmt.where(FileModel.original_name < upper)
+        if query.uploaded_from is not None:
+            stmt = stmt.where(FileModel.uploaded_at >= query.uploaded_from)
+        if query.uploaded_to is not None:
+            stmt = stmt.where(FileModel.uploaded_at < query.uploaded_to)
+        if query.uploaded_by is not None:
+            stmt = stmt.where(FileModel.uploaded_by == query.uploaded_by)
+        if query.min_size is not None:
+            stmt = stmt.where(FileModel.size_bytes >= query.min_size)
+        if query.max_size is not None:
+            stmt = stmt.where(FileModel.size_bytes <= query.max_size)
+
+        if query.after is not None:
+            position = tuple_(sort_column, FileModel.id)
+            after = tuple_(*query.after)
+            stmt = stmt.where(position < after if query.descending else position > after)
+
+        if query.descending:
+            stmt = stmt.order_by(desc(sort_column), desc(FileModel.id))
+        else:
+            stmt = stmt.order_by(sort_column, FileModel.id)
+
+        if query.limit is not None:
+            stmt = stmt.limit(query.limit)
+
+        return stmt
+
+    async def find_blob_by_checksum(self, checksum: str) -> Optional[Blob]:
+        blobs = await self.find_blobs_by_checksums([checksum])
+        return blobs.get(checksum)
+
+    async def find_blobs_by_checksums(self, checksums: List[str]) -> Dict[str, Blob]:
+        if not checksums:
+            return {}
+        # Found blobs are about to be referenced by new versions; marking them
+        # used keeps compaction away from them meanwhile. The update waits for
+        # a compaction deleting the same rows, so a deleted blob is not found.
+        blob_models = await self.session.scalars(
+            update(BlobModel)
+            .where(BlobModel.checksum.in_(set(checksums)))
+            .values(last_used_at=datetime.now())
+            .returning(BlobModel)
+        )
+        blobs = {b.checksum: self._blob_to_entity(b) for b in blob_models}
+        await self.session.commit()
+        return blobs
+
+    async def add_blob(self, blob: Blob) -> Blob:
+        blob_model = self._blob_to_model(blob)
+        self.session.add(blob_model)
+        try:
+            await self.session.commit()
+        except IntegrityError:
+            # A concurrent upload of the same content registered the blob first.
+            await self.session.rollback()
+            existing = await self.find_blob_by_checksum(blob.checksum)
+            if existing is None:
+                raise
+            return existing
+
+        return self._blob_to_entity(blob_model)
+
+    async def add_blobs(self, blobs: List[Blob]) -> List[Blob]:
+        if not blobs:
+            return []
+
+        blob_models = [self._blob_to_model(blob) for blob in blobs]
+        self.session.add_all(blob_models)
+        try:
+            await self.session.commit()
+        except IntegrityError:
+            # Some of the contents were registered concurrently; resolve them one by one.
+            await self.session.rollback()
+            return [await self.add_blob(blob) for blob in blobs]
+
+        return [self._blob_to_entity(b) for b in blob_models]
+
+    async def add_analysis(self, analysis: Analysis) -> Analysis:
+        analysis_model = self._analysis_to_model(analysis)
         self.session.add(analysis_model)
-        self.session.commit()
-        self.session.refresh(analysis_model)
+        if analysis.status == AnalysisStatus.COMPLETED:
+            await self.session.flush()
+            await self.search_index.refresh([analysis.file_id])
+        await self.session.commit()
+        self._changed(ChangeCounter.ANALYSES)
 
         return self._analysis_to_entity(analysis_model)
 
-    def get_analysis_by_file_id(self, file_id: int) -> Optional[Analysis]:
-        analysis_model = (
-            self.session.query(AnalysisModel)
-            .filter(AnalysisModel.file_id == file_id)
+    async def add_analyses(self, analyses: List[Analysis]) -> List[Analysis]:
+        analysis_models = [self._analysis_to_model(a) for a in analyses]
+        self.session.add_all(analysis_models)
+        completed_file_ids = [a.file_id for a in analyses if a.status == AnalysisStatus.COMPLETED]
+        if completed_file_ids:
+            await self.session.flush()
+            await self.search_index.refresh(completed_file_ids)
+        await self.session.commit()
+        self._changed(ChangeCounter.ANALYSES)
+
+        return [self._analysis_to_entity(a) for a in analysis_models]
+
+    async def get_analysis_by_file_id(self, file_id: int) -> Optional[Analysis]:
+        analysis_model = await self.session.scalar(
+            select(AnalysisModel)
+            .where(AnalysisModel.file_id == file_id)
             .order_by(desc(AnalysisModel.created_at))
-            .first()
+            .limit(1)
+        )
+        return self._analysis_to_entity(analysis_model) if analysis_model else None
+
+    async def get_latest_analyses_by_file_ids(self, file_ids: List[int]) -> Dict[int, Analysis]:
+        if not file_ids:
+            return {}
+        ranked = (
+            select(
+                AnalysisModel.id,
+                func.row_number().over(
+                    partition_by=AnalysisModel.file_id,
+                    order_by=(desc(AnalysisModel.created_at), desc(AnalysisModel.id))
+                ).label("rank")
+            )
+            .where(AnalysisModel.file_id.in_(set(file_ids)))
+            .subquery()
         )
+        analysis_models = await self.session.scalars(
+            select(AnalysisModel).join(ranked, AnalysisModel.id == ranked.c.id).where(ranked.c.rank == 1)
+        )
+        return {a.file_id: self._analysis_to_entity(a) for a in analysis_models}
+
+    async def get_analysis_by_id(self, analysis_id: int) -> Optional[Analysis]:
+        analysis_model = await self.session.get(AnalysisModel, analysis_id)
         return self._analysis_to_entity(analysis_model) if analysis_model else None
 
+    async def update_analysis(self, analysis: Analysis) -> Analysis:
+        analysis_model = await self.session.get(AnalysisModel, analysis.id)
+        analysis_model.status = analysis.status
+        analysis_model.result_text = analysis.result_text
+        analysis_model.started_at = analysis.started_at
+        analysis_model.completed_at = analysis.completed_at
+        analysis_model.error = analysis.error
+        if analysis.status == AnalysisStatus.COMPLETED:
+            # Text extracted during the analysis is shared by every version
+            # with the same content, so all of them are re-indexed.
+            await self.session.flush()
+            checksum = select(FileModel.checksum).where(FileModel.id == analysis_model.file_id).scalar_subquery()
+            await self.search_index.refresh(await self.session.scalars(
+                select(FileModel.id)
+                .where(or_(FileModel.id == analysis_model.file_id, FileModel.checksum == checksum))
+            ))
+        await self.session.commit()
+        self._changed(ChangeCounter.ANALYSES)
+
+        return self._analysis_to_entity(analysis_model)
+
+    async def claim_next_analysis(self, stale_before: datetime) -> Optional[Analysis]:
+        while True:
+            candidate_id = await self.session.scalar(
+                select(AnalysisModel.id)
+                .where(self._claimable(stale_before))
+                .order_by(AnalysisModel.created_at, AnalysisModel.id)
+                .limit(1)
+            )
+            if candidate_id is None:
+                await self.session.rollback()
+                return None
+
+            analysis = await self.claim_analysis(candidate_id, stale_before)
+            if analysis is not None:
+                return analysis
+
+    async def claim_analysis(self, analysis_id: int, stale_before: datetime) -> Optional[Analysis]:
+        # The claim re-checks the predicate, so only one worker wins the row.
+        result = await self.session.execute(
+            update(AnalysisModel)
+            .where(AnalysisModel.id == analysis_id, self._claimable(stale_before))
+            .values(status=AnalysisStatus.RUNNING, started_at=datetime.now())
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.commit()
+        if not result.rowcount:
+            return None
+        self._changed(ChangeCounter.ANALYSES)
+        return await self.get_analysis_by_id(analysis_id)
+
+    @staticmethod
+    def _claimable(stale_before: datetime):
+        return or_(
+            AnalysisModel.status == AnalysisStatus.PENDING,
+            and_(
+                AnalysisModel.status == AnalysisStatus.RUNNING,
+                AnalysisModel.started_at < stale_before
+            )
+        )
+
+    async def list_unfinished_analyses(self) -> List[Analysis]:
+        analysis_models = await self.session.scalars(
+            select(AnalysisModel)
+            .where(AnalysisModel.status.in_([AnalysisStatus.PENDING, AnalysisStatus.RUNNING]))
+            .order_by(AnalysisModel.created_at, AnalysisModel.id)
+        )
+        return [self._analysis_to_entity(a) for a in analysis_models]
+
+    async def list_document_names(self, after: Optional[str], limit: int) -> List[str]:
+        stmt = select(DocumentModel.original_name).order_by(DocumentModel.original_name).limit(limit)
+        if after is not None:
+            stmt = stmt.where(DocumentModel.original_name > after)
+        return list(await self.session.scalars(stmt))
+
+    async def find_expired_versions(
+            self,
+            original_names: List[str],
+            policy: RetentionPolicy,
+            now: datetime
+    ) -> List[int]:
+        if not original_names or not policy.enabled:
+            return []
+
+        ranked = (
+            select(
+                FileModel.id,
+                FileModel.uploaded_at,
+                FileModel.is_latest,
+                func.row_number().over(
+                    partition_by=FileModel.original_name,
+                    order_by=desc(FileModel.version)
+                ).label("rank")
+            )
+            .where(FileModel.original_name.in_(set(original_names)))
+            .subquery()
+        )
+        stmt = select(ranked.c.id).where(ranked.c.is_latest.is_(False)).order_by(ranked.c.id)
+        if policy.keep_versions:
+            stmt = stmt.where(ranked.c.rank > policy.keep_versions)
+        if policy.keep_for is not None:
+            stmt = stmt.where(ranked.c.uploaded_at < now - policy.keep_for)
+        file_ids = list(await self.session.scalars(stmt))
+        # Ends the read transaction, so no snapshot is held between batches.
+        await self.session.rollback()
+        return file_ids
+
+    async def delete_versions(self, file_ids: List[int]) -> List[str]:
+        if not file_ids:
+            return []
+
+        # Versions stored before blobs were introduced own their object directly.
+        own_paths = set(await self.session.scalars(
+            select(FileModel.path).where(FileModel.id.in_(set(file_ids)), FileModel.blob_id.is_(None))
+        ))
+        await self.search_index.remove(file_ids)
+        await self.session.execute(delete(AnalysisModel).where(AnalysisModel.file_id.in_(set(file_ids))))
+        # The head flag is re-checked in case the document changed since the versions were selected.
+        await self.session.execute(
+            delete(FileModel)
+            .where(FileModel.id.in_(set(file_ids)), FileModel.is_latest.is_(False))
+            .execution_options(synchronize_session=False)
+        )
+        unused_paths = await self._unreferenced_paths(own_paths)
+        await self.session.commit()
+        self._changed(ChangeCounter.FILES)
+        self._changed(ChangeCounter.ANALYSES)
+
+        return unused_paths
+
+    async def delete_orphaned_blobs(self, used_before: datetime, limit: int) -> List[str]:
+        delta_child = aliased(BlobModel)
+        orphaned = and_(
+            ~select(FileModel.id).where(FileModel.blob_id == BlobModel.id).exists(),
+            ~select(delta_child.id).where(delta_child.base_path == BlobModel.path).exists(),
+            BlobModel.last_used_at < used_before
+        )
+        blob_ids = list(await self.session.scalars(
+            select(BlobModel.id)
+            .where(orphaned)
+            .order_by(BlobModel.id)
+            .limit(limit)
+        ))
+        if not blob_ids:
+            await self.session.rollback()
+            return []
+
+        # The condition is repeated so blobs an upload picked up in the meantime survive.
+        deleted = (await self.session.execute(
+            delete(BlobModel)
+            .where(BlobModel.id.in_(blob_ids), orphaned)
+            .returning(BlobModel.path, BlobModel.checksum, BlobModel.base_path)
+            .execution_options(synchronize_session=False)
+        )).all()
+        checksums = {checksum for _, checksum, _ in deleted}
+        await self.session.execute(
+            delete(ExtractedTextModel)
+            .where(
+                ExtractedTextModel.checksum.in_(checksums),
+                ~select(FileModel.id).where(FileModel.checksum == ExtractedTextModel.checksum).exists()
+            )
+            .execution_options(synchronize_session=False)
+        )
+        # A delta base that is a version's own object (not a blob) is freed here too.
+        base_paths = {base_path for _, _, base_path in deleted if base_path is not None}
+        unused_paths = [path for path, _, _ in deleted] + await self._unreferenced_paths(base_paths)
+        await self.session.commit()
+
+        return unused_paths
+
+    async def _unreferenced_paths(self, paths: set) -> List[str]:
+        """The given storage paths that no file version or blob references."""
+        if not paths:
+            return []
+        referenced = set(await self.session.scalars(
+            select(FileModel.path).where(FileModel.path.in_(paths))
+            .union(
+                select(BlobModel.path).where(BlobModel.path.in_(paths)),
+                select(BlobModel.base_path).where(BlobModel.base_path.in_(paths))
+            )
+        ))
+        return sorted(paths - referenced)
+
+    def _changed(self, scope: str) -> None:
+        if self.changes is not None:
+            self.changes.bump(scope)
+
+    @staticmethod
+    def _to_model(file: File, is_latest: bool) -> FileModel:
+        return FileModel(
+            original_name=file.original_name,
+            path=file.path,
+            version=file.version,
+            size_bytes=file.size_bytes,
+            uploaded_at=file.uploaded_at,
+            uploaded_by=file.uploaded_by,
+            checksum=file.checksum,
+            blob_id=file.blob_id,
+            is_latest=is_latest
+        )
+
     @staticmethod
     def _to_entity(model: FileModel) -> File:
         return File(
@@ -93,7 +561,21 @@ class SQLAlchemyFileRepository:
             version=model.version,
             size_bytes=model.size_bytes,
             uploaded_at=model.uploaded_at,
-            uploaded_by=model.uploaded_by
+            uploaded_by=model.uploaded_by,
+            checksum=model.checksum,
+            blob_id=model.blob_id
+        )
+
+    @staticmethod
+    def _analysis_to_model(analysis: Analysis) -> AnalysisModel:
+        return AnalysisModel(
+            file_id=analysis.file_id,
+            status=analysis.status,
+            result_text=analysis.result_text,
+            created_at=analysis.created_at,
+            started_at=analysis.started_at,
+            completed_at=analysis.completed_at,
+            error=analysis.error
         )
 
     @staticmethod
@@ -103,5 +585,43 @@ class SQLAlchemyFileRepository:
             file_id=model.file_id,
             status=model.status,
             result_text=model.result_text,
-            created_at=model.created_at
+            created_at=model.created_at,
+            started_at=model.started_at,
+            completed_at=model.completed_at,
+            error=model.error
+        )
+
+    @staticmethod
+    def _blob_to_model(blob: Blob) -> BlobModel:
+        return BlobModel(
+            checksum=blob.checksum,
+            path=blob.path,
+            size_bytes=blob.size_bytes,
+            created_at=blob.created_at,
+            base_path=blob.base_path
+        )
+
+    @staticmethod
+    def _blob_to_entity(model: BlobModel) -> Blob:
+        return Blob(
+            id=model.id,
+            checksum=model.checksum,
+            path=model.path,
+            size_bytes=model.size_bytes,
+            created_at=model.created_at,
+            base_path=model.base_path
         )
+
+
+def _prefix_upper_bound(prefix: str) -> Optional[str]:
+    """The smallest string greater than every string starting with ``prefix``, if any."""
+    # Increments the last character; trailing U+10FFFF characters have no
+    # successor and are dropped first. Surrogates are skipped because they
+    # cannot be encoded.
+    stripped = prefix.rstrip(chr(sys.maxunicode))
+    if not stripped:
+        return None
+    code_point = ord(stripped[-1]) + 1
+    if 0xD800 <= code_point <= 0xDFFF:
+        code_point = 0xE000
+    return stripped[:-1] + chr(code_point)
@@ -0,0 +1,181 @@
+import re
+from typing import Iterable, List, Optional
+
+from sqlalchemy import Select, and_, column, delete, desc, event, func, insert, literal_column, or_, select, table, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.application.repositories import FileSearchHit, FileSearchQuery
+from src.domain.entities import AnalysisStatus
+from src.infrastructure.persistence.database import Base
+from src.infrastructure.persistence.models import AnalysisModel, ExtractedTextModel, FileModel
+
+# One row per file version: its name, the longest text extracted from its
+# content and its latest completed analysis. SQLite keeps it in an FTS5 table
+# keyed by rowid = files.id; PostgreSQL in a table with a generated tsvector.
+SEARCH_TABLE = "file_search"
+
+_fts = table(SEARCH_TABLE, column("rowid"), column("rank"), column("name"), column("content"), column("analysis"))
+_tsv = table(SEARCH_TABLE, column("file_id"), column("document"), column("name"), column("content"), column("analysis"))
+
+_SQLITE_DDL = [
+    f"CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5("
+    "name, content, analysis, tokenize = 'unicode61 remove_diacritics 2')",
+    # Name matches weigh most, then analysis results, then document text.
+    f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rank) VALUES ('rank', 'bm25(10.0, 1.0, 2.0)')",
+]
+_POSTGRESQL_DDL = [
+    f"""CREATE TABLE {SEARCH_TABLE} (
+        file_id INTEGER PRIMARY KEY REFERENCES files (id) ON DELETE CASCADE,
+        name TEXT NOT NULL,
+        content TEXT,
+        analysis TEXT,
+        document TSVECTOR GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', name), 'A')
+            || setweight(to_tsvector('simple', coalesce(analysis, '')), 'B')
+            || setweight(to_tsvector('simple', coalesce(content, '')), 'C')
+        ) STORED
+    )""",
+    f"CREATE INDEX ix_{SEARCH_TABLE}_document ON {SEARCH_TABLE} USING GIN (document)",
+]
+
+
+def _search_rows(file_ids: Optional[Iterable[int]] = None) -> Select:
+    """Current search fields of the given file versions (all versions when None)."""
+    content = (
+        select(ExtractedTextModel.text)
+        .where(ExtractedTextModel.checksum == FileModel.checksum)
+        .order_by(desc(func.length(ExtractedTextModel.text)))
+        .limit(1)
+        .scalar_subquery()
+    )
+    analysis = (
+        select(AnalysisModel.result_text)
+        .where(AnalysisModel.file_id == FileModel.id, AnalysisModel.status == AnalysisStatus.COMPLETED)
+        .order_by(desc(AnalysisModel.completed_at), desc(AnalysisModel.id))
+        .limit(1)
+        .scalar_subquery()
+    )
+    stmt = select(FileModel.id, FileModel.original_name, content, analysis)
+    if file_ids is not None:
+        stmt = stmt.where(FileModel.id.in_(set(file_ids)))
+    return stmt
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_search_table(target, connection: Connection, **kw) -> None:
+    # Created outside the ORM metadata because neither table type maps to a
+    # portable model. A new table is filled from existing rows once; from
+    # then on rows are maintained by SQLAlchemySearchIndex.refresh.
+    if connection.dialect.name == "postgresql":
+        exists = connection.scalar(text(f"SELECT to_regclass('{SEARCH_TABLE}')")) is not None
+        ddl, target_table, columns = _POSTGRESQL_DDL, _tsv, ["file_id", "name", "content", "analysis"]
+    else:
+        exists = connection.scalar(text(f"SELECT 1 FROM sqlite_master WHERE name = '{SEARCH_TABLE}'")) is not None
+        ddl, target_table, columns = _SQLITE_DDL, _fts, ["rowid", "name", "content", "analysis"]
+    if exists:
+        return
+
+    for statement in ddl:
+        connection.execute(text(statement))
+    connection.execute(insert(target_table).from_select(columns, _search_rows()))
+
+
+class SQLAlchemySearchIndex:
+    """
+    Full-text index over file versions: SQLite FTS5 ranked with bm25, or a
+    PostgreSQL tsvector with a GIN index ranked with ts_rank_cd.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @property
+    def _is_postgresql(self) -> bool:
+        return self.session.bind.dialect.name == "postgresql"
+
+    async def refresh(self, file_ids: Iterable[int]) -> None:
+        """
+        Re-index the given file versions from their current rows.
+
+        Runs in the caller's transaction, so the index changes together with
+        the rows it is derived from.
+        """
+        file_ids = set(file_ids)
+        if not file_ids:
+            return
+
+        rows = _search_rows(file_ids)
+        if self._is_postgresql:
+            stmt = postgresql.insert(_tsv).from_select(["file_id", "name", "content", "analysis"], rows)
+            await self.session.execute(stmt.on_conflict_do_update(
+                index_elements=[_tsv.c.file_id],
+                set_={name: stmt.excluded[name] for name in ("name", "content", "analysis")}
+            ))
+        else:
+            await self.session.execute(delete(_fts).where(_fts.c.rowid.in_(file_ids)))
+            await self.session.execute(insert(_fts).from_select(["rowid", "name", "content", "analysis"], rows))
+
+    async def remove(self, file_ids: Iterable[int]) -> None:
+        """Drop deleted file versions from the index, in the caller's transaction."""
+        file_ids = set(file_ids)
+        if not file_ids:
+            return
+        # PostgreSQL rows would also go with the files by cascade; FTS5 rows
+        # have no foreign key and must be deleted explicitly.
+        if self._is_postgresql:
+            await self.session.execute(delete(_tsv).where(_tsv.c.file_id.in_(file_ids)))
+        else:
+            await self.session.execute(delete(_fts).where(_fts.c.rowid.in_(file_ids)))
+
+    async def search(self, query: FileSearchQuery) -> List[FileSearchHit]:
+        words = re.findall(r"\w+", query.text.lower())
+        if not words:
+            return []
+
+        if self._is_postgresql:
+            # Words only contain \w characters, so they are safe tsquery operands.
+            tsquery = func.to_tsquery("simple", " & ".join(words[:-1] + [f"{words[-1]}:*"]))
+            # Sorting ascending on the negated rank keeps both dialects alike.
+            key = -func.ts_rank_cd(_tsv.c.document, tsquery)
+            snippet = func.ts_headline(
+                "simple",
+                func.concat_ws(" … ", _tsv.c.name, _tsv.c.analysis, _tsv.c.content),
+                tsquery,
+                "StartSel=[, StopSel=], MaxWords=24, MinWords=8, MaxFragments=1"
+            )
+            stmt = (
+                select(FileModel, key.label("key"), snippet.label("snippet"))
+                .select_from(_tsv)
+                .join(FileModel, FileModel.id == _tsv.c.file_id)
+                .where(_tsv.c.document.op("@@")(tsquery))
+            )
+        else:
+            match = " ".join(f'"{word}"' for word in words) + "*"
+            key = _fts.c.rank
+            snippet = func.snippet(literal_column(SEARCH_TABLE), -1, "[", "]", "…", 16)
+            stmt = (
+                select(FileModel, key.label("key"), snippet.label("snippet"))
+                .select_from(_fts)
+                .join(FileModel, FileModel.id == _fts.c.rowid)
+                .where(literal_column(SEARCH_TABLE).op("MATCH")(match))
+            )
+
+        if not query.all_versions:
+            stmt = stmt.where(FileModel.is_latest)
+        if query.after is not None:
+            after_key, after_id = -query.after[0], query.after[1]
+            stmt = stmt.where(or_(key > after_key, and_(key == after_key, FileModel.id > after_id)))
+
+        rows = await self.session.execute(stmt.order_by(key, FileModel.id).limit(query.limit))
+        return [
+            FileSearchHit(file=self._to_entity(file_model), score=-row_key, snippet=row_snippet)
+            for file_model, row_key, row_snippet in rows
+        ]
+
+    @staticmethod
+    def _to_entity(model: FileModel):
+        # Imported here: the file repository module imports this one.
+        from src.infrastructure.persistence.repositories.sqlalchemy_file_repository import SQLAlchemyFileRepository
+        return SQLAlchemyFileRepository._to_entity(model)
@@ -0,0 +1,51 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.application.services import ExtractedText
+from src.infrastructure.persistence.models import ExtractedTextModel
+
+
+class SQLAlchemyTextStore:
+    """
+    Extracted text persisted in the ``extracted_texts`` table.
+
+    Used by process-wide services rather than a single request, so every call
+    runs in its own short session.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]):
+        self.session_factory = session_factory
+
+    async def get(self, checksum: str, extractor: str) -> Optional[ExtractedText]:
+        async with self.session_factory() as session:
+            text_model = await session.get(ExtractedTextModel, (checksum, extractor))
+            if text_model is None:
+                return None
+            return ExtractedText(
+                text=text_model.text,
+                pages_extracted=text_model.pages_extracted,
+                page_count=text_model.page_count,
+                complete=text_model.complete
+            )
+
+    async def set(self, checksum: str, extractor: str, extracted: ExtractedText) -> None:
+        async with self.session_factory() as session:
+            text_model = await session.get(ExtractedTextModel, (checksum, extractor))
+            if text_model is None:
+                text_model = ExtractedTextModel(checksum=checksum, extractor=extractor, created_at=datetime.now())
+                session.add(text_model)
+            elif text_model.complete or len(text_model.text) >= len(extracted.text):
+                return
+
+            text_model.text = extracted.text
+            text_model.pages_extracted = extracted.pages_extracted
+            text_model.page_count = extracted.page_count
+            text_model.complete = extracted.complete
+            try:
+                await session.commit()
+            except IntegrityError:
+                # Another worker stored the same content concurrently; keep its text.
+                await session.rollback()
@@ -0,0 +1,4 @@
+from .database_queue import DatabaseAnalysisQueue
+from .memory_queue import InMemoryAnalysisQueue
+
+__all__ = ["DatabaseAnalysisQueue", "InMemoryAnalysisQueue"]
@@ -0,0 +1,54 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.infrastructure.persistence.repositories import SQLAlchemyFileRepository
+
+
+class DatabaseAnalysisQueue:
+    """
+    Analysis queue backed by the ``analyses`` table.
+
+    Pending rows are the queue itself: workers claim the oldest one with a
+    conditional update, so any number of worker processes sharing the database
+    can consume jobs without handing any job out twice. Jobs whose worker died
+    are reclaimed once they have been running longer than ``claim_timeout``.
+    """
+
+    def __init__(
+            self,
+            session_factory: Callable[[], AsyncSession],
+            poll_interval: float,
+            claim_timeout: float
+    ):
+        self._session_factory = session_factory
+        self._poll_interval = poll_interval
+        self._claim_timeout = claim_timeout
+        self._wakeup = asyncio.Event()
+
+    async def start(self) -> None:
+        pass
+
+    async def enqueue(self, analysis_id: int) -> None:
+        # The pending row is already committed; just wake local workers early.
+        self._wakeup.set()
+
+    async def dequeue(self) -> int:
+        while True:
+            self._wakeup.clear()
+            analysis_id = await self._claim()
+            if analysis_id is not None:
+                return analysis_id
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _claim(self) -> Optional[int]:
+        async with self._session_factory() as session:
+            stale_before = datetime.now() - timedelta(seconds=self._claim_timeout)
+            analysis = await SQLAlchemyFileRepository(session).claim_next_analysis(stale_before)
+            return analysis.id if analysis else None
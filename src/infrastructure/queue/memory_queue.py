@@ -0,0 +1,59 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domain.entities import AnalysisStatus
+from src.infrastructure.persistence.repositories import SQLAlchemyFileRepository
+
+
+class InMemoryAnalysisQueue:
+    """
+    Process-local analysis queue.
+
+    Jobs live in an ``asyncio.Queue``, so only workers of this process can
+    consume them. A job is claimed in the database with a conditional update
+    before it is handed out, so a job that another process also queued, for
+    example after both picked up unfinished jobs at startup, runs only once.
+
+    On start, pending jobs left by a previous run are re-enqueued. Running
+    jobs may still belong to a live worker of another process; they are
+    re-enqueued once they have been running longer than ``claim_timeout``
+    and can be reclaimed as stale.
+    """
+
+    def __init__(self, session_factory: Callable[[], AsyncSession], claim_timeout: float):
+        self._session_factory = session_factory
+        self._claim_timeout = claim_timeout
+        self._queue: asyncio.Queue[int] = asyncio.Queue()
+
+    async def start(self) -> None:
+        async with self._session_factory() as session:
+            analyses = await SQLAlchemyFileRepository(session).list_unfinished_analyses()
+
+        loop = asyncio.get_running_loop()
+        now = datetime.now()
+        for analysis in analyses:
+            if analysis.status == AnalysisStatus.RUNNING and analysis.started_at is not None:
+                stale_at = analysis.started_at + timedelta(seconds=self._claim_timeout)
+                if stale_at > now:
+                    # Queued a moment after the claim turns stale.
+                    loop.call_later((stale_at - now).total_seconds() + 1, self._queue.put_nowait, analysis.id)
+                    continue
+            self._queue.put_nowait(analysis.id)
+
+    async def enqueue(self, analysis_id: int) -> None:
+        self._queue.put_nowait(analysis_id)
+
+    async def dequeue(self) -> int:
+        while True:
+            analysis_id = await self._queue.get()
+            if await self._claim(analysis_id) is not None:
+                return analysis_id
+
+    async def _claim(self, analysis_id: int) -> Optional[int]:
+        async with self._session_factory() as session:
+            stale_before = datetime.now() - timedelta(seconds=self._claim_timeout)
+            analysis = await SQLAlchemyFileRepository(session).claim_analysis(analysis_id, stale_before)
+            return analysis.id if analysis else None
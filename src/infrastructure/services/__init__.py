@@ -1,4 +1,6 @@
 from .mock_ai_analyzer import MockAIAnalyzer
 from .openai_analyzer import OpenAIAnalyzer
+from .pdf_text_extractor import PdfTextExtractor
+from .rate_limiter import RateLimiter, TokenBucket
 
-__all__ = ["MockAIAnalyzer", "OpenAIAnalyzer"]
+__all__ = ["MockAIAnalyzer", "OpenAIAnalyzer", "PdfTextExtractor", "RateLimiter", "TokenBucket"]
@@ -1,8 +1,32 @@
+import asyncio
+import re
+from typing import AsyncIterator
+
+from src.application.services import DocumentContent
+
+
 class MockAIAnalyzer:
-    """Mock AI analyzer that generates analysis based on file metadata."""
+    """Mock AI analyzer that generates analysis based on the file size."""
+
+    fingerprint = "mock:v2"
+    # Pause between streamed words, imitating token generation.
+    stream_delay = 0.02
+
+    async def close(self) -> None:
+        pass
 
-    async def analyze(self, file_content: bytes, file_name: str) -> str:
-        file_size = len(file_content)
+    async def analyze(self, document: DocumentContent) -> str:
+        # Only the size is used: the content is never read, and the name is
+        # left out because results are cached by content.
+        return self._describe(document.size_bytes)
+
+    async def analyze_stream(self, document: DocumentContent) -> AsyncIterator[str]:
+        for word in re.findall(r"\S+\s*", self._describe(document.size_bytes)):
+            await asyncio.sleep(self.stream_delay)
+            yield word
+
+    @staticmethod
+    def _describe(file_size: int) -> str:
         version = 1
         
         # Generate analysis based on file characteristics
@@ -24,24 +48,7 @@ class MockAIAnalyzer:
         else:
             version_comment = f"Это версия {version}, документ активно обновляется."
         
-        # Determine file type
-        file_extension = file_name.split(".")[-1].lower() if "." in file_name else "unknown"
-        
-        type_comments = {
-            "pdf": "PDF документ, вероятно содержит текст и возможно изображения.",
-            "docx": "Word документ, текстовый файл с форматированием.",
-            "png": "PNG изображение, возможно скриншот или диаграмма.",
-            "jpg": "JPEG изображение, возможно фотография.",
-            "jpeg": "JPEG изображение, возможно фотография.",
-            "txt": "Текстовый файл без форматирования.",
-        }
-        
-        type_comment = type_comments.get(
-            file_extension,
-            f"Файл формата {file_extension.upper()}."
-        )
-        
-        analysis = f"{size_comment} ({size_mb:.2f} MB). {version_comment} {type_comment}"
+        analysis = f"{size_comment} ({size_mb:.2f} MB). {version_comment}"
         
         if version > 1:
             analysis += " Новое изменение может содержать важные обновления."
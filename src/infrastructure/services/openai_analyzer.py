@@ -1,61 +1,240 @@
-import io
+import asyncio
+import hashlib
+import random
+import time
+from contextlib import aclosing
+from typing import AsyncIterator, List, Optional, Tuple
 
 import openai
-import pdfplumber
 
+from src.application.services import AbstractTextStore, DocumentContent, ExtractedText
 from src.config import settings
+from src.domain.exceptions import AnalysisError
+from src.infrastructure.metrics.registry import (
+    EXTRACTED_TEXT_LOOKUPS,
+    LLM_FIRST_TOKEN_DURATION,
+    LLM_REQUEST_DURATION,
+    LLM_RETRIES,
+    LLM_TOKENS
+)
+from src.infrastructure.services.pdf_text_extractor import PdfTextExtractor
+from src.infrastructure.services.rate_limiter import RateLimiter
 
 
 class OpenAIAnalyzer:
 
-    def __init__(self):
+    model = "gpt-4o-mini"
+    temperature = 0.7
+    max_tokens = 500
+    max_chars = 15000
+    system_prompt = "You are an expert document analyst. Your task is to provide a concise, one-paragraph summary of the provided text."
+    # Results are cached by content, so the prompt must not depend on the file name.
+    user_prompt_template = "Analyze the following text from the document:\n\n{text}"
+    no_text_result = "Unable to extract text from the PDF file. The file may be empty or contain only images."
+    no_result = "No analysis result returned from OpenAI."
+
+    def __init__(
+            self,
+            text_extractor: PdfTextExtractor,
+            rate_limiter: Optional[RateLimiter] = None,
+            text_store: Optional[AbstractTextStore] = None
+    ):
         if settings.openai_api_key is None:
             raise ValueError("OpenAI API key is not configured. Please set OPENAI_API_KEY in .env file.")
-        self.client = openai.AsyncOpenAI(api_key=settings.openai_api_key)
+        # Retries are done in _complete so that every attempt passes the rate limiter.
+        self.client = openai.AsyncOpenAI(api_key=settings.openai_api_key, max_retries=0)
+        self.text_extractor = text_extractor
+        self.rate_limiter = rate_limiter
+        self.text_store = text_store
+
+    @property
+    def fingerprint(self) -> str:
+        prompt_identity = "\n".join([
+            self.system_prompt,
+            self.user_prompt_template,
+            str(self.temperature),
+            str(self.max_tokens),
+            str(self.max_chars),
+            str(self.text_extractor.max_pages),
+        ])
+        prompt_hash = hashlib.sha256(prompt_identity.encode()).hexdigest()[:16]
+        return f"openai:{self.model}:{prompt_hash}"
     
-    async def analyze(self, file_content: bytes, file_name: str) -> str:
+    async def close(self) -> None:
+        await self.client.close()
+
+    async def analyze(self, document: DocumentContent) -> str:
+        messages = await self._messages(document)
+        if messages is None:
+            return self.no_text_result
+
         try:
-            extracted_text = self._extract_text_from_pdf(file_content)
-            
-            if not extracted_text.strip():
-                return "Unable to extract text from the PDF file. The file may be empty or contain only images."
-            
-            max_chars = 15000
-            if len(extracted_text) > max_chars:
-                extracted_text = extracted_text[:max_chars] + "\n\n[...текст был сокращен...]"
-            
-            system_prompt = "You are an expert document analyst. Your task is to provide a concise, one-paragraph summary of the provided text."
-            user_prompt = f"Analyze the following text from the document '{file_name}':\n\n{extracted_text}"
-            
-            response = await self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.7,
-                max_tokens=500
-            )
-            
-            result = response.choices[0].message.content
-            return result if result else "No analysis result returned from OpenAI."
+            result = await self._complete(messages)
+            return result if result else self.no_result
             
         except openai.APIError as e:
-            return f"OpenAI API error: {str(e)}. Please check your API key and try again."
+            raise AnalysisError(f"OpenAI API error: {str(e)}. Please check your API key and try again.")
         except Exception as e:
-            return f"Error analyzing file: {str(e)}"
-    
-    @staticmethod
-    def _extract_text_from_pdf(file_content: bytes) -> str:
-        text_parts = []
-        
+            raise AnalysisError(f"Error analyzing file: {str(e)}")
+
+    async def analyze_stream(self, document: DocumentContent) -> AsyncIterator[str]:
+        messages = await self._messages(document)
+        if messages is None:
+            yield self.no_text_result
+            return
+
         try:
-            with pdfplumber.open(io.BytesIO(file_content)) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_parts.append(page_text)
-            
-            return "\n\n".join(text_parts)
+            produced = False
+            async with aclosing(self._complete_stream(messages)) as deltas:
+                async for delta in deltas:
+                    produced = True
+                    yield delta
+            if not produced:
+                yield self.no_result
+
+        except openai.APIError as e:
+            raise AnalysisError(f"OpenAI API error: {str(e)}. Please check your API key and try again.")
         except Exception as e:
-            raise Exception(f"Failed to extract text from PDF: {str(e)}")
+            raise AnalysisError(f"Error analyzing file: {str(e)}")
+
+    async def _messages(self, document: DocumentContent) -> Optional[List[dict]]:
+        """Chat messages asking to analyze the document, or None if it has no text."""
+        extracted = await self._extract(document)
+        extracted_text = extracted.text
+
+        if not extracted_text.strip():
+            return None
+
+        if len(extracted_text) > self.max_chars or not extracted.complete:
+            extracted_text = extracted_text[:self.max_chars] + "\n\n[...текст был сокращен...]"
+
+        user_prompt = self.user_prompt_template.format(text=extracted_text)
+        return [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+
+    async def _extract(self, document: DocumentContent) -> ExtractedText:
+        """
+        Text of the first ``max_chars`` characters of the document.
+
+        Reuses text stored by an earlier analysis of the same content when it
+        is long enough; otherwise parses only as many pages as the budget
+        needs and stores the result.
+        """
+        extractor = self.text_extractor.fingerprint
+        store = self.text_store if document.checksum else None
+        if store is not None:
+            stored = await store.get(document.checksum, extractor)
+            if stored is not None and stored.covers(self.max_chars):
+                EXTRACTED_TEXT_LOOKUPS.labels("hit").inc()
+                return stored
+            EXTRACTED_TEXT_LOOKUPS.labels("miss").inc()
+
+        if document.local_path is not None:
+            extracted = await self.text_extractor.extract_file(document.local_path, self.max_chars)
+        else:
+            extracted = await self.text_extractor.extract(await document.read(), self.max_chars)
+
+        if store is not None:
+            await store.set(document.checksum, extractor, extracted)
+        return extracted
+
+    async def _complete(self, messages: List[dict]) -> Optional[str]:
+        estimated_tokens = self._estimate_tokens(messages)
+        response, started_at = await self._request(messages, estimated_tokens)
+        LLM_REQUEST_DURATION.labels(self.model, "ok").observe(time.perf_counter() - started_at)
+
+        self._record_usage(response.usage, estimated_tokens)
+        return response.choices[0].message.content
+
+    async def _complete_stream(self, messages: List[dict]) -> AsyncIterator[str]:
+        estimated_tokens = self._estimate_tokens(messages)
+        # Only opening the stream is retried: once text has been passed on,
+        # a second attempt would repeat it.
+        stream, started_at = await self._request(
+            messages,
+            estimated_tokens,
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+
+        outcome = "ok"
+        first_token = True
+        try:
+            async for chunk in stream:
+                # With include_usage the last chunk carries usage and no choices.
+                if chunk.usage is not None:
+                    self._record_usage(chunk.usage, estimated_tokens)
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                if first_token:
+                    LLM_FIRST_TOKEN_DURATION.labels(self.model).observe(time.perf_counter() - started_at)
+                    first_token = False
+                yield chunk.choices[0].delta.content
+        except BaseException as e:
+            outcome = type(e).__name__
+            raise
+        finally:
+            await stream.close()
+            LLM_REQUEST_DURATION.labels(self.model, outcome).observe(time.perf_counter() - started_at)
+
+    async def _request(self, messages: List[dict], estimated_tokens: int, **options) -> Tuple[object, float]:
+        """
+        Send a chat completion request, retrying rate limits, server errors
+        and connection errors.
+
+        Returns:
+            The response (a stream with ``stream=True``) and the time the
+            successful attempt started
+        """
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire(estimated_tokens)
+            started_at = time.perf_counter()
+            try:
+                response = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=self.temperature,
+                    max_tokens=self.max_tokens,
+                    **options
+                )
+            except (openai.RateLimitError, openai.InternalServerError, openai.APIConnectionError) as e:
+                LLM_REQUEST_DURATION.labels(self.model, type(e).__name__).observe(time.perf_counter() - started_at)
+                if attempt >= settings.openai_max_retries:
+                    raise
+                LLM_RETRIES.labels(self.model, type(e).__name__).inc()
+                await asyncio.sleep(self._retry_delay(attempt, e))
+                attempt += 1
+                continue
+            except openai.APIError as e:
+                LLM_REQUEST_DURATION.labels(self.model, type(e).__name__).observe(time.perf_counter() - started_at)
+                raise
+            return response, started_at
+
+    def _record_usage(self, usage, estimated_tokens: int) -> None:
+        if usage is None:
+            return
+        LLM_TOKENS.labels(self.model, "prompt").inc(usage.prompt_tokens)
+        LLM_TOKENS.labels(self.model, "completion").inc(usage.completion_tokens)
+        if self.rate_limiter is not None:
+            self.rate_limiter.settle(estimated_tokens, usage.total_tokens)
+
+    def _estimate_tokens(self, messages: List[dict]) -> int:
+        # Roughly four characters per token, plus the completion budget.
+        return sum(len(m["content"]) for m in messages) // 4 + self.max_tokens
+
+    @staticmethod
+    def _retry_delay(attempt: int, error: Exception) -> float:
+        response = getattr(error, "response", None)
+        if response is not None:
+            try:
+                return min(float(response.headers["retry-after"]), settings.openai_retry_max_delay)
+            except (KeyError, ValueError):
+                pass
+
+        # Exponential backoff with jitter so that parallel workers do not retry in lockstep.
+        delay = min(settings.openai_retry_base_delay * 2 ** attempt, settings.openai_retry_max_delay)
+        return delay / 2 + random.uniform(0, delay / 2)
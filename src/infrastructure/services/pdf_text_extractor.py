@@ -0,0 +1,222 @@
+import asyncio
+import io
+import mmap
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Callable, Dict, Iterator, Optional, Set
+
+import pdfplumber
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdftypes import resolve1
+from pdfplumber.page import Page
+
+from src.application.services import ExtractedText
+from src.domain.exceptions import AnalysisError
+from src.infrastructure.metrics.registry import PDF_EXTRACTION_DURATION, PDF_PAGES_EXTRACTED
+
+# Seconds a worker gets on top of its own deadline check, which can only
+# fire between pages, before it is killed.
+_TIMEOUT_GRACE = 5.0
+
+
+def extract_pdf_text(file_content: bytes, max_pages: int, char_budget: int, timeout: float) -> ExtractedText:
+    """
+    Extract text from a PDF inside a worker process.
+
+    Parses pages in order and stops once ``char_budget`` characters or
+    ``max_pages`` pages are extracted; gives up once ``timeout`` seconds have
+    passed, checking between pages so the worker process is freed promptly.
+    """
+    return _extract_text(io.BytesIO(file_content), max_pages, char_budget, timeout)
+
+
+def extract_pdf_file_text(file_path: str, max_pages: int, char_budget: int, timeout: float) -> ExtractedText:
+    """
+    Extract text from a PDF on the local filesystem inside a worker process.
+
+    The file is memory-mapped, so its content is never copied between
+    processes and only the parts the parser touches are paged in.
+    """
+    with open(file_path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        return _extract_text(mapped, max_pages, char_budget, timeout)
+
+
+def iter_page_texts(pdf: pdfplumber.PDF, max_pages: int, deadline: float) -> Iterator[str]:
+    """
+    Yield the text of each page in order.
+
+    Pages are located and parsed only when the next one is requested, so a
+    consumer that stops early never touches the rest of the document.
+    """
+    doctop = 0
+    for page_number, page_object in enumerate(PDFPage.create_pages(pdf.doc), start=1):
+        if page_number > max_pages:
+            return
+        if time.monotonic() > deadline:
+            raise TimeoutError("PDF text extraction exceeded its time limit")
+
+        page = Page(pdf, page_object, page_number=page_number, initial_doctop=doctop)
+        doctop += page.height
+        try:
+            yield page.extract_text() or ""
+        finally:
+            page.close()
+
+
+def _extract_text(stream: BinaryIO, max_pages: int, char_budget: int, timeout: float) -> ExtractedText:
+    deadline = time.monotonic() + timeout
+    text_parts = []
+    length = 0
+    pages_extracted = 0
+
+    with pdfplumber.open(stream) as pdf:
+        page_count = _page_count(pdf)
+        for page_text in iter_page_texts(pdf, max_pages, deadline):
+            pages_extracted += 1
+            if page_text:
+                text_parts.append(page_text)
+                length += len(page_text) + 2
+            if length >= char_budget:
+                break
+
+    return ExtractedText(
+        text="\n\n".join(text_parts),
+        pages_extracted=pages_extracted,
+        page_count=page_count,
+        complete=page_count is not None and pages_extracted >= page_count
+    )
+
+
+def _page_count(pdf: pdfplumber.PDF) -> Optional[int]:
+    # Read from the page tree root, without walking the pages.
+    try:
+        return int(resolve1(pdf.doc.catalog["Pages"])["Count"])
+    except Exception:
+        return None
+
+
+def _warm_up_worker() -> int:
+    # Holding each worker briefly makes the pool start a new process per call.
+    time.sleep(0.1)
+    return os.getpid()
+
+
+class PdfTextExtractor:
+    """
+    Runs pdfplumber in a process pool so parsing neither blocks the event loop
+    nor is limited to a single core.
+
+    A worker stuck in a single page cannot be interrupted, so when an
+    extraction overruns its deadline the pool is replaced. The old pool gets
+    no new work; once its other extractions are done or have overrun too,
+    its processes are killed.
+    """
+
+    # Identity of the extraction method; stored texts are keyed by it.
+    fingerprint = "pdfplumber:v1"
+
+    def __init__(self, max_workers: Optional[int], timeout: float, max_pages: int):
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor = self._new_executor()
+        # Executor each running extraction was submitted to.
+        self._running: Dict[asyncio.Future, ProcessPoolExecutor] = {}
+        self._retiring: Set[asyncio.Task] = set()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # "spawn" keeps worker processes free of the parent's threads and sockets.
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+
+    async def extract(self, file_content: bytes, char_budget: int) -> ExtractedText:
+        return await self._run(extract_pdf_text, file_content, char_budget)
+
+    async def extract_file(self, file_path: str, char_budget: int) -> ExtractedText:
+        return await self._run(extract_pdf_file_text, file_path, char_budget)
+
+    async def _run(
+            self,
+            extract: Callable[[object, int, int, float], ExtractedText],
+            source: object,
+            char_budget: int
+    ) -> ExtractedText:
+        loop = asyncio.get_running_loop()
+        executor = self._executor
+        future = loop.run_in_executor(
+            executor,
+            extract,
+            source,
+            self.max_pages,
+            char_budget,
+            self.timeout
+        )
+        self._running[future] = executor
+
+        started_at = time.perf_counter()
+        outcome = "ok"
+        try:
+            # Shielded: a timeout must not drop the future before the worker is dealt with.
+            extracted = await asyncio.wait_for(asyncio.shield(future), timeout=self.timeout + _TIMEOUT_GRACE)
+            PDF_PAGES_EXTRACTED.inc(extracted.pages_extracted)
+            return extracted
+        except (asyncio.TimeoutError, TimeoutError):
+            outcome = "timeout"
+            if not future.done():
+                self._retire(executor, future)
+            raise AnalysisError(f"PDF text extraction timed out after {self.timeout} seconds")
+        except Exception as e:
+            outcome = "error"
+            raise AnalysisError(f"Failed to extract text from PDF: {str(e)}")
+        finally:
+            if future.done():
+                self._running.pop(future, None)
+            else:
+                future.add_done_callback(lambda done: self._running.pop(done, None))
+            PDF_EXTRACTION_DURATION.labels(outcome).observe(time.perf_counter() - started_at)
+
+    def _retire(self, executor: ProcessPoolExecutor, stuck: asyncio.Future) -> None:
+        """Stop using a pool with a stuck worker and kill it once its other work is over."""
+        if executor is not self._executor:
+            # Already retired by another extraction that overran.
+            return
+        self._executor = self._new_executor()
+        task = asyncio.create_task(self._kill_when_idle(executor, stuck))
+        self._retiring.add(task)
+        task.add_done_callback(self._retiring.discard)
+
+    async def _kill_when_idle(self, executor: ProcessPoolExecutor, stuck: asyncio.Future) -> None:
+        # Extractions still running in other workers get their full time limit.
+        others = [
+            future for future, owner in self._running.items()
+            if owner is executor and future is not stuck and not future.done()
+        ]
+        if others:
+            await asyncio.wait(others, timeout=self.timeout + _TIMEOUT_GRACE)
+        _kill(executor)
+
+    async def warm_up(self) -> None:
+        """Start the worker processes ahead of the first document."""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(
+            loop.run_in_executor(self._executor, _warm_up_worker)
+            for _ in range(self.max_workers)
+        ))
+
+    def close(self) -> None:
+        for task in self._retiring:
+            task.cancel()
+        for executor in set(self._running.values()) - {self._executor}:
+            _kill(executor)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _kill(executor: ProcessPoolExecutor) -> None:
+    # Before Python 3.14 the pool has no public way to stop a busy worker.
+    for process in list((executor._processes or {}).values()):
+        process.kill()
+    executor.shutdown(wait=False, cancel_futures=True)
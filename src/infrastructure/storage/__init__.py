@@ -1,3 +1,14 @@
+from .compressing_storage import CompressingStorage, StorageCompressionStats
+from .content_types import get_content_type
+from .filesystem_storage import FileSystemStorage
+from .memory_storage import MemoryStorage
 from .minio_storage import MinIOStorage
 
-__all__ = ["MinIOStorage"]
+__all__ = [
+    "CompressingStorage",
+    "FileSystemStorage",
+    "MemoryStorage",
+    "MinIOStorage",
+    "StorageCompressionStats",
+    "get_content_type"
+]
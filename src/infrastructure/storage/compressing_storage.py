@@ -0,0 +1,301 @@
+import asyncio
+import hashlib
+import math
+import struct
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import AsyncIterator, List, Optional, Tuple
+
+import zstandard
+
+from src.application.services import AbstractStorageService, PresignedUpload, StoredObject
+from src.config import settings
+
+COMPRESSED_SUFFIX = ".zst"
+DELTA_SUFFIX = ".zdelta"
+
+# Delta object layout: magic, chain depth, base path length, base path, zstd frame.
+_DELTA_MAGIC = b"ZDLT"
+_DELTA_HEADER = struct.Struct(">4sHH")
+
+_MAX_WINDOW_LOG = 27
+
+
+@dataclass
+class StorageCompressionStats:
+    """Process-wide counters of the compressing storage."""
+    logical_bytes: int = 0
+    stored_bytes: int = 0
+    snapshots: int = 0
+    deltas: int = 0
+    reconstructions: int = 0
+    reconstruction_seconds_total: float = 0.0
+    reconstruction_seconds_max: float = 0.0
+
+    @property
+    def compression_ratio(self) -> Optional[float]:
+        return self.logical_bytes / self.stored_bytes if self.stored_bytes else None
+
+    def record_reconstruction(self, seconds: float) -> None:
+        self.reconstructions += 1
+        self.reconstruction_seconds_total += seconds
+        self.reconstruction_seconds_max = max(self.reconstruction_seconds_max, seconds)
+
+
+class CompressingStorage:
+    """
+    Storage decorator that zstd-compresses objects and can store a new version
+    of a document as a binary delta against the previous one.
+
+    A delta is a zstd frame compressed with the base content as a raw-content
+    dictionary, so identical regions cost almost nothing. Every
+    ``snapshot_interval``-th version in a chain is stored as a full compressed
+    snapshot, which bounds how many objects a read has to fetch. Objects are
+    told apart by their key suffix, so plain objects written before
+    compression was enabled are read unchanged.
+    """
+
+    def __init__(
+            self,
+            inner: AbstractStorageService,
+            stats: StorageCompressionStats,
+            level: int,
+            delta_enabled: bool,
+            delta_max_bytes: int,
+            snapshot_interval: int
+    ):
+        self.inner = inner
+        self.stats = stats
+        self.level = level
+        self.delta_enabled = delta_enabled
+        self.delta_max_bytes = delta_max_bytes
+        self.snapshot_interval = snapshot_interval
+
+    async def start(self) -> None:
+        await self.inner.start()
+
+    def close(self) -> None:
+        self.inner.close()
+
+    async def save(
+            self,
+            file_name: str,
+            chunks: AsyncIterator[bytes],
+            checksum: Optional[str] = None,
+            base_path: Optional[str] = None
+    ) -> StoredObject:
+        chunks = chunks.__aiter__()
+
+        if self.delta_enabled and base_path is not None:
+            # Deltas need the whole content; larger files fall back to streaming.
+            head = bytearray()
+            async for chunk in chunks:
+                head += chunk
+                if len(head) > self.delta_max_bytes:
+                    break
+            else:
+                return await self._save_delta(file_name, bytes(head), checksum, base_path)
+            chunks = _prepend(bytes(head), chunks)
+
+        return await self._save_compressed(file_name, chunks, checksum)
+
+    async def read(self, path: str) -> bytes:
+        if not self._is_encoded(path):
+            return await self.inner.read(path)
+
+        started_at = time.perf_counter()
+        content, _ = await self._reconstruct(path)
+        self.stats.record_reconstruction(time.perf_counter() - started_at)
+        return content
+
+    async def delete(self, path: str) -> None:
+        await self.inner.delete(path)
+
+    async def delete_many(self, paths: List[str]) -> None:
+        await self.inner.delete_many(paths)
+
+    async def presign_upload(
+            self,
+            upload_id: str,
+            checksum: str,
+            expires: timedelta
+    ) -> Optional[PresignedUpload]:
+        # Direct uploads are stored as is; plain objects are read unchanged.
+        return await self.inner.presign_upload(upload_id, checksum, expires)
+
+    async def find_upload(self, upload_id: str) -> Optional[StoredObject]:
+        return await self.inner.find_upload(upload_id)
+
+    async def store_upload(self, upload_id: str, checksum: str) -> str:
+        return await self.inner.store_upload(upload_id, checksum)
+
+    def local_path(self, path: str) -> Optional[str]:
+        # Encoded objects have to be decoded by this process.
+        return None if self._is_encoded(path) else self.inner.local_path(path)
+
+    async def stream(
+            self,
+            path: str,
+            offset: int = 0,
+            length: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        if path.endswith(DELTA_SUFFIX):
+            content = await self.read(path)
+            end = len(content) if length is None else min(len(content), offset + length)
+            for position in range(offset, end, settings.download_chunk_size):
+                yield content[position:min(position + settings.download_chunk_size, end)]
+            return
+
+        if not path.endswith(COMPRESSED_SUFFIX):
+            async for chunk in self.inner.stream(path, offset=offset, length=length):
+                yield chunk
+            return
+
+        # Compressed snapshots are decompressed on the fly, off the event loop
+        # like compression; the bytes before ``offset`` are decompressed and dropped.
+        decompressor = zstandard.ZstdDecompressor().decompressobj()
+        position = 0
+        end = None if length is None else offset + length
+        async for compressed in self.inner.stream(path):
+            chunk = await asyncio.to_thread(decompressor.decompress, compressed)
+            chunk_start, position = position, position + len(chunk)
+            if position <= offset:
+                continue
+            chunk = chunk[max(offset - chunk_start, 0):]
+            if end is not None and position >= end:
+                yield chunk[:len(chunk) - (position - end)]
+                return
+            yield chunk
+
+    async def _save_compressed(
+            self,
+            file_name: str,
+            chunks: AsyncIterator[bytes],
+            checksum: Optional[str]
+    ) -> StoredObject:
+        compressor = zstandard.ZstdCompressor(level=self.level).compressobj()
+        digest = hashlib.sha256()
+        size = 0
+
+        async def compressed_chunks() -> AsyncIterator[bytes]:
+            nonlocal size
+            async for chunk in chunks:
+                digest.update(chunk)
+                size += len(chunk)
+                data = await asyncio.to_thread(compressor.compress, chunk)
+                if data:
+                    yield data
+            yield compressor.flush()
+
+        stored = await self.inner.save(file_name + COMPRESSED_SUFFIX, compressed_chunks())
+        await self._verify(stored.path, digest.hexdigest(), checksum, file_name)
+
+        self.stats.snapshots += 1
+        self._record_write(size, stored.size_bytes)
+        return StoredObject(path=stored.path, size_bytes=size, checksum=digest.hexdigest())
+
+    async def _save_delta(
+            self,
+            file_name: str,
+            content: bytes,
+            checksum: Optional[str],
+            base_path: str
+    ) -> StoredObject:
+        actual_checksum = hashlib.sha256(content).hexdigest()
+        if checksum is not None and actual_checksum != checksum:
+            raise Exception(f"Checksum mismatch for {file_name}: expected {checksum}, got {actual_checksum}")
+
+        base, base_depth = await self._reconstruct(base_path)
+        snapshot = await asyncio.to_thread(zstandard.ZstdCompressor(level=self.level).compress, content)
+
+        delta = None
+        if base_depth + 1 < self.snapshot_interval:
+            delta = await asyncio.to_thread(self._encode_delta, content, base)
+
+        # Unrelated content compresses better on its own.
+        if delta is None or len(delta) >= len(snapshot):
+            stored = await self.inner.save(file_name + COMPRESSED_SUFFIX, _single(snapshot))
+            self.stats.snapshots += 1
+            self._record_write(len(content), stored.size_bytes)
+            return StoredObject(path=stored.path, size_bytes=len(content), checksum=actual_checksum)
+
+        encoded_base_path = base_path.encode()
+        header = _DELTA_HEADER.pack(_DELTA_MAGIC, base_depth + 1, len(encoded_base_path)) + encoded_base_path
+        stored = await self.inner.save(file_name + DELTA_SUFFIX, _single(header + delta))
+
+        self.stats.deltas += 1
+        self._record_write(len(content), stored.size_bytes)
+        return StoredObject(
+            path=stored.path,
+            size_bytes=len(content),
+            checksum=actual_checksum,
+            base_path=base_path
+        )
+
+    async def _reconstruct(self, path: str) -> Tuple[bytes, int]:
+        """Return the content of an object and its depth in a delta chain."""
+        data = await self.inner.read(path)
+
+        if path.endswith(COMPRESSED_SUFFIX):
+            return await asyncio.to_thread(_decompress, data), 0
+        if not path.endswith(DELTA_SUFFIX):
+            return data, 0
+
+        magic, depth, path_length = _DELTA_HEADER.unpack_from(data)
+        if magic != _DELTA_MAGIC:
+            raise Exception(f"Corrupted delta object: {path}")
+        base_start = _DELTA_HEADER.size
+        base_path = data[base_start:base_start + path_length].decode()
+
+        base, _ = await self._reconstruct(base_path)
+        content = await asyncio.to_thread(_decode_delta, data[base_start + path_length:], base)
+        return content, depth
+
+    def _encode_delta(self, content: bytes, base: bytes) -> bytes:
+        dictionary = zstandard.ZstdCompressionDict(base, dict_type=zstandard.DICT_TYPE_RAWCONTENT)
+        # Matches can only reach back one window, so it has to span base and
+        # content; the hash tables grow with it so long bases stay indexed.
+        window_log = min(max(math.ceil(math.log2(len(base) + len(content) + 1)), 10), _MAX_WINDOW_LOG)
+        params = zstandard.ZstdCompressionParameters.from_level(
+            self.level,
+            window_log=window_log,
+            hash_log=min(window_log, 23),
+            chain_log=min(window_log, 23)
+        )
+        return zstandard.ZstdCompressor(dict_data=dictionary, compression_params=params).compress(content)
+
+    async def _verify(self, path: str, actual: str, expected: Optional[str], file_name: str) -> None:
+        if expected is not None and actual != expected:
+            await self.inner.delete(path)
+            raise Exception(f"Checksum mismatch for {file_name}: expected {expected}, got {actual}")
+
+    def _record_write(self, logical_bytes: int, stored_bytes: int) -> None:
+        self.stats.logical_bytes += logical_bytes
+        self.stats.stored_bytes += stored_bytes
+
+    @staticmethod
+    def _is_encoded(path: str) -> bool:
+        return path.endswith(COMPRESSED_SUFFIX) or path.endswith(DELTA_SUFFIX)
+
+
+def _decompress(data: bytes) -> bytes:
+    # Streamed frames carry no content size, so a one-shot decompress() cannot be used.
+    return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+
+def _decode_delta(delta: bytes, base: bytes) -> bytes:
+    dictionary = zstandard.ZstdCompressionDict(base, dict_type=zstandard.DICT_TYPE_RAWCONTENT)
+    decompressor = zstandard.ZstdDecompressor(dict_data=dictionary, max_window_size=1 << _MAX_WINDOW_LOG)
+    return decompressor.decompressobj().decompress(delta)
+
+
+async def _prepend(head: bytes, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    if head:
+        yield head
+    async for chunk in chunks:
+        yield chunk
+
+
+async def _single(data: bytes) -> AsyncIterator[bytes]:
+    yield data
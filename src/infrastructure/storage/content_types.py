@@ -0,0 +1,15 @@
+CONTENT_TYPES = {
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "doc": "application/msword",
+    "png": "image/png",
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "txt": "text/plain",
+    "csv": "text/csv",
+}
+
+
+def get_content_type(file_name: str) -> str:
+    extension = file_name.split(".")[-1].lower() if "." in file_name else ""
+    return CONTENT_TYPES.get(extension, "application/octet-stream")
@@ -0,0 +1,204 @@
+import asyncio
+import functools
+import hashlib
+import os
+import tempfile
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO, List, Optional
+
+from src.application.services import PresignedUpload, StoredObject
+from src.config import settings
+
+
+class FileSystemStorage:
+    """
+    Storage in a local directory, for single-node deployments without MinIO.
+
+    Objects live under two levels of shard directories so no directory grows
+    too large. Writes go to a temporary file on the same filesystem that is
+    renamed into place once complete and verified, so readers never see a
+    partial object. Blocking file calls run on a bounded thread pool.
+    Stored objects are plain files, so downloads and PDF extraction can use
+    them directly via ``local_path``.
+    """
+
+    namespace = "local"
+
+    def __init__(self, root: str, fsync: bool):
+        self.root = Path(root).resolve()
+        self.fsync = fsync
+        self._temp_dir = self.root / ".tmp"
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.storage_max_concurrency,
+            thread_name_prefix="storage"
+        )
+
+    async def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def start(self) -> None:
+        """Create the storage directories and check that they are writable."""
+        await self._run(self._prepare_root)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def _prepare_root(self) -> None:
+        self._temp_dir.mkdir(parents=True, exist_ok=True)
+        probe = tempfile.NamedTemporaryFile(dir=self._temp_dir)
+        probe.close()
+
+    async def save(
+            self,
+            file_name: str,
+            chunks: AsyncIterator[bytes],
+            checksum: Optional[str] = None,
+            base_path: Optional[str] = None
+    ) -> StoredObject:
+        if checksum is not None:
+            unique_key = self._content_key(checksum)
+        else:
+            file_extension = file_name.split(".")[-1] if "." in file_name else ""
+            object_id = uuid.uuid4().hex
+            unique_key = f"objects/{object_id[:2]}/{object_id[2:4]}/{object_id}"
+            if file_extension:
+                unique_key = f"{unique_key}.{file_extension}"
+
+        digest = hashlib.sha256()
+        size = 0
+        temp_file = await self._run(
+            tempfile.NamedTemporaryFile, dir=self._temp_dir, prefix="upload-", delete=False
+        )
+        try:
+            try:
+                async for chunk in chunks:
+                    digest.update(chunk)
+                    size += len(chunk)
+                    await self._run(temp_file.write, chunk)
+                await self._run(self._flush, temp_file)
+            finally:
+                temp_file.close()
+
+            if checksum is not None and digest.hexdigest() != checksum:
+                raise Exception(
+                    f"Checksum mismatch for {file_name}: expected {checksum}, got {digest.hexdigest()}"
+                )
+
+            await self._run(self._commit, Path(temp_file.name), self._object_path(unique_key))
+        except BaseException:
+            await self._run(Path(temp_file.name).unlink, missing_ok=True)
+            raise
+
+        return StoredObject(
+            path=f"{self.namespace}/{unique_key}",
+            size_bytes=size,
+            checksum=digest.hexdigest()
+        )
+
+    async def read(self, path: str) -> bytes:
+        try:
+            return await self._run(self._resolve(path).read_bytes)
+        except OSError as e:
+            raise Exception(f"Failed to read file from local storage: {e}")
+
+    async def delete(self, path: str) -> None:
+        await self._run(self._resolve(path).unlink, missing_ok=True)
+
+    async def delete_many(self, paths: List[str]) -> None:
+        object_paths = [self._resolve(path) for path in paths]
+        await self._run(self._unlink_all, object_paths)
+
+    async def stream(
+            self,
+            path: str,
+            offset: int = 0,
+            length: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        try:
+            file = await self._run(open, self._resolve(path), "rb")
+        except OSError as e:
+            raise Exception(f"Failed to read file from local storage: {e}")
+
+        try:
+            if offset:
+                await self._run(file.seek, offset)
+            remaining = length
+            while remaining is None or remaining > 0:
+                chunk_size = settings.download_chunk_size
+                if remaining is not None:
+                    chunk_size = min(remaining, chunk_size)
+                chunk = await self._run(file.read, chunk_size)
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+        finally:
+            file.close()
+
+    async def presign_upload(
+            self,
+            upload_id: str,
+            checksum: str,
+            expires: timedelta
+    ) -> Optional[PresignedUpload]:
+        # Objects are local files; there is no endpoint clients could upload to.
+        return None
+
+    async def find_upload(self, upload_id: str) -> Optional[StoredObject]:
+        return None
+
+    async def store_upload(self, upload_id: str, checksum: str) -> str:
+        raise Exception(f"Upload not found: {upload_id}")
+
+    def local_path(self, path: str) -> Optional[str]:
+        # Rows written by another backend before a switch (MinIO, legacy
+        # "documents/..." paths) are not local files; callers then fall back
+        # to streaming. Reads and deletes of such paths still fail loudly.
+        namespace, _, key = path.partition("/")
+        if namespace != self.namespace or not key:
+            return None
+        return str(self._resolve(path))
+
+    def _resolve(self, path: str) -> Path:
+        namespace, _, key = path.partition("/")
+        if namespace != self.namespace or not key:
+            raise ValueError(f"Invalid path format: {path}. Expected '{self.namespace}/key'")
+        return self._object_path(key)
+
+    def _object_path(self, key: str) -> Path:
+        object_path = (self.root / key).resolve()
+        if not object_path.is_relative_to(self.root) or object_path.is_relative_to(self._temp_dir):
+            raise ValueError(f"Invalid object key: {key}")
+        return object_path
+
+    @staticmethod
+    def _unlink_all(object_paths: List[Path]) -> None:
+        for object_path in object_paths:
+            object_path.unlink(missing_ok=True)
+
+    def _flush(self, file: BinaryIO) -> None:
+        file.flush()
+        if self.fsync:
+            os.fsync(file.fileno())
+
+    def _commit(self, temp_path: Path, object_path: Path) -> None:
+        object_path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(temp_path, object_path)
+        if self.fsync:
+            # The rename itself is only durable once the directory is synced.
+            directory = os.open(object_path.parent, os.O_RDONLY)
+            try:
+                os.fsync(directory)
+            finally:
+                os.close(directory)
+
+    @staticmethod
+    def _content_key(checksum: str) -> str:
+        # Every save gets a new key, so deleting an object of an earlier save
+        # of the same content can never remove this one.
+        return f"blobs/{checksum[:2]}/{checksum[2:4]}/{checksum}-{uuid.uuid4().hex}"
@@ -0,0 +1,101 @@
+import hashlib
+import uuid
+from datetime import timedelta
+from typing import AsyncIterator, Dict, List, Optional
+
+from src.application.services import PresignedUpload, StoredObject
+from src.config import settings
+
+
+class MemoryStorage:
+    """
+    Storage that keeps objects in a dict of the current process.
+
+    Intended for benchmarks and local runs without MinIO: it has the same
+    key layout and checksum handling as ``MinIOStorage``, but no network or
+    disk I/O, so measurements show the cost of the rest of the service.
+    Content is lost when the process exits.
+    """
+
+    bucket_name = "memory"
+
+    def __init__(self):
+        self._objects: Dict[str, bytes] = {}
+
+    async def start(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self._objects.clear()
+
+    async def save(
+            self,
+            file_name: str,
+            chunks: AsyncIterator[bytes],
+            checksum: Optional[str] = None,
+            base_path: Optional[str] = None
+    ) -> StoredObject:
+        digest = hashlib.sha256()
+        content = bytearray()
+        async for chunk in chunks:
+            digest.update(chunk)
+            content += chunk
+
+        if checksum is not None and digest.hexdigest() != checksum:
+            raise Exception(
+                f"Checksum mismatch for {file_name}: expected {checksum}, got {digest.hexdigest()}"
+            )
+
+        if checksum is not None:
+            unique_key = f"blobs/{checksum[:2]}/{checksum}-{uuid.uuid4().hex}"
+        else:
+            file_extension = file_name.split(".")[-1] if "." in file_name else ""
+            unique_key = f"{uuid.uuid4()}"
+            if file_extension:
+                unique_key = f"{unique_key}.{file_extension}"
+
+        path = f"{self.bucket_name}/{unique_key}"
+        self._objects[path] = bytes(content)
+        return StoredObject(path=path, size_bytes=len(content), checksum=digest.hexdigest())
+
+    async def read(self, path: str) -> bytes:
+        try:
+            return self._objects[path]
+        except KeyError:
+            raise Exception(f"Object not found: {path}")
+
+    async def delete(self, path: str) -> None:
+        self._objects.pop(path, None)
+
+    async def delete_many(self, paths: List[str]) -> None:
+        for path in paths:
+            self._objects.pop(path, None)
+
+    async def presign_upload(
+            self,
+            upload_id: str,
+            checksum: str,
+            expires: timedelta
+    ) -> Optional[PresignedUpload]:
+        # Objects live inside this process, so uploads have to go through it.
+        return None
+
+    async def find_upload(self, upload_id: str) -> Optional[StoredObject]:
+        return None
+
+    async def store_upload(self, upload_id: str, checksum: str) -> str:
+        raise Exception(f"Upload not found: {upload_id}")
+
+    def local_path(self, path: str) -> Optional[str]:
+        return None
+
+    async def stream(
+            self,
+            path: str,
+            offset: int = 0,
+            length: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        content = await self.read(path)
+        end = len(content) if length is None else min(len(content), offset + length)
+        for position in range(offset, end, settings.download_chunk_size):
+            yield content[position:min(position + settings.download_chunk_size, end)]
@@ -1,81 +1,321 @@
-import io
+import asyncio
+import base64
+import binascii
+import functools
+import hashlib
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, List, Optional
 
+import urllib3
 from minio import Minio
+from minio.commonconfig import CopySource
+from minio.deleteobjects import DeleteObject
 from minio.error import S3Error
 
+from src.application.services import PresignedUpload, StoredObject
 from src.config import settings
+from src.infrastructure.storage.content_types import get_content_type
+
+
+class _ChunkStreamReader:
+    """
+    Blocking file-like adapter over an async chunk iterator.
+
+    MinIO's client reads its input synchronously from a worker thread, so each
+    ``read`` pulls the next chunk from the event loop. Only the current chunk is
+    kept in memory; size and SHA-256 are accumulated as data passes through.
+    """
+
+    def __init__(self, chunks: AsyncIterator[bytes], loop: asyncio.AbstractEventLoop):
+        self._chunks = chunks.__aiter__()
+        self._loop = loop
+        self._pending = b""
+        self._exhausted = False
+        self._digest = hashlib.sha256()
+        self.size = 0
+
+    @property
+    def checksum(self) -> str:
+        return self._digest.hexdigest()
+
+    async def _next_chunk(self) -> Optional[bytes]:
+        try:
+            return await self._chunks.__anext__()
+        except StopAsyncIteration:
+            return None
+
+    def read(self, size: int = -1) -> bytes:
+        while not self._pending and not self._exhausted:
+            chunk = asyncio.run_coroutine_threadsafe(self._next_chunk(), self._loop).result()
+            if chunk is None:
+                self._exhausted = True
+                break
+            chunk = bytes(chunk)
+            self._digest.update(chunk)
+            self.size += len(chunk)
+            self._pending = chunk
+
+        if size is None or size < 0 or size >= len(self._pending):
+            data, self._pending = self._pending, b""
+        else:
+            data, self._pending = self._pending[:size], self._pending[size:]
+        return data
 
 
 class MinIOStorage:
 
+    """
+    MinIO-backed storage that never blocks the event loop.
+
+    The MinIO SDK is synchronous, so every call runs on a dedicated, bounded
+    thread pool. All calls share one HTTP connection pool, which should be at
+    least as large as the thread pool so that no worker waits for a connection.
+    A single instance is meant to be shared by the whole process.
+    """
+
     def __init__(self):
+        self._http_client = urllib3.PoolManager(
+            maxsize=settings.storage_pool_maxsize,
+            block=True,
+            timeout=urllib3.Timeout(
+                connect=settings.storage_connect_timeout,
+                read=settings.storage_read_timeout
+            ),
+            retries=urllib3.Retry(
+                total=3,
+                backoff_factor=0.2,
+                status_forcelist=[500, 502, 503, 504]
+            )
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.storage_max_concurrency,
+            thread_name_prefix="storage"
+        )
         self.client = Minio(
             settings.minio_endpoint,
             access_key=settings.minio_access_key,
             secret_key=settings.minio_secret_key,
-            secure=settings.minio_secure
+            secure=settings.minio_secure,
+            http_client=self._http_client
+        )
+        # Signs presigned URLs for the host clients see. With a fixed region
+        # signing needs no request to MinIO.
+        self.presign_client = Minio(
+            settings.minio_public_endpoint or settings.minio_endpoint,
+            access_key=settings.minio_access_key,
+            secret_key=settings.minio_secret_key,
+            secure=settings.minio_secure if settings.minio_public_secure is None else settings.minio_public_secure,
+            region=settings.minio_region
         )
         self.bucket_name = settings.minio_bucket_name
-        self._ensure_bucket_exists()
+
+    async def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def start(self) -> None:
+        """Create the bucket if needed; also opens the first pooled connection."""
+        await self._run(self._ensure_bucket_exists)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self._http_client.clear()
 
     def _ensure_bucket_exists(self):
-        try:
-            if not self.client.bucket_exists(self.bucket_name):
-                self.client.make_bucket(self.bucket_name)
-        except S3Error as e:
-            print(f"Error creating bucket: {e}")
+        if not self.client.bucket_exists(self.bucket_name):
+            self.client.make_bucket(self.bucket_name)
+
+    async def save(
+            self,
+            file_name: str,
+            chunks: AsyncIterator[bytes],
+            checksum: Optional[str] = None,
+            base_path: Optional[str] = None
+    ) -> StoredObject:
+        if checksum is not None:
+            unique_key = self._content_key(checksum)
+        else:
+            file_extension = file_name.split(".")[-1] if "." in file_name else ""
+            unique_key = f"{uuid.uuid4()}"
+            if file_extension:
+                unique_key = f"{unique_key}.{file_extension}"
 
-    async def save(self, file_name: str, content: bytes) -> str:
-        file_extension = file_name.split(".")[-1] if "." in file_name else ""
-        unique_key = f"{uuid.uuid4()}"
-        if file_extension:
-            unique_key = f"{unique_key}.{file_extension}"
+        reader = _ChunkStreamReader(chunks, asyncio.get_running_loop())
 
         try:
-            self.client.put_object(
+            # Unknown length makes MinIO upload multipart parts of ``part_size``
+            # as soon as each one is filled from the stream.
+            await self._run(
+                self.client.put_object,
                 self.bucket_name,
                 unique_key,
-                io.BytesIO(content),
-                length=len(content),
-                content_type=self._get_content_type(file_name)
+                reader,
+                length=-1,
+                part_size=settings.minio_part_size,
+                num_parallel_uploads=1,
+                content_type=get_content_type(file_name)
             )
-            return f"{self.bucket_name}/{unique_key}"
         except S3Error as e:
             raise Exception(f"Failed to upload file to MinIO: {e}")
 
+        if checksum is not None and reader.checksum != checksum:
+            await self._run(self.client.remove_object, self.bucket_name, unique_key)
+            raise Exception(
+                f"Checksum mismatch for {file_name}: expected {checksum}, got {reader.checksum}"
+            )
+
+        return StoredObject(
+            path=f"{self.bucket_name}/{unique_key}",
+            size_bytes=reader.size,
+            checksum=reader.checksum
+        )
+
     async def read(self, path: str) -> bytes:
         try:
-            parts = path.split("/", 1)
-            if len(parts) != 2:
-                raise ValueError(f"Invalid path format: {path}. Expected 'bucket/key'")
+            bucket_name, object_key = self._split_path(path)
+
+            return await self._run(self._read_object, bucket_name, object_key)
+        except S3Error as e:
+            raise Exception(f"Failed to read file from MinIO: {e}")
+        except Exception as e:
+            raise Exception(f"Error reading file: {e}")
+
+    async def delete(self, path: str) -> None:
+        bucket_name, object_key = self._split_path(path)
+        try:
+            await self._run(self.client.remove_object, bucket_name, object_key)
+        except S3Error as e:
+            raise Exception(f"Failed to delete file from MinIO: {e}")
 
-            bucket_name, object_key = parts
+    async def delete_many(self, paths: List[str]) -> None:
+        keys_by_bucket: Dict[str, List[str]] = {}
+        for path in paths:
+            bucket_name, object_key = self._split_path(path)
+            keys_by_bucket.setdefault(bucket_name, []).append(object_key)
 
-            response = self.client.get_object(bucket_name, object_key)
-            content = response.read()
+        for bucket_name, object_keys in keys_by_bucket.items():
+            try:
+                errors = await self._run(self._remove_objects, bucket_name, object_keys)
+            except S3Error as e:
+                raise Exception(f"Failed to delete files from MinIO: {e}")
+            if errors:
+                raise Exception(f"Failed to delete {len(errors)} files from MinIO: {errors[0]}")
+
+    async def stream(
+            self,
+            path: str,
+            offset: int = 0,
+            length: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        bucket_name, object_key = self._split_path(path)
+
+        try:
+            response = await self._run(
+                self.client.get_object,
+                bucket_name,
+                object_key,
+                offset=offset,
+                length=length or 0
+            )
+        except S3Error as e:
+            raise Exception(f"Failed to read file from MinIO: {e}")
+
+        try:
+            chunks = response.stream(settings.download_chunk_size)
+            while (chunk := await self._run(next, chunks, None)) is not None:
+                yield chunk
+        finally:
             response.close()
             response.release_conn()
 
-            return content
+    async def presign_upload(
+            self,
+            upload_id: str,
+            checksum: str,
+            expires: timedelta
+    ) -> Optional[PresignedUpload]:
+        expires_at = datetime.now() + expires
+        url = self.presign_client.presigned_put_object(self.bucket_name, self._upload_key(upload_id), expires)
+        # MinIO verifies the body against this header and rejects the PUT on
+        # a mismatch; the checksum is then kept with the object.
+        return PresignedUpload(
+            url=url,
+            method="PUT",
+            headers={"x-amz-checksum-sha256": base64.b64encode(bytes.fromhex(checksum)).decode()},
+            expires_at=expires_at
+        )
+
+    async def find_upload(self, upload_id: str) -> Optional[StoredObject]:
+        object_key = self._upload_key(upload_id)
+        try:
+            stat = await self._run(
+                self.client.stat_object,
+                self.bucket_name,
+                object_key,
+                extra_headers={"x-amz-checksum-mode": "ENABLED"}
+            )
         except S3Error as e:
-            raise Exception(f"Failed to read file from MinIO: {e}")
-        except Exception as e:
-            raise Exception(f"Error reading file: {e}")
+            if e.code in ("NoSuchKey", "NoSuchObject"):
+                return None
+            raise Exception(f"Failed to stat file in MinIO: {e}")
+
+        try:
+            checksum = base64.b64decode(stat.metadata.get("x-amz-checksum-sha256", ""), validate=True).hex()
+        except binascii.Error:
+            checksum = ""
+        return StoredObject(
+            path=f"{self.bucket_name}/{object_key}",
+            size_bytes=stat.size,
+            checksum=checksum
+        )
+
+    async def store_upload(self, upload_id: str, checksum: str) -> str:
+        upload_key = self._upload_key(upload_id)
+        unique_key = self._content_key(checksum)
+        try:
+            # A server-side copy; the content is not transferred through this process.
+            await self._run(
+                self.client.copy_object,
+                self.bucket_name,
+                unique_key,
+                CopySource(self.bucket_name, upload_key)
+            )
+            await self._run(self.client.remove_object, self.bucket_name, upload_key)
+        except S3Error as e:
+            raise Exception(f"Failed to store upload in MinIO: {e}")
+        return f"{self.bucket_name}/{unique_key}"
+
+    def local_path(self, path: str) -> Optional[str]:
+        return None
+
+    @staticmethod
+    def _split_path(path: str) -> tuple[str, str]:
+        parts = path.split("/", 1)
+        if len(parts) != 2:
+            raise ValueError(f"Invalid path format: {path}. Expected 'bucket/key'")
+        return parts[0], parts[1]
+
+    def _remove_objects(self, bucket_name: str, object_keys: List[str]) -> list:
+        # The client sends multi-object delete requests of up to 1000 keys
+        # lazily, as the returned error iterator is consumed.
+        return list(self.client.remove_objects(bucket_name, (DeleteObject(key) for key in object_keys)))
+
+    def _read_object(self, bucket_name: str, object_key: str) -> bytes:
+        response = self.client.get_object(bucket_name, object_key)
+        try:
+            return response.read()
+        finally:
+            response.close()
+            response.release_conn()
+
+    @staticmethod
+    def _content_key(checksum: str) -> str:
+        # Every save gets a new key, so deleting an object of an earlier save
+        # of the same content can never remove this one.
+        return f"blobs/{checksum[:2]}/{checksum}-{uuid.uuid4().hex}"
 
     @staticmethod
-    def _get_content_type(file_name: str) -> str:
-        extension = file_name.split(".")[-1].lower() if "." in file_name else ""
-
-        content_types = {
-            "pdf": "application/pdf",
-            "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-            "doc": "application/msword",
-            "png": "image/png",
-            "jpg": "image/jpeg",
-            "jpeg": "image/jpeg",
-            "txt": "text/plain",
-            "csv": "text/csv",
-        }
-
-        return content_types.get(extension, "application/octet-stream")
+    def _upload_key(upload_id: str) -> str:
+        return f"uploads/{upload_id}"
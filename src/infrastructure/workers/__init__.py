@@ -0,0 +1,4 @@
+from .analysis_worker_pool import AnalysisWorkerPool
+from .periodic_task import PeriodicTask
+
+__all__ = ["AnalysisWorkerPool", "PeriodicTask"]
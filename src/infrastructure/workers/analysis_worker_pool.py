@@ -0,0 +1,41 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, List
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisWorkerPool:
+    """Fixed-size pool of background tasks consuming the analysis queue."""
+
+    def __init__(
+            self,
+            queue,
+            handler: Callable[[int], Awaitable[None]],
+            size: int
+    ):
+        self.queue = queue
+        self.handler = handler
+        self.size = size
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        await self.queue.start()
+        self._tasks = [
+            asyncio.create_task(self._run(), name=f"analysis-worker-{index}")
+            for index in range(self.size)
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _run(self) -> None:
+        while True:
+            analysis_id = await self.queue.dequeue()
+            try:
+                await self.handler(analysis_id)
+            except Exception:
+                logger.exception("Analysis job %s crashed", analysis_id)
@@ -0,0 +1,33 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """Background task running a job repeatedly, waiting ``interval`` seconds after each run."""
+
+    def __init__(self, name: str, job: Callable[[], Awaitable[None]], interval: float):
+        self.name = name
+        self.job = job
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name=self.name)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        # The first run waits too, so startup is not slowed down by the job.
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.job()
+            except Exception:
+                logger.exception("Periodic task %s failed", self.name)
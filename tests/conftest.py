@@ -0,0 +1,23 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from src.infrastructure.persistence.migrations import upgrade_schema
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """Sessions on a fresh SQLite database with the current schema."""
+    # Without pooling every session opens its own connection, so sessions
+    # can be used from the event loops of different asyncio.run calls.
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'app.db'}", poolclass=NullPool)
+
+    async def create_schema():
+        async with engine.begin() as connection:
+            await connection.run_sync(upgrade_schema)
+
+    asyncio.run(create_schema())
+    yield async_sessionmaker(engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    asyncio.run(engine.dispose())
@@ -0,0 +1,69 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from src.domain.entities import Analysis, AnalysisStatus, File
+from src.infrastructure.persistence.repositories.sqlalchemy_file_repository import SQLAlchemyFileRepository
+from src.infrastructure.queue.memory_queue import InMemoryAnalysisQueue
+
+
+async def add_analysis(session_factory, status: str, started_at=None) -> int:
+    async with session_factory() as session:
+        repository = SQLAlchemyFileRepository(session)
+        file = await repository.add(File(
+            id=None,
+            original_name="report.txt",
+            path="local/objects/report.txt",
+            version=None,
+            size_bytes=1,
+            uploaded_at=datetime.now(),
+            uploaded_by=1
+        ))
+        analysis = await repository.add_analysis(Analysis(
+            id=None,
+            file_id=file.id,
+            status=status,
+            result_text=None,
+            created_at=datetime.now(),
+            started_at=started_at
+        ))
+        return analysis.id
+
+
+async def dequeue_or_none(queue: InMemoryAnalysisQueue):
+    try:
+        return await asyncio.wait_for(queue.dequeue(), timeout=0.2)
+    except asyncio.TimeoutError:
+        return None
+
+
+def test_job_queued_by_two_processes_is_handed_out_once(session_factory):
+    async def scenario():
+        analysis_id = await add_analysis(session_factory, AnalysisStatus.PENDING)
+        # Both processes pick up the pending job at startup.
+        queues = [InMemoryAnalysisQueue(session_factory, claim_timeout=600) for _ in range(2)]
+        for queue in queues:
+            await queue.start()
+
+        dequeued = await asyncio.gather(*(dequeue_or_none(queue) for queue in queues))
+
+        assert sorted(dequeued, key=str) == [analysis_id, None]
+
+    asyncio.run(scenario())
+
+
+def test_only_stale_running_jobs_are_reclaimed_at_startup(session_factory):
+    async def scenario():
+        fresh_id = await add_analysis(session_factory, AnalysisStatus.RUNNING, datetime.now())
+        stale_id = await add_analysis(
+            session_factory, AnalysisStatus.RUNNING, datetime.now() - timedelta(minutes=20)
+        )
+        queue = InMemoryAnalysisQueue(session_factory, claim_timeout=600)
+        await queue.start()
+
+        assert await dequeue_or_none(queue) == stale_id
+        assert await dequeue_or_none(queue) is None
+        async with session_factory() as session:
+            fresh = await SQLAlchemyFileRepository(session).get_analysis_by_id(fresh_id)
+        assert fresh.status == AnalysisStatus.RUNNING
+
+    asyncio.run(scenario())
@@ -0,0 +1,166 @@
+import asyncio
+import hashlib
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+
+from src.application.repositories import RetentionPolicy
+from src.application.use_cases.compact_versions import CompactVersionsUseCase
+from src.application.use_cases.upload_file import UploadFileUseCase
+from src.domain.exceptions import BlobNotFoundError
+from src.infrastructure.persistence.models import BlobModel
+from src.infrastructure.persistence.repositories.sqlalchemy_file_repository import SQLAlchemyFileRepository
+from src.infrastructure.storage.filesystem_storage import FileSystemStorage
+
+OLD_CONTENT = b"first version"
+NEW_CONTENT = b"second version"
+
+
+class PausedDeletes:
+    """Storage whose ``delete_many`` waits until the test lets it go on."""
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.reached = asyncio.Event()
+        self.resume = asyncio.Event()
+
+    def __getattr__(self, name):
+        return getattr(self.inner, name)
+
+    async def delete_many(self, paths):
+        self.reached.set()
+        await self.resume.wait()
+        await self.inner.delete_many(paths)
+
+
+class PausedAdds(SQLAlchemyFileRepository):
+    """Repository whose ``add`` waits until the test lets it go on."""
+
+    def __init__(self, session):
+        super().__init__(session)
+        self.reached = asyncio.Event()
+        self.resume = asyncio.Event()
+
+    async def add(self, file):
+        self.reached.set()
+        await self.resume.wait()
+        return await super().add(file)
+
+
+async def chunks_of(content: bytes):
+    yield content
+
+
+async def upload(session_factory, storage, name: str, content: bytes, repository_class=SQLAlchemyFileRepository):
+    async with session_factory() as session:
+        use_case = UploadFileUseCase(repository_class(session), storage)
+        return await use_case.execute(name, chunks_of(content), hashlib.sha256(content).hexdigest())
+
+
+async def compact(session_factory, storage, blob_grace: timedelta):
+    async with session_factory() as session:
+        use_case = CompactVersionsUseCase(
+            SQLAlchemyFileRepository(session),
+            storage,
+            RetentionPolicy(keep_versions=1),
+            batch_size=10,
+            blob_grace=blob_grace
+        )
+        return await use_case.execute()
+
+
+async def read_version(session_factory, storage, file_id: int) -> bytes:
+    async with session_factory() as session:
+        file = await SQLAlchemyFileRepository(session).get_by_id(file_id)
+    return await storage.read(file.path)
+
+
+async def expire_old_version(session_factory, storage) -> None:
+    """Upload two versions, so compaction deletes the first and its blob."""
+    await upload(session_factory, storage, "plan.txt", OLD_CONTENT)
+    await upload(session_factory, storage, "plan.txt", NEW_CONTENT)
+
+
+async def age_blobs(session_factory, age: timedelta) -> None:
+    async with session_factory() as session:
+        past = datetime.now() - age
+        await session.execute(update(BlobModel).values(created_at=past, last_used_at=past))
+        await session.commit()
+
+
+@pytest.fixture
+def storage(tmp_path):
+    storage = FileSystemStorage(str(tmp_path / "storage"), fsync=False)
+    asyncio.run(storage.start())
+    yield storage
+    storage.close()
+
+
+def test_upload_between_blob_delete_and_object_delete_keeps_its_object(session_factory, storage):
+    async def scenario():
+        await expire_old_version(session_factory, storage)
+        paused = PausedDeletes(storage)
+
+        compaction = asyncio.create_task(compact(session_factory, paused, timedelta(0)))
+        await paused.reached.wait()
+        # The blob row is gone, its object is not yet: the same content is uploaded again.
+        reuploaded = await upload(session_factory, storage, "copy.txt", OLD_CONTENT)
+        paused.resume.set()
+        result = await compaction
+
+        assert result.versions_deleted == 1
+        assert await read_version(session_factory, storage, reuploaded.id) == OLD_CONTENT
+
+    asyncio.run(scenario())
+
+
+def test_blob_picked_up_by_an_upload_survives_compaction(session_factory, storage):
+    async def scenario():
+        await expire_old_version(session_factory, storage)
+        await age_blobs(session_factory, timedelta(hours=2))
+
+        async with session_factory() as session:
+            repository = PausedAdds(session)
+            uploading = asyncio.create_task(
+                UploadFileUseCase(repository, storage).execute(
+                    "copy.txt", chunks_of(OLD_CONTENT), hashlib.sha256(OLD_CONTENT).hexdigest()
+                )
+            )
+            # The upload found the blob and has not added its version yet.
+            await repository.reached.wait()
+            result = await compact(session_factory, storage, timedelta(hours=1))
+            repository.resume.set()
+            reuploaded = await uploading
+
+        assert result.versions_deleted == 1
+        assert result.objects_deleted == 0
+        assert await read_version(session_factory, storage, reuploaded.id) == OLD_CONTENT
+
+    asyncio.run(scenario())
+
+
+def test_upload_fails_when_its_blob_is_deleted_first(session_factory, storage):
+    async def scenario():
+        await expire_old_version(session_factory, storage)
+
+        async with session_factory() as session:
+            repository = PausedAdds(session)
+            uploading = asyncio.create_task(
+                UploadFileUseCase(repository, storage).execute(
+                    "copy.txt", chunks_of(OLD_CONTENT), hashlib.sha256(OLD_CONTENT).hexdigest()
+                )
+            )
+            await repository.reached.wait()
+            await asyncio.sleep(0.01)
+            # Without a grace period compaction deletes the blob under the upload.
+            result = await compact(session_factory, storage, timedelta(0))
+            repository.resume.set()
+            with pytest.raises(BlobNotFoundError):
+                await uploading
+
+        assert result.objects_deleted == 1
+        async with session_factory() as session:
+            assert await SQLAlchemyFileRepository(session).find_latest_by_original_name("copy.txt") is None
+
+    asyncio.run(scenario())
@@ -0,0 +1,44 @@
+import asyncio
+import os
+
+import pytest
+
+from src.infrastructure.storage.compressing_storage import CompressingStorage, StorageCompressionStats
+from src.infrastructure.storage.memory_storage import MemoryStorage
+
+CONTENT = os.urandom(200_000) + bytes(300_000)
+
+
+async def chunks_of(content: bytes, size: int = 65536):
+    for start in range(0, len(content), size):
+        yield content[start:start + size]
+
+
+async def collect(chunks) -> bytes:
+    return b"".join([chunk async for chunk in chunks])
+
+
+@pytest.fixture
+def storage():
+    return CompressingStorage(
+        MemoryStorage(),
+        StorageCompressionStats(),
+        level=3,
+        delta_enabled=True,
+        delta_max_bytes=1024 * 1024,
+        snapshot_interval=10
+    )
+
+
+@pytest.mark.parametrize("offset, length", [(0, None), (0, 10), (150_000, 100_000), (499_990, None)])
+def test_stream_of_snapshot_and_delta(storage, offset, length):
+    async def scenario():
+        snapshot = await storage.save("a.bin", chunks_of(CONTENT))
+        changed = CONTENT[:1000] + b"changed" + CONTENT[1000:]
+        delta = await storage.save("a.bin", chunks_of(changed), base_path=snapshot.path)
+        end = None if length is None else offset + length
+
+        assert await collect(storage.stream(snapshot.path, offset, length)) == CONTENT[offset:end]
+        assert await collect(storage.stream(delta.path, offset, length)) == changed[offset:end]
+
+    asyncio.run(scenario())
@@ -0,0 +1,42 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from src.application.repositories import FileListQuery
+from src.domain.entities import File
+from src.infrastructure.persistence.repositories.sqlalchemy_file_repository import SQLAlchemyFileRepository
+
+NAMES = [
+    "a",
+    "a\U0010ffff",
+    "a\U0010ffff\U0010ffff.pdf",
+    "a\ud7ff.pdf",
+    "a.pdf",
+    "b",
+    "\U0010ffff.pdf",
+]
+
+
+async def list_names(session_factory, prefix: str):
+    async with session_factory() as session:
+        repository = SQLAlchemyFileRepository(session)
+        for name in NAMES:
+            await repository.add(File(
+                id=None,
+                original_name=name,
+                path=f"local/objects/{len(name)}",
+                version=None,
+                size_bytes=1,
+                uploaded_at=datetime.now(),
+                uploaded_by=1
+            ))
+        files = await repository.list_latest_versions(FileListQuery(name_prefix=prefix, limit=None))
+    return sorted(file.original_name for file in files)
+
+
+@pytest.mark.parametrize("prefix", ["a", "a\U0010ffff", "a\U0010ffff\U0010ffff", "\U0010ffff", "a\ud7ff", "b"])
+def test_name_prefix(session_factory, prefix):
+    names = asyncio.run(list_names(session_factory, prefix))
+
+    assert names == sorted(name for name in NAMES if name.startswith(prefix))
@@ -0,0 +1,34 @@
+import asyncio
+
+import pytest
+
+from src.infrastructure.storage.filesystem_storage import FileSystemStorage
+
+
+async def chunks_of(content: bytes):
+    yield content
+
+
+@pytest.fixture
+def storage(tmp_path):
+    storage = FileSystemStorage(str(tmp_path / "storage"), fsync=False)
+    asyncio.run(storage.start())
+    yield storage
+    storage.close()
+
+
+def test_local_path_of_own_object(storage):
+    stored = asyncio.run(storage.save("a.txt", chunks_of(b"content")))
+
+    with open(storage.local_path(stored.path), "rb") as file:
+        assert file.read() == b"content"
+
+
+@pytest.mark.parametrize("path", ["documents/plan.pdf", "tech-task/blobs/ab/abcdef", "local", "local/"])
+def test_local_path_of_foreign_path_is_none(storage, path):
+    assert storage.local_path(path) is None
+
+
+def test_delete_of_foreign_path_fails(storage):
+    with pytest.raises(ValueError):
+        asyncio.run(storage.delete("documents/plan.pdf"))
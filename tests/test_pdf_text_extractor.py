@@ -0,0 +1,56 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from src.application.services import ExtractedText
+from src.domain.exceptions import AnalysisError
+from src.infrastructure.services import pdf_text_extractor
+from src.infrastructure.services.pdf_text_extractor import PdfTextExtractor
+
+
+def extract_forever(source, max_pages, char_budget, timeout):
+    """Stands in for a page pdfplumber never finishes parsing."""
+    time.sleep(600)
+
+
+def extract_worker_pid(source, max_pages, char_budget, timeout):
+    return ExtractedText(text=str(os.getpid()), pages_extracted=1, page_count=1, complete=True)
+
+
+def is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+@pytest.fixture
+def extractor(monkeypatch):
+    monkeypatch.setattr(pdf_text_extractor, "_TIMEOUT_GRACE", 0.5)
+    extractor = PdfTextExtractor(max_workers=1, timeout=3, max_pages=10)
+    yield extractor
+    extractor.close()
+
+
+def test_overrunning_extraction_kills_its_worker(extractor):
+    async def scenario():
+        await extractor.warm_up()
+        stuck_pid = int((await extractor._run(extract_worker_pid, b"", 1000)).text)
+
+        with pytest.raises(AnalysisError, match="timed out"):
+            await extractor._run(extract_forever, b"", 1000)
+
+        # The only slot of the pool is free again for the next document.
+        next_pid = int((await extractor._run(extract_worker_pid, b"", 1000)).text)
+        assert next_pid != stuck_pid
+
+        for _ in range(50):
+            if not is_alive(stuck_pid):
+                break
+            await asyncio.sleep(0.1)
+        assert not is_alive(stuck_pid)
+
+    asyncio.run(scenario())